@@ -26,8 +26,12 @@ setup(
     packages=["validatable"],
     license="MIT",
     python_requires=">=3.6.1",
-    install_requires=["pydantic>=1.8", "sqlalchemy>=1.3", "sqlalchemy2-stubs"],
-    extras_require={"email": ["email-validator>=1.0.3"]},
+    install_requires=["pydantic>=1.8", "sqlalchemy>=1.4", "sqlalchemy2-stubs"],
+    extras_require={
+        "email": ["email-validator>=1.0.3"],
+        "numpy": ["numpy"],
+        "arrow": ["pyarrow"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python",
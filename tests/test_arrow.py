@@ -0,0 +1,107 @@
+import datetime as dt
+import enum
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+
+from validatable import UUID4, BaseTable, Field, Json, MetaData
+
+pa = pytest.importorskip("pyarrow")
+
+
+class Plan(enum.Enum):
+    free = "free"
+    paid = "paid"
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Account(Base):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    num: int = 0
+    ratio: float = 0.5
+    name: str = "name"
+    price: Decimal = Decimal("1.5")
+    created_ts: dt.datetime = Field(default_factory=dt.datetime.now)
+    plan: Plan = Plan.free
+    tags: List[str] = []
+    data: Json = "{}"
+    note: Optional[str] = None
+
+
+@pytest.fixture()
+def models():
+    return [
+        Account(data="[]"),
+        Account(
+            num=3,
+            name="other",
+            plan=Plan.paid,
+            tags=["a"],
+            data='{"a": 1}',
+            note="note",
+        ),
+    ]
+
+
+@pytest.fixture()
+def account_conn(make_conn, models):
+    conn = make_conn(Account)
+    conn.execute(Account.t.insert(), [m.dict() for m in models])
+    return conn
+
+
+def select_all(conn):
+    return [Account.parse_obj(r) for r in conn.execute(Account.t.select())]
+
+
+def test_arrow_schema(account_conn):
+    table = Account.to_arrow(account_conn)
+
+    assert table.schema.field("id").type == pa.binary(16)
+    assert table.schema.field("data").type == pa.string()
+    assert table.schema.field("tags").type == pa.string()
+    assert pa.types.is_dictionary(table.schema.field("plan").type)
+    assert table.schema.field("note").nullable
+    assert not table.schema.field("id").nullable
+
+
+def test_to_arrow(account_conn, models):
+    table = Account.to_arrow(account_conn, batch_size=1)
+
+    assert table.num_rows == 2
+    assert table.column("id").to_pylist() == [m.id.bytes for m in models]
+    assert table.column("plan").to_pylist() == ["free", "paid"]
+    assert table.column("data").to_pylist() == ["[]", '{"a": 1}']
+
+
+def test_to_arrow_statement(account_conn):
+    stmt = Account.t.select().where(Account.c.num == 3)
+    table = Account.to_arrow(account_conn, stmt)
+
+    assert table.column("name").to_pylist() == ["other"]
+
+
+def test_from_arrow(account_conn, models):
+    table = Account.to_arrow(account_conn)
+    account_conn.execute(Account.t.delete())
+
+    batches = list(Account.from_arrow(table))
+    assert batches[0][0]["id"] == models[0].id
+
+    assert Account.insert_arrow(account_conn, table) == 2
+    assert select_all(account_conn) == models
+
+
+def test_parquet_round_trip(account_conn, models, tmp_path):
+    pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "account.parquet")
+
+    assert Account.write_parquet(account_conn, path) == 2
+    account_conn.execute(Account.t.delete())
+    assert Account.read_parquet(account_conn, path) == 2
+    assert select_all(account_conn) == models
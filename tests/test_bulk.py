@@ -0,0 +1,169 @@
+import uuid
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+from validatable import UUID4, BaseTable, Field, MetaData
+from validatable.bulk import update_statement
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Product(Base):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    name: str = "product"
+    stock: int = 0
+
+
+class Stock(Base):
+    store: int = Field(sa_primary_key=True)
+    sku: str = Field(sa_primary_key=True)
+    quantity: int = 0
+
+
+class NoKey(Base):
+    name: str = ""
+
+
+@pytest.fixture()
+def products(make_conn):
+    conn = make_conn(Product)
+    products = [Product(name="p{}".format(i), stock=i) for i in range(20)]
+    conn.execute(Product.t.insert(), [p.dict() for p in products])
+    return conn, products
+
+
+def count_statements(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_execute")
+    def receive(conn, clauseelement, multiparams, params, options):
+        statements.append(clauseelement)
+
+    return statements
+
+
+def test_get_many(products):
+    conn, products = products
+    keys = [products[3].id, uuid.uuid4(), products[0].id, products[3].id]
+
+    models = Product.get_many(conn, keys)
+
+    assert models == [products[3], None, products[0], products[3]]
+
+
+def test_get_many_chunks(products):
+    conn, products = products
+    statements = count_statements(conn)
+    keys = [p.id for p in reversed(products)]
+
+    models = Product.get_many(conn, keys, chunk_size=6)
+
+    assert models == list(reversed(products))
+    assert len(statements) == 4
+
+
+def test_get_many_temp_table(products):
+    conn, products = products
+    keys = [p.id for p in products] + [uuid.uuid4()]
+
+    models = Product.get_many(conn, keys, temp_threshold=5)
+
+    assert models == products + [None]
+    tables = sa.inspect(conn).get_temp_table_names()
+    assert tables == []
+
+
+@pytest.mark.parametrize("temp_threshold", [5000, 1])
+def test_get_many_composite_key(make_conn, temp_threshold):
+    conn = make_conn(Stock)
+    stock = [Stock(store=s, sku=k, quantity=s) for s in (1, 2) for k in "ab"]
+    conn.execute(Stock.t.insert(), [s.dict() for s in stock])
+
+    models = Stock.get_many(
+        conn, [(2, "b"), (3, "a"), (1, "a")], temp_threshold=temp_threshold
+    )
+
+    assert models == [stock[3], None, stock[0]]
+
+
+def test_get_many_without_primary_key():
+    with pytest.raises(TypeError):
+        NoKey.get_many(None, [1])
+
+
+def select_all(conn, model):
+    query = model.t.select().order_by(*model.t.primary_key.columns)
+    return [model.parse_obj(r) for r in conn.execute(query)]
+
+
+def test_update_many_fields(products):
+    conn, products = products
+    changed = [
+        p.copy(update={"stock": 100, "name": "x"}) for p in products[:5]
+    ]
+
+    count = Product.update_many(conn, changed, fields=["stock"])
+
+    assert count == 5
+    rows = {p.id: p for p in select_all(conn, Product)}
+    assert [rows[p.id].stock for p in products[:6]] == [100] * 5 + [5]
+    assert rows[products[0].id].name == "p0"
+
+
+def test_update_many_all_fields(products):
+    conn, products = products
+    changed = [p.copy(update={"stock": -1, "name": "x"}) for p in products]
+
+    assert Product.update_many(conn, changed) == 20
+    assert all(
+        p.name == "x" and p.stock == -1 for p in select_all(conn, Product)
+    )
+    assert Product.update_many(conn, []) == 0
+
+
+def test_update_many_statement():
+    tmp = sa.Table(
+        "tmp",
+        sa.MetaData(),
+        sa.Column("id", sa.Integer),
+        sa.Column("stock", sa.Integer),
+    )
+    keys = [Product.c.id]
+    pg = postgresql.dialect()
+    lite = sqlite.dialect()
+
+    assert " FROM tmp " in str(
+        update_statement(pg, Product.t, tmp, keys).compile(dialect=pg)
+    )
+    assert "EXISTS" in str(
+        update_statement(lite, Product.t, tmp, keys).compile(dialect=lite)
+    )
+
+
+@pytest.mark.parametrize("temp_threshold", [5000, 3])
+def test_delete_many(products, temp_threshold):
+    conn, products = products
+    keys = [p.id for p in products[:10]] + [uuid.uuid4()]
+
+    count = Product.delete_many(
+        conn, keys, chunk_size=4, temp_threshold=temp_threshold
+    )
+
+    assert count == 10
+    assert {p.id for p in select_all(conn, Product)} == {
+        p.id for p in products[10:]
+    }
+
+
+def test_update_many_composite_key(make_conn):
+    conn = make_conn(Stock)
+    stock = [Stock(store=s, sku=k) for s in (1, 2) for k in "ab"]
+    conn.execute(Stock.t.insert(), [s.dict() for s in stock])
+
+    Stock.update_many(conn, [Stock(store=2, sku="a", quantity=9)])
+
+    assert [s.quantity for s in select_all(conn, Stock)] == [0, 0, 9, 0]
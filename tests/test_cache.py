@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData, UnitOfWork, create_engine
+from validatable.cache import IdentityCache, invalidate
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Config(Base):
+    __sa_cache__ = {"maxsize": 3}
+
+    key: str = Field(sa_primary_key=True)
+    value: str = ""
+
+
+class Uncached(Base):
+    id: int = Field(sa_primary_key=True)
+
+
+@pytest.fixture()
+def config_conn(make_conn):
+    conn = make_conn(Config)
+    rows = [{"key": k, "value": k.upper()} for k in "abcde"]
+    conn.execute(Config.t.insert(), rows)
+    Config.cache.clear()
+    Config.cache.hits = Config.cache.misses = 0
+    yield conn
+    Config.cache.clear()
+
+
+def test_identity_cache_lru():
+    cache = IdentityCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_rate == 0.75
+
+
+def test_identity_cache_ttl():
+    cache = IdentityCache(ttl=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_identity_cache_threads():
+    cache = IdentityCache(maxsize=50)
+
+    def work(n):
+        for i in range(1000):
+            cache.put((n, i % 70), i)
+            cache.get((n, (i + 1) % 70))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache) == 50
+    assert cache.hits + cache.misses == 4000
+
+
+def test_model_cache():
+    assert isinstance(Config.cache, IdentityCache)
+    assert Config.cache.maxsize == 3
+    assert Uncached.cache is None
+
+
+def test_get(config_conn):
+    first = Config.get(config_conn, "a")
+    second = Config.get(config_conn, "a")
+
+    assert first == second == Config(key="a", value="A")
+    assert first is not second
+    assert Config.get(config_conn, "z") is None
+    assert (Config.cache.hits, Config.cache.misses) == (1, 2)
+
+
+def test_get_copy_is_isolated(config_conn):
+    Config.get(config_conn, "a").value = "changed"
+
+    assert Config.get(config_conn, "a").value == "A"
+
+
+def test_get_uncached(make_conn):
+    conn = make_conn(Uncached)
+    conn.execute(Uncached.t.insert(), [{"id": 1}])
+
+    assert Uncached.get(conn, 1) == Uncached(id=1)
+    assert Uncached.get(conn, 2) is None
+
+
+def test_update_many_invalidates(config_conn):
+    Config.get(config_conn, "a")
+    Config.update_many(config_conn, [Config(key="a", value="new")])
+
+    assert Config.get(config_conn, "a").value == "new"
+
+
+def test_delete_many_invalidates(config_conn):
+    Config.get(config_conn, "a")
+    Config.delete_many(config_conn, ["a"])
+
+    assert Config.get(config_conn, "a") is None
+
+
+def test_insert_invalidates(config_conn):
+    Config.cache.put("z", Config(key="z", value="stale"))
+    uow = UnitOfWork()
+    uow.add(Config(key="z", value="fresh"))
+    uow.flush(config_conn)
+
+    assert Config.get(config_conn, "z").value == "fresh"
+
+
+def test_invalidation_during_query_is_not_overwritten(config_conn):
+    @sa.event.listens_for(config_conn, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        invalidate(Config.t, ["a"])
+
+    assert Config.get(config_conn, "a").value == "A"
+    sa.event.remove(config_conn, "after_cursor_execute", after)
+    assert len(Config.cache) == 0
+    Config.get(config_conn, "a")
+    assert len(Config.cache) == 1
+
+
+def test_uncommitted_writes_are_not_cached(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "db.sqlite"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Config.t.insert(), [{"key": "a", "value": "A"}])
+    Config.cache.clear()
+
+    with engine.connect() as writer, engine.connect() as reader:
+        assert Config.get(reader, "a").value == "A"
+        transaction = writer.begin()
+        Config.update_many(writer, [Config(key="a", value="uncommitted")])
+        assert Config.get(writer, "a").value == "uncommitted"
+        transaction.rollback()
+        assert Config.get(reader, "a").value == "A"
+        assert Config.get(writer, "a").value == "A"
+
+        with writer.begin():
+            Config.update_many(writer, [Config(key="a", value="new")])
+            assert Config.get(reader, "a").value == "A"
+        assert Config.get(reader, "a").value == "new"
+    Config.cache.clear()
+    engine.dispose()
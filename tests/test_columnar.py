@@ -0,0 +1,162 @@
+import datetime as dt
+import enum
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import UUID4, BaseTable, Field, Json, MetaData
+
+np = pytest.importorskip("numpy")
+
+
+class Color(enum.Enum):
+    red = "red"
+    blue = "blue"
+
+
+class Shade(str, enum.Enum):
+    light = "light"
+    dark = "dark"
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Snapshot(Base):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    num: int = 0
+    ratio: float = 0.5
+    flag: bool = False
+    name: str = "name"
+    price: Decimal = Decimal("1.50")
+    created_ts: dt.datetime = Field(default_factory=dt.datetime.now)
+    day: dt.date = Field(default_factory=dt.date.today)
+    blob: bytes = b"\x00\x01"
+    color: Color = Color.red
+    tags: List[str] = []
+    data: Json = "{}"
+    note: Optional[str] = None
+    score: Optional[int] = None
+
+
+class UtcDateTime(sa.types.TypeDecorator):
+    """Datetimes stored as naive UTC and read back as aware ones."""
+
+    impl = sa.DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+
+    def process_result_value(self, value, dialect):
+        return value.replace(tzinfo=dt.timezone.utc)
+
+
+class Event(Base):
+    id: int = Field(sa_primary_key=True)
+    at: dt.datetime = Field(sa_type=UtcDateTime())
+
+
+class Paint(Base):
+    id: int = Field(sa_primary_key=True)
+    shade: Shade = Shade.light
+
+
+@pytest.fixture()
+def models():
+    return [
+        Snapshot(),
+        Snapshot(
+            num=7,
+            ratio=1.25,
+            flag=True,
+            name="ação",
+            blob=b"",
+            color=Color.blue,
+            tags=["a", "b"],
+            data='{"a": [1, 2]}',
+            note="note",
+            score=3,
+        ),
+        Snapshot(num=-1, name=""),
+    ]
+
+
+@pytest.fixture()
+def snapshot_conn(make_conn, models):
+    conn = make_conn(Snapshot)
+    conn.execute(Snapshot.t.insert(), [m.dict() for m in models])
+    return conn
+
+
+def test_export_columnar_files(snapshot_conn, tmp_path):
+    count = Snapshot.export_columnar(snapshot_conn, str(tmp_path))
+
+    assert count == 3
+    assert (tmp_path / "manifest.json").exists()
+    assert (tmp_path / "c0.npy").exists()
+
+
+def test_open_columnar_models(snapshot_conn, models, tmp_path):
+    Snapshot.export_columnar(snapshot_conn, str(tmp_path), batch_size=2)
+    snapshot = Snapshot.open_columnar(str(tmp_path))
+
+    assert len(snapshot) == 3
+    assert list(snapshot) == models
+    assert snapshot[-1] == models[-1]
+
+
+def test_open_columnar_columns(snapshot_conn, models, tmp_path):
+    Snapshot.export_columnar(snapshot_conn, str(tmp_path))
+    snapshot = Snapshot.open_columnar(str(tmp_path))
+
+    num = snapshot.column("num")
+    assert isinstance(num, np.memmap)
+    assert num.tolist() == [0, 7, -1]
+    assert list(snapshot.column("name")) == ["name", "ação", ""]
+    assert list(snapshot.column("note")) == [None, "note", None]
+    assert snapshot.value("id", 1) == models[1].id
+
+
+def test_open_columnar_index_error(snapshot_conn, tmp_path):
+    Snapshot.export_columnar(snapshot_conn, str(tmp_path))
+    snapshot = Snapshot.open_columnar(str(tmp_path))
+
+    with pytest.raises(IndexError):
+        snapshot[3]
+
+
+def test_export_columnar_empty_table(make_conn, tmp_path):
+    conn = make_conn(Snapshot)
+    Snapshot.export_columnar(conn, str(tmp_path))
+    snapshot = Snapshot.open_columnar(str(tmp_path))
+
+    assert len(snapshot) == 0
+    assert list(snapshot.column("name")) == []
+
+
+def test_timezone_aware_datetimes(make_conn, tmp_path):
+    conn = make_conn(Event)
+    paris = dt.timezone(dt.timedelta(hours=2))
+    at = dt.datetime(2024, 5, 1, 12, 30, tzinfo=paris)
+    conn.execute(Event.t.insert(), [{"id": 1, "at": at}])
+    Event.export_columnar(conn, str(tmp_path))
+    snapshot = Event.open_columnar(str(tmp_path))
+
+    assert snapshot[0].at == at
+    assert snapshot[0].at.tzinfo == dt.timezone.utc
+    assert snapshot.column("at")[0] == np.datetime64("2024-05-01T10:30")
+
+
+def test_str_enums(make_conn, tmp_path):
+    conn = make_conn(Paint)
+    conn.execute(Paint.t.insert(), [{"id": 1, "shade": Shade.dark}])
+    Paint.export_columnar(conn, str(tmp_path))
+    snapshot = Paint.open_columnar(str(tmp_path))
+
+    assert snapshot[0].shade is Shade.dark
+    assert list(snapshot.column("shade")) == ["dark"]
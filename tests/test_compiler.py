@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+from pydantic import (
+    EmailStr,
+    ValidationError,
+    conint,
+    constr,
+    root_validator,
+    validator,
+)
+from pydantic.main import validate_model
+
+from validatable import BaseTable, Field, MetaData
+from validatable.compiler import validate
+
+Code = constr(regex=r"^[A-Z]{2}$", to_upper=True)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Person(Base):
+    __sa_compiled__ = True
+
+    id: int = Field(sa_primary_key=True)
+    name: constr(  # type: ignore[valid-type]
+        strip_whitespace=True, min_length=1, max_length=20
+    )
+    code: Code = "AA"  # type: ignore[valid-type]
+    age: conint(ge=0, lt=150) = 0  # type: ignore[valid-type]
+    score: float = Field(0.5, gt=0)
+    active: bool = True
+    email: Optional[EmailStr] = None
+    nick: Optional[str] = Field(None, alias="nickname")
+    tags: List[str] = []
+    seen: Optional[datetime] = None
+
+    @validator("tags")
+    def sort_tags(cls, v):
+        return sorted(v)
+
+
+RECORDS = [
+    {"id": 1, "name": " Ada "},
+    {"id": 2, "name": "Bob", "code": "fr", "age": 149, "score": 3},
+    {"id": 3, "name": "C", "email": "C@Example.com", "nickname": None},
+    {"id": 4, "name": "D", "tags": ["b", "a"], "seen": "2020-01-01T00:00"},
+    {"id": "5", "name": b"E", "active": "yes", "score": "1.5"},
+    {"id": 6, "name": "F", "nick": "ignored", "unknown": 1},
+    {"id": 7, "name": "G", "score": float("inf")},
+    {"id": 8, "name": "H", "active": 1},
+    {"id": True, "name": "I"},
+    {"id": 9},
+    {"id": 10, "name": "   "},
+    {"id": 11, "name": "K", "code": "abc"},
+    {"id": 12, "name": "L", "age": -1, "score": 0},
+    {"id": 13, "name": "M", "email": "not an email"},
+    {"id": 14, "name": "N", "tags": "a"},
+    {"id": None, "name": None, "active": None},
+]
+
+
+def test_compiled():
+    assert Person.__sa_validator__ is not None
+    assert Base.__sa_validator__ is None
+
+
+@pytest.mark.parametrize("record", RECORDS, ids=range(len(RECORDS)))
+def test_identical_results(record):
+    values, fields_set, error = validate(Person, record)
+    expected, expected_set, expected_error = validate_model(Person, record)
+    assert values == expected
+    assert list(values) == list(expected)
+    assert fields_set == expected_set
+    if expected_error is None:
+        assert error is None
+    else:
+        assert error.errors() == expected_error.errors()
+
+
+@pytest.mark.parametrize("record", RECORDS, ids=range(len(RECORDS)))
+def test_init(record):
+    expected = validate_model(Person, record)
+    if expected[2] is not None:
+        with pytest.raises(ValidationError) as info:
+            Person(**record)
+        assert info.value.errors() == expected[2].errors()
+        with pytest.raises(ValidationError):
+            Person.parse_obj(record)
+    else:
+        person = Person.parse_obj(record)
+        assert person.__dict__ == expected[0]
+        assert person.__fields_set__ == expected[1]
+        assert person._sa_dirty == set()
+
+
+def test_fast_path_used():
+    source = Person.__sa_validator__.__source__
+    assert "f0.validate" not in source
+    assert "f8.validate" in source
+    assert Person.__sa_validator__(RECORDS[0]) is not None
+    # Coercions are left to pydantic.
+    assert Person.__sa_validator__(RECORDS[4]) is None
+
+
+def test_bulk_validation():
+    rows, errors = Person.validate_many(RECORDS)
+    assert [r["id"] for r in rows] == [1, 2, 3, 4, 5, 6, 7, 8, 1]
+    assert {e.row_index for e in errors} == set(range(9, len(RECORDS)))
+
+
+def test_not_compiled():
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    class Checked(Other):
+        __sa_compiled__ = True
+
+        id: int = Field(sa_primary_key=True)
+
+        @root_validator
+        def check(cls, values):
+            return values
+
+    class Forbid(Other):
+        __sa_compiled__ = True
+
+        id: int = Field(sa_primary_key=True)
+
+        class Config:
+            extra = "forbid"
+
+    assert Checked.__sa_validator__ is None
+    assert Forbid.__sa_validator__ is None
+    with pytest.raises(ValidationError):
+        Forbid(id=1, other=2)
@@ -0,0 +1,172 @@
+import pytest
+import sqlalchemy as sa
+
+from validatable import (
+    BaseTable,
+    Field,
+    ForeignKey,
+    MetaData,
+    NotLoaded,
+    QueryCache,
+    create_engine,
+)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Document(Base):
+    id: int = Field(sa_primary_key=True)
+    title: str
+    body: bytes = Field(b"", sa_deferred=True)
+    tags: list = Field(sa_deferred=True, alias="labels")
+
+
+class Comment(Base):
+    id: int = Field(sa_primary_key=True)
+    document_id: int = Field(sa_fk=ForeignKey("document.id"))
+
+
+class CachedBase(BaseTable):
+    metadata = MetaData()
+
+
+class Note(CachedBase):
+    __sa_cache__ = True
+
+    id: int = Field(sa_primary_key=True)
+    body: str = Field("", sa_deferred=True)
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Document)
+    conn.execute(
+        Document.t.insert(),
+        [
+            {"id": i, "title": str(i), "body": b"x" * i, "labels": [i]}
+            for i in range(1, 6)
+        ],
+    )
+    return conn
+
+
+def capture(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def test_deferred_columns():
+    assert Document.__sa_deferred__ == ("body", "tags")
+    assert Document.c.body.info == {"deferred": True}
+    assert "deferred" not in Document.c.title.info
+
+
+def test_default_select_omits_deferred(conn):
+    statements = capture(conn)
+    documents = Document.select(conn)
+    assert "body" not in statements[0]
+    assert "labels" not in statements[0]
+    assert [d.title for d in documents] == ["1", "2", "3", "4", "5"]
+    assert "body" not in documents[0].__dict__
+
+
+def test_batch_loading_on_access(conn):
+    documents = Document.select(conn)
+    statements = capture(conn)
+    assert documents[2].body == b"xxx"
+    assert [d.body for d in documents] == [b"x" * i for i in range(1, 6)]
+    assert len(statements) == 1
+    assert [d.tags for d in documents] == [[i] for i in range(1, 6)]
+    assert len(statements) == 2
+    assert documents[0].dict()["tags"] == [1]
+
+
+def test_get_and_get_many(conn):
+    assert Document.get(conn, 2).tags == [2]
+    documents = Document.get_many(conn, [4, 3, 9])
+    assert documents[2] is None
+    assert documents[0].body == b"xxxx"
+
+
+def test_explicit_select_loads_everything(conn):
+    statements = capture(conn)
+    documents = Document.select(conn, Document.t.select())
+    assert documents[0].body == b"x"
+    assert len(statements) == 1
+
+
+def test_assignment_and_save(conn):
+    document = Document.get(conn, 1)
+    document.title = "changed"
+    statements = capture(conn)
+    document.save(conn)
+    assert "body" not in statements[0]
+    document.body = b"new"
+    document.save(conn)
+    assert Document.get(conn, 1).body == b"new"
+
+
+def test_deleted_row(conn):
+    document = Document.get(conn, 5)
+    conn.execute(Document.t.delete().where(Document.c.id == 5))
+    with pytest.raises(NotLoaded):
+        document.body
+    with pytest.raises(AttributeError):
+        document.missing
+
+
+def test_rows_are_partial(conn):
+    rows = list(Document.iter_rows(conn))
+    assert rows[0].title == "1"
+    with pytest.raises(NotLoaded):
+        rows[0].body
+
+
+def test_load_related(make_conn):
+    conn = make_conn(Comment)
+    conn.execute(
+        Document.t.insert(),
+        [{"id": 1, "title": "a", "body": b"b", "labels": []}],
+    )
+    comment = Comment(id=1, document_id=1)
+    related = Comment.load_related(conn, [comment], "document_id")
+    assert related[1].body == b"b"
+
+
+def test_cached_instances_keep_no_connection(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "db.sqlite"))
+    CachedBase.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Note.t.insert(), [{"id": 1, "body": "a"}, {"id": 2, "body": "b"}]
+        )
+    cache = QueryCache()
+    with engine.connect() as conn:
+        assert Note.get(conn, 1).id == 1
+        assert len(Note.select(conn, cache=cache)) == 2
+
+    with engine.connect() as conn:
+        assert Note.get(conn, 1).body == "a"
+        assert [n.body for n in Note.select(conn, cache=cache)] == ["a", "b"]
+    assert Note.cache.hits == 1
+    assert cache.hits == 1
+    engine.dispose()
+
+
+def test_update_many_loads_named_fields(conn):
+    documents = Document.select(conn)
+    documents[0].title = "new"
+    fields = ["title", "body", "labels"]
+    assert Document.update_many(conn, documents[:2], fields) == 2
+    rows = conn.execute(Document.t.select().where(Document.c.id < 3))
+    assert [tuple(r) for r in rows] == [
+        (1, "new", b"x", [1]),
+        (2, "2", b"xx", [2]),
+    ]
@@ -0,0 +1,143 @@
+import io
+from datetime import date
+from typing import Optional
+
+import pytest
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from validatable import BaseTable, Field, MetaData, NotLoaded
+
+
+class Address(BaseModel):
+    city: str
+    zip: Optional[str] = None
+    since: date = date(2000, 1, 1)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Customer(Base):
+    id: int = Field(sa_primary_key=True)
+    name: str
+    address: Address = Field(sa_embedded=True)
+    billing: Optional[Address] = Field(None, sa_embedded=True)
+
+
+def make_customers():
+    return [
+        Customer(id=1, name="a", address={"city": "Lyon", "zip": "69001"}),
+        Customer(
+            id=2,
+            name="b",
+            address={"city": "Paris"},
+            billing={"city": "Lille", "since": date(2020, 5, 1)},
+        ),
+    ]
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Customer)
+    result = Customer.load_records(conn, [c.dict() for c in make_customers()])
+    assert result.inserted == 2
+    return conn
+
+
+def test_columns():
+    assert [c.name for c in Customer.c] == [
+        "id",
+        "name",
+        "address__city",
+        "address__zip",
+        "address__since",
+        "billing__city",
+        "billing__zip",
+        "billing__since",
+    ]
+    assert isinstance(Customer.c.address__since.type, sa.Date)
+    assert not Customer.c.address__city.nullable
+    assert Customer.c.address__zip.nullable
+    assert Customer.c.billing__city.nullable
+
+
+def test_round_trip(conn):
+    assert Customer.select(conn) == make_customers()
+    assert Customer.get(conn, 2).billing.since == date(2020, 5, 1)
+    assert Customer.get(conn, 1).billing is None
+
+
+def test_filter_on_sub_field(conn):
+    stmt = Customer.t.select().where(Customer.c.address__city == "Paris")
+    assert [c.id for c in Customer.select(conn, stmt)] == [2]
+
+
+def test_paginate_on_sub_field(conn):
+    page = Customer.paginate(conn, ["-address__since", "-address__city"], 1)
+    assert [c.id for c in page.items] == [2]
+    page = Customer.paginate(
+        conn, ["-address__since", "-address__city"], 1, page.cursor
+    )
+    assert [c.id for c in page.items] == [1]
+    assert page.cursor is None
+
+
+def test_rows(conn):
+    row, _ = Customer.select(conn, rows=True)
+    assert row.address__city == "Lyon"
+    assert row.to_model() == make_customers()[0]
+    assert row.address == make_customers()[0].address
+    assert row.billing is None
+
+
+def test_select_fields(conn):
+    rows = Customer.select_fields(conn, "name", "billing")
+    assert rows[1].billing__city == "Lille"
+    assert rows[1].billing == make_customers()[1].billing
+    assert rows[0].billing is None
+    with pytest.raises(NotLoaded):
+        rows[0].address
+
+
+def test_save(conn):
+    customer = Customer.get(conn, 1)
+    customer.address = Address(city="Nice")
+    customer.billing = None
+    customer.save(conn)
+    stored = conn.execute(
+        sa.select(Customer.c.address__city, Customer.c.address__zip).where(
+            Customer.c.id == 1
+        )
+    ).one()
+    assert tuple(stored) == ("Nice", None)
+
+
+def test_update_many(conn):
+    customers = Customer.select(conn)
+    for c in customers:
+        c.address = Address(city="Metz")
+    Customer.update_many(conn, customers, fields=["address"])
+    assert {c.address.city for c in Customer.select(conn)} == {"Metz"}
+
+
+def test_ndjson_round_trip(conn):
+    fp = io.StringIO()
+    assert Customer.dump_ndjson(conn, None, fp) == 2
+    assert '"address__city":"Lyon"' in fp.getvalue()
+    assert Customer.delete_many(conn, [1, 2]) == 2
+    fp.seek(0)
+    assert Customer.load_ndjson(conn, fp).inserted == 2
+    assert Customer.select(conn) == make_customers()
+
+
+def test_invalid_declarations():
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    with pytest.raises(TypeError):
+
+        class NotModel(Other):
+            id: int = Field(sa_primary_key=True)
+            tags: list = Field(sa_embedded=True)
@@ -0,0 +1,157 @@
+import enum
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel, Json
+
+from validatable import UUID4, BaseTable, Field, MetaData
+from validatable.encoder import get_encoder
+
+
+class Color(str, enum.Enum):
+    red = "red"
+    blue = "blue"
+
+
+class Level(enum.IntEnum):
+    low = 1
+    high = 2
+
+
+class Point(BaseModel):
+    x: float
+    y: float = 0.0
+    label: Optional[str] = None
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Sample(Base):
+    __sa_exclude__ = {"counts"}
+
+    id: UUID4 = Field(default_factory=uuid4, sa_primary_key=True)
+    name: str
+    flag: bool
+    count: int
+    ratio: float
+    created: datetime
+    day: date
+    at: time
+    color: Color
+    level: Level
+    price: Decimal
+    delay: timedelta
+    note: Optional[str] = None
+    tags: List[str] = []
+    scores: List[Optional[int]] = []
+    points: List[Point] = []
+    origin: Point = Field(default_factory=lambda: Point(x=0), sa_embedded=True)
+    counts: Dict[str, int] = {}
+    labels: Set[str] = set()
+    extra: Json = Field("null")
+
+
+def make_sample(**kwargs):
+    values = dict(
+        name='é "quoted" \n ☃',
+        flag=True,
+        count=2**70,
+        ratio=0.1,
+        created=datetime(2021, 5, 4, 3, 2, 1, 123, tzinfo=timezone.utc),
+        day=date(2021, 5, 4),
+        at=time(12, 30),
+        color="blue",
+        level=2,
+        price=Decimal("1.50"),
+        delay=timedelta(seconds=90),
+        tags=["a", "b"],
+        scores=[1, None, 3],
+        points=[{"x": 1, "label": "p"}, {"x": 2.5, "y": -1}],
+        counts={"a": 1},
+        labels={"x"},
+        extra='{"k": [1, {"n": null}]}',
+    )
+    values.update(kwargs)
+    return Sample(**values)
+
+
+def reference(instance):
+    return BaseModel.json(instance)
+
+
+def test_compiled():
+    assert get_encoder(Sample) is not None
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"note": "n", "ratio": float("nan")},
+        {"ratio": float("inf"), "count": -1, "flag": False},
+        {"tags": [], "points": [], "origin": {"x": -0.0, "y": 1e300}},
+        {"extra": "[]", "color": Color.red, "level": Level.low},
+    ],
+)
+def test_identical_output(kwargs):
+    sample = make_sample(**kwargs)
+    assert sample.json() == reference(sample)
+
+
+def test_unexpected_values_fall_back():
+    sample = make_sample()
+    object.__setattr__(sample, "__dict__", dict(sample.__dict__))
+    sample.__dict__["name"] = Color.red
+    sample.__dict__["tags"] = ("a", 1)
+    sample.__dict__["count"] = True
+    assert sample.json() == reference(sample)
+
+
+def test_arguments_use_pydantic():
+    sample = make_sample()
+    assert sample.json(include={"name"}) == BaseModel.json(
+        sample, include={"name"}
+    )
+    assert sample.json(indent=2) == BaseModel.json(sample, indent=2)
+
+
+def test_not_compiled():
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    class Encoded(Other):
+        id: int = Field(sa_primary_key=True)
+        at: datetime
+
+        class Config:
+            json_encoders = {datetime: lambda v: v.timestamp()}
+
+    class Excluded(Other):
+        id: int = Field(sa_primary_key=True)
+        secret: str = Field("", exclude=True)
+
+    assert get_encoder(Encoded) is None
+    assert get_encoder(Excluded) is None
+    encoded = Encoded(id=1, at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    assert encoded.json() == '{"id": 1, "at": 1577836800.0}'
+    assert Excluded(id=1, secret="s").json() == '{"id": 1}'
+
+
+def test_nested_uuid():
+    class Ref(BaseModel):
+        id: UUID
+
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    class Holder(Other):
+        id: int = Field(sa_primary_key=True)
+        refs: List[Ref]
+
+    holder = Holder(id=1, refs=[{"id": uuid4()}, {"id": uuid4()}])
+    assert holder.json() == reference(holder)
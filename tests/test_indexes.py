@@ -0,0 +1,141 @@
+import re
+from typing import Optional
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from validatable import BaseTable, Field, Index, MetaData
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Customer(Base):
+    __sa_indexes__ = [
+        Index("tenant", "last_name", "first_name"),
+        Index("email", unique=True, skip_nulls=True),
+        Index(lambda c: sa.func.lower(c.mail), name="ix_customer_lower"),
+        Index("tenant", include=["first_name"], where=lambda c: c.active),
+    ]
+
+    id: int = Field(sa_primary_key=True)
+    tenant: int
+    first_name: str
+    last_name: str
+    email: Optional[str] = Field(None, alias="mail")
+    active: bool = True
+
+
+def get_index(name):
+    # Default names of partial and covering indexes end with a hash.
+    pattern = re.compile(re.escape(name) + "(_[0-9a-f]{8})?")
+    return next(i for i in Customer.t.indexes if pattern.fullmatch(i.name))
+
+
+def compile_index(name, dialect):
+    return str(CreateIndex(get_index(name)).compile(dialect=dialect))
+
+
+def test_composite_index():
+    index = get_index("ix_customer_tenant_last_name_first_name")
+    assert [c.name for c in index.columns] == [
+        "tenant",
+        "last_name",
+        "first_name",
+    ]
+    assert not index.unique
+
+
+def test_partial_unique_index_skips_nulls():
+    sql = compile_index("uq_customer_mail", postgresql.dialect())
+    assert sql.startswith("CREATE UNIQUE INDEX uq_customer_mail_")
+    assert "WHERE mail IS NOT NULL" in sql
+
+
+def test_expression_index():
+    sql = compile_index("ix_customer_lower", postgresql.dialect())
+    assert "lower(customer.mail)" in sql or "lower(mail)" in sql
+
+
+def test_covering_index():
+    sql = compile_index("ix_customer_tenant", postgresql.dialect())
+    assert "INCLUDE (first_name)" in sql
+    assert "WHERE active" in sql
+    sqlite_sql = compile_index(
+        "ix_customer_tenant", sa.create_engine("sqlite://").dialect
+    )
+    assert "INCLUDE" not in sqlite_sql
+    assert "WHERE active" in sqlite_sql
+
+
+def test_indexes_are_created(make_conn):
+    conn = make_conn(Customer)
+    query = "SELECT name FROM sqlite_master WHERE type = 'index'"
+    names = {
+        r[0]
+        for r in conn.exec_driver_sql(query)
+        if r[0].startswith(("ix", "uq"))
+    }
+    assert names == {i.name for i in Customer.t.indexes}
+    conn.execute(
+        Customer.t.insert(),
+        [
+            {
+                "id": i,
+                "tenant": 1,
+                "first_name": "a",
+                "last_name": "b",
+                "mail": None,
+                "active": True,
+            }
+            for i in range(2)
+        ],
+    )
+
+
+def test_invalid_indexes():
+    with pytest.raises(ValueError):
+        Index()
+
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    with pytest.raises(KeyError):
+
+        class Broken(Other):
+            __sa_indexes__ = [Index("missing")]
+
+            id: int = Field(sa_primary_key=True)
+
+
+def test_default_names_are_unique():
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    class Item(Other):
+        __sa_indexes__ = [
+            Index(lambda c: c.price * 2),
+            Index(lambda c: c.price * 3),
+            Index("code", include=["price"]),
+            Index("code", where=lambda c: c.price > 1),
+            Index("code", where=lambda c: c.price > 2),
+        ]
+
+        id: int = Field(sa_primary_key=True)
+        code: str = Field(sa_index=True)
+        price: float
+
+    names = [i.name for i in Item.t.indexes]
+    assert len(set(names)) == 6
+    assert "ix_item_code" in names
+
+    with pytest.raises(ValueError, match="ix_duplicate_code is already used"):
+
+        class Duplicate(Other):
+            __sa_indexes__ = [Index("code")]
+
+            id: int = Field(sa_primary_key=True)
+            code: str = Field(sa_index=True)
@@ -0,0 +1,126 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.schema import CreateIndex
+
+from validatable import BaseTable, Field, Json, MetaData
+from validatable.jsonpath import JsonPath
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Event(Base):
+    id: int = Field(sa_primary_key=True)
+    payload: Json = Field(sa_json_index={"$.customer.id": int, "$.kind": str})
+    tags: list = Field(sa_json_index=["$[0]"])
+
+
+def get_index(name):
+    return next(i for i in Event.t.indexes if i.name == name)
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Event)
+    Event.load_records(
+        conn,
+        [
+            {
+                "id": i,
+                "payload": '{"customer": {"id": %d}, "kind": "k%d"}'
+                % (i % 3, i),
+                "tags": ["t{}".format(i)],
+            }
+            for i in range(9)
+        ],
+    )
+    return conn
+
+
+def test_indexes():
+    assert {i.name for i in Event.t.indexes} == {
+        "ix_event_payload__customer_id",
+        "ix_event_payload__kind",
+        "ix_event_tags__0",
+    }
+    assert Event.c.payload.info["json_index"] == {
+        "$.customer.id": int,
+        "$.kind": str,
+    }
+
+
+def test_query_uses_index(conn):
+    customer = Event.json_path("payload", "$.customer.id")
+    stmt = Event.t.select().where(customer == 1).order_by(Event.c.id)
+    assert [e.id for e in Event.select(conn, stmt)] == [1, 4, 7]
+
+    compiled = stmt.compile(conn, compile_kwargs={"literal_binds": True})
+    plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled))
+    assert "ix_event_payload__customer_id" in " ".join(
+        str(r[-1]) for r in plan
+    )
+
+
+def test_string_paths(conn):
+    kind = Event.json_path("payload", "$.kind")
+    first = Event.json_path("tags", "$[0]")
+    stmt = sa.select(Event.c.id).where(kind == "k5")
+    assert conn.execute(stmt).scalar() == 5
+    stmt = sa.select(Event.c.id).where(first == "t2")
+    assert conn.execute(stmt).scalar() == 2
+
+
+def test_postgresql_ddl():
+    sql = str(
+        CreateIndex(get_index("ix_event_payload__customer_id")).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "CAST((payload #>> '{customer,id}') AS BIGINT)" in sql
+
+
+def test_mysql_generated_column():
+    dialect = mysql.dialect()
+    sql = str(
+        CreateIndex(get_index("ix_event_payload__kind")).compile(
+            dialect=dialect
+        )
+    )
+    assert sql == (
+        "ALTER TABLE event ADD COLUMN payload__kind VARCHAR(255) AS "
+        "(JSON_UNQUOTE(JSON_EXTRACT(payload, '$.kind'))) VIRTUAL, "
+        "ADD INDEX ix_event_payload__kind (payload__kind)"
+    )
+    predicate = Event.json_path("payload", "$.kind") == "x"
+    assert str(predicate.compile(dialect=dialect)).startswith(
+        "event.payload__kind ="
+    )
+
+
+def test_mysql_unindexed_path():
+    dialect = mysql.dialect()
+    predicate = Event.json_path("payload", "$.customer.name") == "x"
+    assert str(predicate.compile(dialect=dialect)).startswith(
+        "JSON_UNQUOTE(JSON_EXTRACT(event.payload, '$.customer.name')) ="
+    )
+    predicate = JsonPath(Event.c.payload, "$.kind", int) == 1
+    assert str(predicate.compile(dialect=dialect)).startswith(
+        "JSON_EXTRACT(event.payload, '$.kind') ="
+    )
+
+
+def test_invalid_declarations():
+    with pytest.raises(ValueError):
+        Event.json_path("payload", "customer.id")
+    with pytest.raises(TypeError):
+        Event.json_path("id", "$.x")
+
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    with pytest.raises(TypeError):
+
+        class Broken(Other):
+            id: int = Field(sa_primary_key=True, sa_json_index=["$.x"])
@@ -0,0 +1,113 @@
+import pytest
+import sqlalchemy as sa
+from pydantic import BaseModel, Json, ValidationError
+
+from validatable import BaseTable, Field, MetaData
+from validatable.utils import model_to_row
+
+
+class Payload(BaseModel):
+    a: int
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Message(Base):
+    id: int = Field(sa_primary_key=True)
+    body: Json = Field(sa_lazy=True)
+    payload: Json[Payload] = Field(sa_lazy=True)
+
+
+RAW = '{"b": 1,   "a": [2]}'
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Message)
+    # Documents are inserted as text to keep their formatting.
+    conn.execute(
+        sa.text("INSERT INTO message VALUES (:id, :body, :payload)"),
+        [
+            {"id": 1, "body": RAW, "payload": '{"a": 1}'},
+            {"id": 2, "body": "[1, 2]", "payload": '{"a": "x"}'},
+        ],
+    )
+    return conn
+
+
+def stored(conn, id):
+    stmt = sa.text("SELECT body FROM message WHERE id = :id")
+    return conn.execute(stmt, {"id": id}).scalar()
+
+
+def test_raw_until_access(conn):
+    message = Message.get(conn, 1)
+    assert "body" not in message.__dict__
+    assert message._sa_raw == {"body": RAW, "payload": '{"a": 1}'}
+
+    assert message.body == {"b": 1, "a": [2]}
+    assert message.payload == Payload(a=1)
+    assert message.__dict__["body"] == {"b": 1, "a": [2]}
+    assert not message._sa_raw
+
+
+def test_validation_on_access(conn):
+    message = Message.get(conn, 2)
+    assert message.body == [1, 2]
+    with pytest.raises(ValidationError):
+        message.payload
+
+
+def test_serialization_parses(conn):
+    message = Message.get(conn, 1)
+    assert message.dict() == {
+        "id": 1,
+        "body": {"b": 1, "a": [2]},
+        "payload": {"a": 1},
+    }
+    assert message.dict(exclude_unset=True)["body"] == {"b": 1, "a": [2]}
+
+
+def test_json_keeps_raw(conn):
+    message = Message.get(conn, 1)
+    assert message.json() == '{"id": 1, "body": %s, "payload": {"a": 1}}' % RAW
+    assert message._sa_raw == {"body": RAW, "payload": '{"a": 1}'}
+    assert "body" not in message.__dict__
+
+    assert message.payload == Payload(a=1)
+    assert message.json() == Message.get(conn, 1).json()
+    assert message.json(exclude={"payload"}) == '{"id": 1, "body": %s}' % (
+        '{"b": 1, "a": [2]}'
+    )
+    assert not message._sa_raw
+
+
+def test_raw_reused_on_write(conn):
+    message = Message.get(conn, 1)
+    row = model_to_row(message)
+    assert row["body"] == RAW
+
+    Message.update_many(conn, [message])
+    assert stored(conn, 1) == RAW
+    assert "body" not in message.__dict__
+
+
+def test_assignment_replaces_raw(conn):
+    message = Message.get(conn, 1)
+    message.body = {"c": 3}
+    assert "body" not in message._sa_raw
+    message.save(conn)
+    assert stored(conn, 1) == '{"c": 3}'
+
+
+def test_requires_json_field():
+    class Other(BaseTable):
+        metadata = MetaData()
+
+    with pytest.raises(TypeError):
+
+        class Broken(Other):
+            id: int = Field(sa_primary_key=True)
+            name: str = Field(sa_lazy=True)
@@ -0,0 +1,99 @@
+import csv
+from typing import Optional
+
+import pytest
+
+from validatable import BaseTable, Field, MetaData, PositiveInt
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Vendor(Base):
+    id: int = Field(sa_primary_key=True)
+    name: str = Field(alias="vendor_name")
+    score: PositiveInt = 1
+    note: Optional[str] = None
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerows(rows)
+    return str(path)
+
+
+def select_all(conn):
+    query = Vendor.t.select().order_by(Vendor.c.id)
+    return [Vendor.parse_obj(r) for r in conn.execute(query)]
+
+
+@pytest.fixture()
+def csv_path(tmp_path):
+    rows = [["id", "vendor_name", "score", "note"]]
+    rows += [[i, "vendor {}".format(i), i % 5, ""] for i in range(1, 21)]
+    return write_csv(tmp_path / "vendors.csv", rows)
+
+
+def test_load_records(make_conn):
+    conn = make_conn(Vendor)
+    records = [{"id": i, "vendor_name": "v"} for i in range(10)]
+
+    stats = Vendor.load_records(conn, records, batch_size=3)
+
+    assert stats.inserted == 10
+    assert stats.rejected == 0
+    assert len(select_all(conn)) == 10
+
+
+def test_load_csv(make_conn, csv_path, tmp_path):
+    conn = make_conn(Vendor)
+    rejects = str(tmp_path / "rejects.csv")
+    reports = []
+
+    stats = Vendor.load_csv(
+        conn,
+        csv_path,
+        batch_size=4,
+        rejects=rejects,
+        progress=lambda s: reports.append(s.rows),
+    )
+
+    assert stats.rows == 20
+    assert stats.inserted == 16
+    assert stats.rejected == 4
+    assert stats.rate > 0
+    assert reports == [4, 8, 12, 16, 20]
+
+    models = select_all(conn)
+    assert len(models) == 16
+    assert models[0] == Vendor(id=1, vendor_name="vendor 1", score=1)
+
+    with open(rejects, newline="") as fp:
+        rejected = list(csv.DictReader(fp))
+    assert [r["id"] for r in rejected] == ["5", "10", "15", "20"]
+    assert rejected[0]["score"] == "0"
+    assert "score" in rejected[0]["error"]
+
+
+def test_load_csv_field_name_headers(make_conn, tmp_path):
+    conn = make_conn(Vendor)
+    path = write_csv(tmp_path / "v.csv", [["id", "name"], [1, "a"]])
+
+    stats = Vendor.load_csv(conn, path)
+
+    assert stats.inserted == 1
+    assert select_all(conn)[0].name == "a"
+
+
+@pytest.mark.slow
+def test_load_csv_workers(make_conn, csv_path):
+    conn = make_conn(Vendor)
+
+    stats = Vendor.load_csv(conn, csv_path, batch_size=3, workers=2)
+
+    assert stats.inserted == 16
+    assert [m.id for m in select_all(conn)] == [
+        i for i in range(1, 21) if i % 5
+    ]
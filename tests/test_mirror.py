@@ -0,0 +1,126 @@
+import time
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData, Mirror, create_engine
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Country(Base):
+    code: str = Field(sa_primary_key=True)
+    name: str
+    region: str
+    active: bool = True
+
+
+class Price(Base):
+    plan: str = Field(sa_primary_key=True)
+    currency: str = Field(sa_primary_key=True)
+    amount: int
+
+
+COUNTRIES = [
+    {"code": "ar", "name": "Argentina", "region": "americas", "active": True},
+    {"code": "br", "name": "Brazil", "region": "americas", "active": True},
+    {"code": "pt", "name": "Portugal", "region": "europe", "active": True},
+    {"code": "es", "name": "Spain", "region": "europe", "active": False},
+]
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "db.sqlite"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Country.t.insert(), COUNTRIES)
+    yield engine
+    engine.dispose()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_mirror_lookups(engine):
+    mirror = Country.mirror(engine, indexes=["region"])
+    assert len(mirror) == 4
+    assert mirror.get("pt").name == "Portugal"
+    assert mirror.get("xx") is None
+    assert [c.code for c in mirror.filter(region="europe")] == ["pt", "es"]
+    assert [c.code for c in mirror.filter(region="europe", active=True)] == [
+        "pt"
+    ]
+    assert [c.code for c in mirror.filter(active=False)] == ["es"]
+    assert mirror.filter(region="africa") == []
+    assert {c.code for c in mirror} == {"ar", "br", "pt", "es"}
+
+
+def test_mirror_composite_key(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            Price.t.insert(),
+            [
+                {"plan": "pro", "currency": "usd", "amount": 10},
+                {"plan": "pro", "currency": "eur", "amount": 9},
+            ],
+        )
+    mirror = Mirror(engine, Price)
+    assert mirror.get(("pro", "eur")).amount == 9
+
+
+def test_mirror_reload_swaps_snapshot(engine):
+    mirror = Country.mirror(engine)
+    before = mirror.all()
+    with engine.begin() as conn:
+        conn.execute(Country.t.delete().where(Country.c.code == "es"))
+    assert len(mirror) == 4
+    mirror.reload()
+    assert len(mirror) == 3
+    assert len(before) == 4
+    assert mirror.version == 2
+
+
+def test_mirror_interval_refresh(engine):
+    with Country.mirror(engine, refresh=0.01) as mirror:
+        with engine.begin() as conn:
+            conn.execute(
+                Country.t.insert(),
+                {
+                    "code": "uy",
+                    "name": "Uruguay",
+                    "region": "americas",
+                    "active": True,
+                },
+            )
+        assert wait_for(lambda: mirror.get("uy") is not None)
+
+
+def test_mirror_data_version_refresh(engine):
+    with Country.mirror(engine, refresh="data_version", poll=0.01) as mirror:
+        time.sleep(0.05)
+        assert mirror.version == 1
+        with engine.begin() as conn:
+            conn.execute(
+                Country.t.update()
+                .where(Country.c.code == "ar")
+                .values(name="Argentine Republic")
+            )
+        assert wait_for(lambda: mirror.get("ar").name != "Argentina")
+        assert mirror.version == 2
+
+
+def test_mirror_invalid_arguments(engine):
+    with pytest.raises(KeyError):
+        Country.mirror(engine, indexes=["missing"])
+    postgres = sa.create_mock_engine("postgresql://", None)
+    with pytest.raises(ValueError):
+        Country.mirror(postgres, refresh="data_version")
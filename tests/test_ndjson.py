@@ -0,0 +1,124 @@
+import datetime as dt
+import enum
+import io
+import json
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import UUID4, BaseTable, Field, Json, MetaData
+
+
+class Status(enum.Enum):
+    active = "active"
+    closed = "closed"
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Event(Base):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    num: int = 0
+    ratio: float = 0.5
+    flag: bool = True
+    name: str = "name"
+    price: Decimal = Decimal("1.5")
+    created_ts: dt.datetime = Field(default_factory=dt.datetime.now)
+    day: dt.date = Field(default_factory=dt.date.today)
+    status: Status = Status.active
+    tags: List[str] = []
+    payload: Json = "null"
+    note: Optional[str] = None
+
+
+@pytest.fixture()
+def models():
+    return [
+        Event(payload='{"customer": {"id": 1}}'),
+        Event(
+            num=2,
+            flag=False,
+            name='quo"te ção',
+            status=Status.closed,
+            tags=["a", "b"],
+            payload="[1, 2]",
+            note="note",
+        ),
+    ]
+
+
+@pytest.fixture()
+def event_conn(make_conn, models):
+    conn = make_conn(Event)
+    conn.execute(Event.t.insert(), [m.dict() for m in models])
+    return conn
+
+
+def select_all(conn):
+    query = Event.t.select().order_by(Event.c.num)
+    return [Event.parse_obj(r) for r in conn.execute(query)]
+
+
+def test_dump_ndjson(event_conn, models):
+    fp = io.StringIO()
+
+    count = Event.dump_ndjson(event_conn, None, fp, batch_size=1)
+
+    lines = fp.getvalue().splitlines()
+    assert count == 2
+    assert len(lines) == 2
+    for line, model in zip(lines, models):
+        assert json.loads(line) == json.loads(model.json())
+
+
+def test_dump_ndjson_statement(event_conn):
+    fp = io.StringIO()
+    stmt = Event.t.select().where(Event.c.num == 2)
+
+    Event.dump_ndjson(event_conn, stmt, fp)
+
+    assert json.loads(fp.getvalue())["name"] == 'quo"te ção'
+
+
+def test_load_ndjson_round_trip(event_conn, models):
+    fp = io.StringIO()
+    Event.dump_ndjson(event_conn, None, fp)
+    event_conn.execute(Event.t.delete())
+    fp.seek(0)
+
+    stats = Event.load_ndjson(event_conn, fp)
+
+    assert stats.inserted == 2
+    assert select_all(event_conn) == models
+
+
+def test_load_ndjson_rejects(make_conn):
+    conn = make_conn(Event)
+    fp = io.StringIO('{"num": 1}\n\n{"num": "x"}\n')
+    rejects = io.StringIO()
+
+    stats = Event.load_ndjson(conn, fp, rejects=rejects)
+
+    assert stats.inserted == 1
+    assert stats.rejected == 1
+    rejected = json.loads(rejects.getvalue())
+    assert rejected["record"] == {"num": "x"}
+    assert "num" in rejected["error"]
+
+
+def test_dump_ndjson_multiline_json(make_conn):
+    conn = make_conn(Event)
+    conn.execute(Event.t.insert().values(Event().dict()))
+    update = sa.text("UPDATE event SET payload = :payload")
+    conn.execute(update, payload='{\n  "a": 1\n}')
+    fp = io.StringIO()
+
+    Event.dump_ndjson(conn, None, fp)
+
+    assert fp.getvalue().count("\n") == 1
+    assert json.loads(fp.getvalue())["payload"] == {"a": 1}
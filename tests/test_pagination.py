@@ -0,0 +1,96 @@
+import datetime as dt
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Post(Base):
+    id: int = Field(sa_primary_key=True)
+    author: str
+    created: dt.datetime = Field(sa_index=True)
+
+
+START = dt.datetime(2021, 1, 1)
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Post)
+    conn.execute(
+        Post.t.insert(),
+        [
+            {
+                "id": i,
+                "author": "ab"[i % 2],
+                "created": START + dt.timedelta(hours=i // 2),
+            }
+            for i in range(1, 11)
+        ],
+    )
+    return conn
+
+
+def pages(conn, **kwargs):
+    result = []
+    after = None
+    while True:
+        page = Post.paginate(conn, after=after, **kwargs)
+        result.append([p.id for p in page.items])
+        if page.cursor is None:
+            return result
+        after = page.cursor
+
+
+def test_default_order_is_primary_key(conn):
+    assert pages(conn, page_size=4) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+
+def test_exact_last_page(conn):
+    assert pages(conn, page_size=5) == [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]
+
+
+def test_order_by_with_ties(conn):
+    assert pages(conn, order_by=["-created"], page_size=3) == [
+        [10, 8, 9],
+        [6, 7, 4],
+        [5, 2, 3],
+        [1],
+    ]
+
+
+def test_mixed_directions_and_where(conn):
+    result = pages(
+        conn,
+        order_by=["author", "-created"],
+        where=Post.c.id > 2,
+        page_size=3,
+    )
+    assert result == [[10, 8, 6], [4, 9, 7], [5, 3]]
+
+
+def test_seek_query(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    first = Post.paginate(conn, order_by=["created"], page_size=2)
+    Post.paginate(conn, order_by=["created"], page_size=2, after=first.cursor)
+    assert "(post.created, post.id) >" in statements[1]
+
+
+def test_invalid_cursors(conn):
+    cursor = Post.paginate(conn, page_size=2).cursor
+    with pytest.raises(ValueError):
+        Post.paginate(conn, order_by=["created"], after=cursor)
+    with pytest.raises(ValueError):
+        Post.paginate(conn, after="not a cursor")
+    with pytest.raises(ValueError):
+        Post.paginate(conn, page_size=0)
@@ -0,0 +1,218 @@
+import io
+from typing import Optional
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData, UnitOfWork
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Product(Base):
+    id: int = Field(sa_primary_key=True)
+    name: str
+    price: float = 0.0
+    description: str = Field("", sa_cold=True)
+    specs: list = Field(sa_cold=True, alias="specifications")
+
+
+class Counter(Base):
+    id: Optional[int] = Field(None, sa_primary_key=True)
+    notes: str = Field("", sa_cold=True)
+
+
+def product(i):
+    return Product(
+        id=i, name="p{}".format(i), description="d" * i, specifications=[i]
+    )
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Product)
+    Product.load_records(
+        conn, [product(i).dict(by_alias=True) for i in (1, 2, 3)]
+    )
+    return conn
+
+
+def capture(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def test_tables():
+    assert [c.name for c in Product.c] == ["id", "name", "price"]
+    cold = Product.cold
+    assert cold.name == "product_cold"
+    assert [c.name for c in cold.c] == ["id", "description", "specifications"]
+    assert cold.c.id.primary_key
+    assert list(cold.c.id.foreign_keys)[0].column is Product.c.id
+    assert cold.c.description.nullable
+    assert Product.__sa_deferred__ == ("description", "specs")
+
+
+def test_insert_routes_cold_values(conn):
+    rows = conn.execute(Product.cold.select()).fetchall()
+    assert [tuple(r) for r in rows] == [
+        (1, "d", [1]),
+        (2, "dd", [2]),
+        (3, "ddd", [3]),
+    ]
+
+
+def test_cold_fields_loaded_on_access(conn):
+    statements = capture(conn)
+    products = Product.select(conn)
+    assert "product_cold" not in statements[0]
+    assert [p.description for p in products] == ["d", "dd", "ddd"]
+    assert len(statements) == 2
+    assert products[1].specs == [2]
+    assert Product.get(conn, 3).description == "ddd"
+
+
+def test_full_select_joins_cold_table(conn):
+    statements = capture(conn)
+    products = Product.select(conn, Product.full_select())
+    assert products == [product(i) for i in (1, 2, 3)]
+    assert len(statements) == 1
+
+
+def test_save_routes_updates(conn):
+    item = Product.get(conn, 1)
+    item.price = 5.0
+    item.description = "new"
+    statements = capture(conn)
+    assert item.save(conn) == 1
+    assert len(statements) == 2
+    assert Product.get(conn, 1).description == "new"
+    assert Product.get(conn, 1).price == 5.0
+
+
+def test_update_many_and_delete_many(conn):
+    items = Product.select(conn, Product.full_select())
+    for item in items:
+        item.description = item.description.upper()
+        item.price = 1.0
+    assert Product.update_many(conn, items) == 3
+    assert [p.description for p in Product.select(conn)] == ["D", "DD", "DDD"]
+    assert Product.update_many(conn, items[:1], ["specs"]) == 1
+
+    assert Product.delete_many(conn, [1, 2]) == 2
+    assert conn.execute(sa.select(Product.cold.c.id)).fetchall() == [(3,)]
+
+
+def test_unit_of_work(conn):
+    uow = UnitOfWork()
+    uow.add(product(4), product(5))
+    assert uow.flush(conn) == 2
+    assert Product.get(conn, 5).specs == [5]
+
+
+def test_generated_primary_keys(make_conn):
+    conn = make_conn(Counter)
+    Counter.load_records(conn, [{"notes": "a"}, {"notes": "b"}])
+    rows = conn.execute(Counter.cold.select()).fetchall()
+    assert [tuple(r) for r in rows] == [(1, "a"), (2, "b")]
+
+
+def test_missing_cold_row(conn):
+    conn.execute(Product.t.insert(), {"id": 9, "name": "raw", "price": 1})
+    item = Product.get(conn, 9)
+    assert item.description == ""
+    with pytest.raises(ValueError):
+        item.specs
+
+
+def test_rows_join_cold_table(conn):
+    rows = Product.select(conn, rows=True)
+    assert rows[0].description == "d"
+    assert [r.to_model() for r in Product.iter_rows(conn)] == [
+        product(i) for i in (1, 2, 3)
+    ]
+
+
+def test_mirror_and_columnar_snapshot(conn, tmp_path):
+    with Product.mirror(conn.engine) as mirror:
+        assert mirror.get(2) == product(2)
+    Product.export_columnar(conn, str(tmp_path))
+    snapshot = Product.open_columnar(str(tmp_path))
+    assert list(snapshot) == [product(i) for i in (1, 2, 3)]
+    assert snapshot.column("specifications")[0] == [1]
+
+
+def test_select_fields_and_paginate_cold_fields(conn):
+    page = Product.paginate(conn, order_by=["-description"], page_size=2)
+    assert [p.id for p in page.items] == [3, 2]
+    page = Product.paginate(conn, order_by=["-description"], after=page.cursor)
+    assert [p.id for p in page.items] == [1]
+    page = Product.paginate(conn, where=Product.cold.c.description != "dd")
+    assert [p.id for p in page.items] == [1, 3]
+
+    conn.execute(Product.t.insert(), {"id": 9, "name": "raw", "price": 1})
+    rows = Product.select_fields(conn, "name", "specifications")
+    assert [(r.name, r.specs) for r in rows][2:] == [
+        ("p3", [3]),
+        ("raw", None),
+    ]
+    rows = Product.select_fields(
+        conn, "name", where=Product.cold.c.description == "dd"
+    )
+    assert [r.name for r in rows] == ["p2"]
+
+
+def test_ndjson_and_parquet_round_trips(conn, tmp_path):
+    products = [product(i) for i in (1, 2, 3)]
+    fp = io.StringIO()
+    assert Product.dump_ndjson(conn, None, fp) == 3
+    assert '"specifications":[1]' in fp.getvalue()
+    assert Product.delete_many(conn, [1, 2, 3]) == 3
+    fp.seek(0)
+    assert Product.load_ndjson(conn, fp).inserted == 3
+    assert Product.select(conn, Product.full_select()) == products
+
+    path = str(tmp_path / "product.parquet")
+    assert Product.write_parquet(conn, path) == 3
+    assert Product.to_arrow(conn).column_names[-1] == "specifications"
+    assert Product.delete_many(conn, [1, 2, 3]) == 3
+    assert Product.read_parquet(conn, path) == 3
+    assert Product.select(conn, Product.full_select()) == products
+
+
+def test_update_many_loads_named_cold_fields(conn):
+    (item,) = Product.select(conn, Product.t.select().where(Product.c.id == 1))
+    item.price = 2.0
+    assert Product.update_many(conn, [item], ["price", "description"]) == 1
+    assert Product.get(conn, 1).description == "d"
+
+
+def test_updates_insert_missing_cold_rows(conn):
+    conn.execute(
+        Product.t.insert(),
+        [{"id": i, "name": "raw", "price": 1} for i in (8, 9)],
+    )
+    item = Product.get(conn, 9)
+    item.description = "saved"
+    assert item.save(conn) == 1
+    assert Product.get(conn, 9).description == "saved"
+
+    (item,) = Product.get_many(conn, [8])
+    item.description = "bulk"
+    assert Product.update_many(conn, [item], ["description"]) == 1
+    assert Product.get(conn, 8).description == "bulk"
+    rows = conn.execute(sa.select(Product.cold.c.id)).fetchall()
+    assert [r.id for r in rows] == [1, 2, 3, 8, 9]
+
+
+def test_insert_many_writes_cold_rows(conn):
+    assert Product.insert_many(conn, [product(4), product(5)]) == 2
+    assert Product.get(conn, 4).description == "dddd"
+    assert Product.get(conn, 5).specs == [5]
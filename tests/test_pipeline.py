@@ -0,0 +1,106 @@
+import pytest
+
+from validatable import (
+    BaseTable,
+    Field,
+    IngestPipeline,
+    MetaData,
+    PositiveInt,
+    validator,
+)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Reading(Base):
+    id: int = Field(sa_primary_key=True)
+    value: PositiveInt
+
+    @validator("value")
+    def value_is_not_broken(cls, v):
+        if v == 999:
+            raise RuntimeError("broken sensor")
+        return v
+
+
+def records(n, invalid=()):
+    for i in range(n):
+        yield {"id": i, "value": 0 if i in invalid else i + 1}
+
+
+def select_ids(conn):
+    query = Reading.t.select().order_by(Reading.c.id)
+    return [r.id for r in conn.execute(query)]
+
+
+def test_pipeline_ordered(make_conn):
+    conn = make_conn(Reading)
+    chunks = []
+    pipeline = IngestPipeline(
+        Reading,
+        workers=2,
+        batch_size=7,
+        queue_size=2,
+        rejects=chunks.extend,
+    )
+
+    stats = pipeline.run(conn, records(100, invalid={3, 50}))
+
+    assert stats.rows == 100
+    assert stats.inserted == 98
+    assert stats.rejected == 2
+    assert [r["id"] for r, _ in chunks] == [3, 50]
+    assert select_ids(conn) == [i for i in range(100) if i not in (3, 50)]
+
+
+def test_pipeline_unordered(make_conn):
+    conn = make_conn(Reading)
+    pipeline = IngestPipeline(Reading, workers=2, batch_size=5, ordered=False)
+
+    stats = pipeline.run(conn, records(50))
+
+    assert stats.inserted == 50
+    assert select_ids(conn) == list(range(50))
+
+
+def test_pipeline_progress(make_conn):
+    conn = make_conn(Reading)
+    reports = []
+    pipeline = IngestPipeline(
+        Reading,
+        workers=1,
+        batch_size=4,
+        progress=lambda s: reports.append(s.rows),
+    )
+
+    pipeline.run(conn, records(10))
+
+    assert reports == [4, 8, 10]
+
+
+def test_pipeline_source_error(make_conn):
+    conn = make_conn(Reading)
+
+    def failing():
+        yield from records(10)
+        raise OSError("source failed")
+
+    pipeline = IngestPipeline(Reading, workers=2, batch_size=3)
+
+    with pytest.raises(OSError, match="source failed"):
+        pipeline.run(conn, failing())
+
+
+def test_pipeline_worker_error(make_conn):
+    conn = make_conn(Reading)
+    pipeline = IngestPipeline(Reading, workers=2, batch_size=3)
+    source = (
+        {**r, "value": 999} if r["id"] == 12 else r for r in records(100)
+    )
+
+    with pytest.raises(RuntimeError, match="broken sensor"):
+        pipeline.run(conn, source)
+
+    assert select_ids(conn) == list(range(12))
@@ -0,0 +1,161 @@
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData, QueryCache, create_engine
+from validatable.cache import invalidate
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Item(Base):
+    id: int = Field(sa_primary_key=True)
+    name: str = ""
+    price: float = 0.0
+
+
+class Other(Base):
+    id: int = Field(sa_primary_key=True)
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Item)
+    Other.metadata.create_all(conn, tables=[Other.t])
+    conn.execute(
+        Item.t.insert(),
+        [{"id": i, "name": "item{}".format(i), "price": i} for i in range(5)],
+    )
+    return conn
+
+
+def count_statements(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_execute")
+    def before(conn, clauseelement, multiparams, params, options):
+        statements.append(clauseelement)
+
+    return statements
+
+
+def test_select_without_cache(conn):
+    items = Item.select(conn)
+    assert [i.id for i in items] == list(range(5))
+    assert all(isinstance(i, Item) for i in items)
+
+
+def test_select_cache_hit(conn):
+    cache = QueryCache()
+    statements = count_statements(conn)
+    stmt = Item.t.select().where(Item.c.price > 2)
+    first = Item.select(conn, stmt, cache)
+    second = Item.select(conn, Item.t.select().where(Item.c.price > 2), cache)
+    assert first == second
+    assert first[0] is not second[0]
+    assert len(statements) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_select_cache_keyed_by_parameters(conn):
+    cache = QueryCache()
+    ids = [
+        [i.id for i in Item.select(conn, stmt, cache)]
+        for stmt in (
+            Item.t.select().where(Item.c.id.in_([1, 2])),
+            Item.t.select().where(Item.c.id.in_([3])),
+            Item.t.select().where(Item.c.price > 3),
+        )
+    ]
+    assert ids == [[1, 2], [3], [4]]
+    assert cache.misses == 3
+
+
+def test_select_copies_are_independent(conn):
+    cache = QueryCache()
+    Item.select(conn, cache=cache)[0].name = "changed"
+    assert Item.select(conn, cache=cache)[0].name == "item0"
+
+
+def test_write_invalidates_table(conn):
+    cache = QueryCache()
+    Item.select(conn, cache=cache)
+    Other.select(conn, cache=cache)
+    assert len(cache) == 2
+    Item.delete_many(conn, [0])
+    assert len(cache) == 1
+    assert [i.id for i in Item.select(conn, cache=cache)] == [1, 2, 3, 4]
+
+
+def test_invalidate_joined_tables(conn):
+    cache = QueryCache()
+    stmt = Item.t.select().where(
+        Item.c.id.in_(sa.select(Other.c.id).scalar_subquery())
+    )
+    assert Item.select(conn, stmt, cache) == []
+    conn.execute(Other.t.insert(), [{"id": 1}])
+    # Raw writes are not tracked until invalidated.
+    assert Item.select(conn, stmt, cache) == []
+    invalidate(Other.t)
+    assert [i.id for i in Item.select(conn, stmt, cache)] == [1]
+
+
+def test_eviction_by_count_and_bytes(conn):
+    cache = QueryCache(maxsize=2)
+    for i in range(3):
+        Item.select(conn, Item.t.select().where(Item.c.id == i), cache)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    cache = QueryCache(maxbytes=1)
+    Item.select(conn, cache=cache)
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_invalidation_during_query_is_not_overwritten(conn):
+    cache = QueryCache()
+
+    @sa.event.listens_for(conn, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        invalidate(Item.t)
+
+    assert len(Item.select(conn, cache=cache)) == 5
+    sa.event.remove(conn, "after_cursor_execute", after)
+    assert len(cache) == 0
+    Item.select(conn, cache=cache)
+    assert len(cache) == 1
+
+
+def test_uncommitted_results_are_not_cached(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "db.sqlite"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Item.t.insert(), [{"id": 1, "name": "a", "price": 1}])
+    cache = QueryCache()
+
+    with engine.connect() as writer, engine.connect() as reader:
+        transaction = writer.begin()
+        Item.update_many(writer, [Item(id=1, name="uncommitted")])
+        assert Item.select(writer, cache=cache)[0].name == "uncommitted"
+        transaction.rollback()
+        assert Item.select(reader, cache=cache)[0].name == "a"
+        assert Item.select(writer, cache=cache)[0].name == "a"
+    assert (cache.hits, cache.misses) == (1, 1)
+    engine.dispose()
+
+
+def test_results_are_keyed_by_engine():
+    cache = QueryCache()
+    names = []
+    for name in ("first", "second"):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                Item.t.insert(), [{"id": 1, "name": name, "price": 1}]
+            )
+            names.append(Item.select(conn, cache=cache)[0].name)
+        engine.dispose()
+    assert names == ["first", "second"]
@@ -0,0 +1,104 @@
+import uuid
+from typing import Optional
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import UUID4, BaseTable, Field, ForeignKey, MetaData
+
+metadata = MetaData()
+
+
+class User(BaseTable, metadata=metadata):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    name: str
+    friends: Optional[UUID4] = Field(sa_fk=ForeignKey("user.id"))
+
+
+class Country(BaseTable, metadata=metadata):
+    code: str = Field(sa_primary_key=True)
+
+
+class Address(BaseTable, metadata=metadata):
+    id: int = Field(sa_primary_key=True)
+    country: str = Field(
+        alias="country_code", sa_fk=ForeignKey("country.code")
+    )
+    owner: UUID4
+
+
+plain = sa.Table(
+    "plain", metadata, sa.Column("id", sa.Integer, primary_key=True)
+)
+
+
+class Linked(BaseTable, metadata=metadata):
+    id: int = Field(sa_primary_key=True)
+    plain_id: int = Field(sa_fk=ForeignKey("plain.id"))
+
+
+@pytest.fixture()
+def users(make_conn):
+    conn = make_conn(User)
+    alice = User(name="alice")
+    bob = User(name="bob", friends=alice.id)
+    carol = User(name="carol", friends=alice.id)
+    dave = User(name="dave", friends=bob.id)
+    users = [alice, bob, carol, dave]
+    conn.execute(User.t.insert(), [u.dict() for u in users])
+    return conn, users
+
+
+def test_load_related(users):
+    conn, (alice, bob, carol, dave) = users
+    statements = []
+
+    @sa.event.listens_for(conn, "before_execute")
+    def receive(conn, clauseelement, multiparams, params, options):
+        statements.append(clauseelement)
+
+    related = User.load_related(conn, [alice, bob, carol, dave], "friends")
+
+    assert related == {alice.id: alice, bob.id: bob}
+    assert len(statements) == 1
+
+
+def test_load_related_chunks(users):
+    conn, (alice, bob, carol, dave) = users
+    statements = []
+
+    @sa.event.listens_for(conn, "before_execute")
+    def receive(conn, clauseelement, multiparams, params, options):
+        statements.append(clauseelement)
+
+    related = User.load_related(conn, [dave, bob], "friends", chunk_size=1)
+
+    assert related == {alice.id: alice, bob.id: bob}
+    assert len(statements) == 2
+
+
+def test_load_related_alias(make_conn):
+    conn = make_conn(Address)
+    conn.execute(Country.t.insert(), [{"code": "BR"}, {"code": "PT"}])
+    addresses = [
+        Address(id=1, country_code="BR", owner=uuid.uuid4()),
+        Address(id=2, country_code="XX", owner=uuid.uuid4()),
+    ]
+
+    related = Address.load_related(conn, addresses, "country")
+
+    assert related == {"BR": Country(code="BR")}
+
+
+def test_load_related_plain_table(make_conn):
+    conn = make_conn(Linked)
+    conn.execute(plain.insert(), [{"id": 1}])
+
+    related = Linked.load_related(conn, [Linked(id=1, plain_id=1)], "plain_id")
+
+    assert related[1].id == 1
+
+
+def test_load_related_without_foreign_key():
+    with pytest.raises(ValueError):
+        Address.load_related(None, [], "owner")
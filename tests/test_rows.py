@@ -0,0 +1,131 @@
+import sys
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData, NotLoaded, QueryCache
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Event(Base):
+    id: int = Field(sa_primary_key=True)
+    kind: str = Field(alias="type")
+    payload: list = []
+    score: float = 0.0
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Event)
+    conn.execute(
+        Event.t.insert(),
+        [
+            {"id": i, "type": "click", "payload": [i], "score": i / 2}
+            for i in range(3)
+        ],
+    )
+    return conn
+
+
+def test_row_class():
+    Row = Event.row_class
+    assert Row.__name__ == "EventRow"
+    assert Row._fields == ("id", "kind", "payload", "score")
+    row = Row(1, "view", [], 1.5)
+    assert (row.id, row.kind, row.score) == (1, "view", 1.5)
+    assert row._asdict() == {
+        "id": 1,
+        "kind": "view",
+        "payload": [],
+        "score": 1.5,
+    }
+    assert repr(row).startswith("EventRow(id=1, kind='view'")
+    assert not hasattr(row, "__dict__")
+
+
+def test_row_is_read_only():
+    row = Event.row_class(1, "view", [], 1.5)
+    with pytest.raises(AttributeError):
+        row.kind = "click"
+    with pytest.raises(AttributeError):
+        row.other = 1
+    with pytest.raises(AttributeError):
+        del row.id
+    with pytest.raises(TypeError):
+        Event.row_class(1)
+
+
+def test_to_model():
+    row = Event.row_class(1, "view", [2], 1.5)
+    assert row.to_model() == Event(id=1, type="view", payload=[2], score=1.5)
+
+
+def test_select_rows(conn):
+    rows = Event.select(conn, rows=True)
+    assert [r.id for r in rows] == [0, 1, 2]
+    assert rows[2].payload == [2]
+    assert all(type(r) is Event.row_class for r in rows)
+
+
+def test_iter_rows_reorders_columns(conn):
+    stmt = sa.select(*reversed(Event.c)).where(Event.c.id == 1)
+    (row,) = Event.iter_rows(conn, stmt)
+    assert row == Event.row_class(1, "click", [1], 0.5)
+    with pytest.raises(ValueError):
+        list(Event.iter_rows(conn, sa.select(Event.c.id)))
+
+
+def test_cached_rows(conn):
+    cache = QueryCache()
+    rows = Event.select(conn, cache=cache, rows=True)
+    models = Event.select(conn, cache=cache)
+    assert Event.select(conn, cache=cache, rows=True) == rows
+    assert [m.id for m in models] == [r.id for r in rows]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_row_memory():
+    row = Event.row_class(1, "view", [], 1.5)
+    model = Event(id=1, type="view", payload=[], score=1.5)
+    parts = [model, model.__dict__, model.__fields_set__, model._sa_dirty]
+    model_size = sum(sys.getsizeof(p) for p in parts)
+    assert sys.getsizeof(row) * 3 < model_size
+
+
+def test_select_fields(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    rows = Event.select_fields(conn, "id", "type", where=Event.c.id > 0)
+    assert [(r.id, r.kind) for r in rows] == [(1, "click"), (2, "click")]
+    assert "payload" not in statements[0]
+    assert rows[0]._asdict() == {"id": 1, "kind": "click"}
+    assert list(rows[0]) == [1, "click"]
+
+
+def test_unloaded_fields_raise(conn):
+    (row,) = Event.select_fields(conn, "score", "score", where=Event.c.id == 2)
+    assert row.score == 1.0
+    with pytest.raises(NotLoaded, match="EventRow.payload"):
+        row.payload
+    with pytest.raises(AttributeError):
+        row.kind
+    assert getattr(row, "id", None) is None
+    with pytest.raises(NotLoaded):
+        row.to_model()
+    with pytest.raises(AttributeError) as info:
+        row.missing
+    assert not isinstance(info.value, NotLoaded)
+
+
+def test_select_fields_invalid(conn):
+    with pytest.raises(ValueError):
+        Event.select_fields(conn)
+    with pytest.raises(KeyError):
+        Event.select_fields(conn, "missing")
@@ -0,0 +1,134 @@
+import pytest
+import sqlalchemy as sa
+
+from validatable import BaseTable, Field, MetaData
+from validatable.tracking import update_statement
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Document(Base):
+    __sa_cache__ = True
+
+    id: int = Field(sa_primary_key=True)
+    title: str
+    body: list = Field(alias="content")
+    views: int = 0
+
+
+class Membership(Base):
+    org: int = Field(sa_primary_key=True)
+    user: int = Field(sa_primary_key=True)
+    role: str = "member"
+
+
+class Loose(Base):
+    value: int = 0
+
+
+@pytest.fixture()
+def conn(make_conn):
+    conn = make_conn(Document)
+    conn.execute(
+        Document.t.insert(),
+        [
+            {"id": 1, "title": "a", "content": [1], "views": 0},
+            {"id": 2, "title": "b", "content": [2], "views": 0},
+        ],
+    )
+    Document.cache.clear()
+    yield conn
+    Document.cache.clear()
+
+
+def capture_updates(conn):
+    statements = []
+
+    @sa.event.listens_for(conn, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            statements.append(statement)
+
+    return statements
+
+
+def test_assignments_mark_fields_dirty():
+    doc = Document(id=1, title="a", content=[])
+    assert doc._sa_dirty == set()
+    doc.title = "b"
+    doc.views += 1
+    assert doc._sa_dirty == {"title", "views"}
+
+
+def test_save_writes_only_dirty_columns(conn):
+    doc = Document.get(conn, 1)
+    doc.views = 10
+    statements = capture_updates(conn)
+    assert doc.save(conn) == 1
+    assert len(statements) == 1
+    assert "views" in statements[0]
+    assert "title" not in statements[0]
+    assert "content" not in statements[0]
+    assert doc._sa_dirty == set()
+    assert Document.get(conn, 1).views == 10
+    assert Document.get(conn, 2).views == 0
+
+
+def test_save_without_changes(conn):
+    doc = Document.get(conn, 1)
+    statements = capture_updates(conn)
+    assert doc.save(conn) == 0
+    assert statements == []
+
+
+def test_update_aliased_field(conn):
+    doc = Document.get(conn, 2)
+    doc.body = [3]
+    assert Document.update(conn, doc) == 1
+    row = conn.execute(sa.select(Document.c.content)).fetchall()
+    assert [r[0] for r in row] == [[1], [3]]
+
+
+def test_statements_cached_per_column_set(conn):
+    update_statement.cache_clear()
+    for i in (1, 2):
+        doc = Document.get(conn, i)
+        doc.views = 5
+        doc.save(conn)
+    doc.title = "c"
+    doc.save(conn)
+    info = update_statement.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_copy_has_own_dirty_set(conn):
+    doc = Document.get(conn, 1)
+    copy = doc.copy(update={"title": "z"})
+    copy.views = 3
+    assert doc._sa_dirty == set()
+    assert copy._sa_dirty == {"title", "views"}
+    assert Document.get(conn, 1)._sa_dirty == set()
+
+
+def test_composite_key(make_conn):
+    conn = make_conn(Membership)
+    conn.execute(Membership.t.insert(), [{"org": 1, "user": 2, "role": "x"}])
+    member = Membership(org=1, user=2)
+    member.role = "admin"
+    assert member.save(conn) == 1
+    assert conn.execute(sa.select(Membership.c.role)).scalar() == "admin"
+
+
+def test_invalid_updates(conn):
+    doc = Document.get(conn, 1)
+    doc.id = 3
+    with pytest.raises(ValueError):
+        doc.save(conn)
+    with pytest.raises(TypeError):
+        Membership.update(conn, doc)
+    loose = Loose()
+    loose.value = 1
+    with pytest.raises(TypeError):
+        loose.save(conn)
@@ -0,0 +1,111 @@
+import uuid
+from typing import Optional
+
+import pytest
+import sqlalchemy as sa
+
+from validatable import (
+    UUID4,
+    BaseTable,
+    Field,
+    ForeignKey,
+    MetaData,
+    UnitOfWork,
+)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Customer(Base):
+    id: UUID4 = Field(default_factory=uuid.uuid4, sa_primary_key=True)
+    name: str
+    friend: Optional[UUID4] = Field(sa_fk=ForeignKey("customer.id"))
+
+
+class Purchase(Base):
+    id: int = Field(sa_primary_key=True)
+    customer_id: UUID4 = Field(sa_fk=ForeignKey("customer.id"))
+
+
+class PurchaseLine(Base):
+    id: int = Field(sa_primary_key=True)
+    purchase_id: int = Field(sa_fk=ForeignKey("purchase.id"))
+    quantity: int = 1
+
+
+class Other(BaseTable, metadata=MetaData()):
+    id: int = Field(sa_primary_key=True)
+
+
+@pytest.fixture()
+def uow_conn(make_conn):
+    conn = make_conn(Customer)
+    conn.execute(sa.text("PRAGMA foreign_keys = ON"))
+    yield conn
+    conn.execute(sa.text("PRAGMA foreign_keys = OFF"))
+
+
+def count(conn, model):
+    query = sa.select([sa.func.count()]).select_from(model.t)
+    return conn.execute(query).scalar()
+
+
+def test_unit_of_work_flush_order(uow_conn):
+    alice = Customer(name="alice")
+    bob = Customer(name="bob", friend=alice.id)
+    uow = UnitOfWork()
+
+    uow.add(
+        PurchaseLine(id=1, purchase_id=1), PurchaseLine(id=2, purchase_id=1)
+    )
+    uow.add(Purchase(id=1, customer_id=bob.id))
+    uow.add_all([alice, bob])
+
+    assert len(uow) == 5
+    assert uow.flush(uow_conn) == 5
+    assert len(uow) == 0
+    assert count(uow_conn, Customer) == 2
+    assert count(uow_conn, Purchase) == 1
+    assert count(uow_conn, PurchaseLine) == 2
+
+
+def test_unit_of_work_statements(uow_conn):
+    statements = []
+
+    @sa.event.listens_for(uow_conn, "before_execute")
+    def receive(conn, clauseelement, multiparams, params, options):
+        statements.append(str(clauseelement))
+
+    customer = Customer(name="carol")
+    uow = UnitOfWork()
+    uow.add_all(PurchaseLine(id=i, purchase_id=1) for i in range(100))
+    uow.add(Purchase(id=1, customer_id=customer.id), customer)
+    uow.flush(uow_conn)
+
+    assert len(statements) == 3
+    assert statements[0].startswith("INSERT INTO customer ")
+    assert statements[1].startswith("INSERT INTO purchase ")
+
+
+def test_unit_of_work_rollback(uow_conn):
+    uow = UnitOfWork()
+    uow.add(Purchase(id=1, customer_id=uuid.uuid4()))
+
+    with pytest.raises(sa.exc.IntegrityError):
+        uow.flush(uow_conn)
+
+    assert count(uow_conn, Purchase) == 0
+
+
+def test_unit_of_work_metadata():
+    uow = UnitOfWork()
+    uow.add(Purchase(id=1, customer_id=uuid.uuid4()))
+
+    with pytest.raises(ValueError):
+        uow.add(Other(id=1))
+
+
+def test_unit_of_work_empty_flush(uow_conn):
+    assert UnitOfWork().flush(uow_conn) == 0
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from validatable import (
+    BaseTable,
+    Field,
+    MetaData,
+    PositiveInt,
+    Quarantine,
+    RowError,
+)
+
+
+class Base(BaseTable):
+    metadata = MetaData()
+
+
+class Order(Base):
+    __sa_quarantine__ = True
+
+    id: int = Field(sa_primary_key=True)
+    total: PositiveInt
+    code: str = Field("", alias="order_code")
+
+
+class Item(Base):
+    id: int = Field(sa_primary_key=True)
+
+
+RECORDS = [
+    {"id": 1, "total": 10, "order_code": "a"},
+    {"id": 2, "total": -1},
+    {"id": 3},
+    {"id": "x", "total": "y"},
+    {"id": 5, "total": 5},
+]
+
+
+def test_validate_many():
+    rows, errors = Order.validate_many(RECORDS)
+
+    assert rows == [
+        {"id": 1, "total": 10, "order_code": "a"},
+        {"id": 5, "total": 5, "order_code": ""},
+    ]
+    assert errors == [
+        RowError(1, "total", "value_error.number.not_gt"),
+        RowError(2, "total", "value_error.missing"),
+        RowError(3, "id", "type_error.integer"),
+        RowError(3, "total", "type_error.integer"),
+    ]
+
+
+def test_validate_many_start():
+    _, errors = Order.validate_many(RECORDS[1:2], start=100)
+
+    assert errors[0].row_index == 100
+
+
+def test_quarantine_table():
+    assert Order.quarantine.name == "order_quarantine"
+    assert Order.quarantine.metadata is Order.metadata
+    assert Item.quarantine is None
+
+
+def test_quarantine_requires_table(make_conn):
+    conn = make_conn(Item)
+
+    with pytest.raises(TypeError):
+        Quarantine(conn, Item)
+
+
+def test_load_records_quarantine(make_conn):
+    conn = make_conn(Order)
+
+    stats = Order.load_records(
+        conn, RECORDS, batch_size=2, rejects=Quarantine(conn, Order)
+    )
+
+    assert stats.inserted == 2
+    assert stats.rejected == 3
+    query = Order.quarantine.select().order_by(Order.quarantine.c.id)
+    rows = conn.execute(query).fetchall()
+    assert [r.row_index for r in rows] == [1, 2, 3]
+    assert json.loads(rows[2].payload) == {"id": "x", "total": "y"}
+    assert json.loads(rows[2].errors) == [
+        ["id", "type_error.integer"],
+        ["total", "type_error.integer"],
+    ]
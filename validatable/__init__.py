@@ -61,15 +61,34 @@ from pydantic.types import (
 )
 from sqlalchemy import ForeignKey, MetaData
 
+from .cache import IdentityCache, QueryCache
 from .engine import create_engine
 from .fields import Field
+from .indexes import Index
 from .main import BaseTable, Validatable
+from .mirror import Mirror
+from .pagination import Page
+from .pipeline import IngestPipeline, LoadStats
+from .rows import NotLoaded
+from .unit_of_work import UnitOfWork
+from .validation import Quarantine, RowError
 from .version import VERSION
 
 __all__ = [
     "Validatable",
     "BaseTable",
     "Field",
+    "IdentityCache",
+    "Index",
+    "IngestPipeline",
+    "LoadStats",
+    "Mirror",
+    "NotLoaded",
+    "Page",
+    "Quarantine",
+    "QueryCache",
+    "RowError",
+    "UnitOfWork",
     "__version__",
     # sqlalchemy
     "create_engine",
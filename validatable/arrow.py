@@ -0,0 +1,234 @@
+"""
+The arrow module provides Arrow and Parquet interchange for tables.
+
+Arrow types are derived from the column types inferred by get_sql_type.
+Values are converted column by column from result tuples, so no model
+instance is created in either direction.
+"""
+import enum
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import sqlalchemy as sa
+
+from .cache import invalidate_rows
+from .generic_types import GUID, AutoJson, dumps
+from .partition import full_select, insert_rows
+from .utils import base_type, transaction
+
+try:
+    import pyarrow as pa  # type: ignore[import]
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+def _require_pyarrow():
+    if pa is None:  # pragma: no cover
+        raise ImportError(
+            "pyarrow is required for Arrow and Parquet interchange, "
+            "install it with `pip install validatable[arrow]`"
+        )
+
+
+def _numeric_type(type_: sa.Numeric) -> Any:
+    if type_.precision:
+        return pa.decimal128(type_.precision, type_.scale or 0)
+    return pa.string()
+
+
+# The order matters: Float is a Numeric, Enum is a String and SmallInteger
+# and BigInteger are Integers.
+ARROW_TYPES = (
+    (GUID, lambda t: pa.binary(16)),
+    (AutoJson, lambda t: pa.string()),
+    (sa.Enum, lambda t: pa.dictionary(pa.int32(), pa.string())),
+    (sa.Boolean, lambda t: pa.bool_()),
+    (sa.SmallInteger, lambda t: pa.int16()),
+    (sa.BigInteger, lambda t: pa.int64()),
+    (sa.Integer, lambda t: pa.int64()),
+    (sa.Float, lambda t: pa.float64()),
+    (sa.Numeric, _numeric_type),
+    (sa.DateTime, lambda t: pa.timestamp("us")),
+    (sa.Date, lambda t: pa.date32()),
+    (sa.Time, lambda t: pa.time64("us")),
+    (sa.Interval, lambda t: pa.duration("us")),
+    (sa.LargeBinary, lambda t: pa.binary()),
+    (sa.String, lambda t: pa.string()),
+)
+
+
+def get_arrow_type(column: sa.Column) -> Any:
+    """Return the Arrow type of a column."""
+    _require_pyarrow()
+    type_ = base_type(column)
+    for types, func in ARROW_TYPES:
+        if isinstance(type_, types):
+            return func(type_)
+    raise TypeError("cannot infer arrow type for {}".format(column.type))
+
+
+def get_arrow_schema(model: Any, names: Optional[List[str]] = None) -> Any:
+    """Return the Arrow schema of the model tables."""
+    columns = full_select(model).selected_columns
+    names = names or [c.name for c in columns]
+    return pa.schema(
+        [
+            pa.field(n, get_arrow_type(columns[n]), bool(columns[n].nullable))
+            for n in names
+        ]
+    )
+
+
+def _to_json(v: Any) -> str:
+    return v if isinstance(v, str) else dumps(v)
+
+
+def _to_name(v: Any) -> str:
+    return v.name if isinstance(v, enum.Enum) else v
+
+
+def _is_text_numeric(type_: Any) -> bool:
+    if isinstance(type_, sa.Float) or not isinstance(type_, sa.Numeric):
+        return False
+    return not type_.precision
+
+
+def _to_arrow_converter(column: sa.Column) -> Optional[Callable]:
+    type_ = base_type(column)
+    if isinstance(type_, GUID):
+        return lambda v: v.bytes
+    if isinstance(type_, AutoJson):
+        return _to_json
+    if isinstance(type_, sa.Enum):
+        return _to_name
+    if _is_text_numeric(type_) or isinstance(type_, sa.String):
+        return str
+    return None
+
+
+def _from_arrow_converter(column: sa.Column) -> Optional[Callable]:
+    type_ = base_type(column)
+    if isinstance(type_, GUID):
+        return lambda v: uuid.UUID(bytes=v)
+    if isinstance(type_, AutoJson):
+        return json.loads
+    if _is_text_numeric(type_):
+        return Decimal
+    return None
+
+
+def _convert(values: List[Any], func: Optional[Callable]) -> List[Any]:
+    if func is None:
+        return values
+    return [None if v is None else func(v) for v in values]
+
+
+def iter_record_batches(
+    conn, model: Any, stmt: Any = None, batch_size: int = 65536
+) -> Iterator[Any]:
+    """Yield the rows selected by stmt as Arrow record batches.
+
+    By default the cold table is joined.
+    """
+    _require_pyarrow()
+    select = full_select(model)
+    columns = select.selected_columns
+    stmt = select if stmt is None else stmt
+    result = conn.execute(stmt)
+    names = list(result.keys())
+    schema = get_arrow_schema(model, names)
+    converters = [_to_arrow_converter(columns[n]) for n in names]
+
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            return
+        arrays = [
+            pa.array(_convert(list(values), func), type=field.type)
+            for values, func, field in zip(zip(*rows), converters, schema)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def to_arrow(
+    conn, model: Any, stmt: Any = None, batch_size: int = 65536
+) -> Any:
+    """Return the rows selected by stmt as an Arrow table."""
+    batches = iter_record_batches(conn, model, stmt, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return get_arrow_schema(model).empty_table()
+    return pa.Table.from_batches([first, *batches])
+
+
+def from_arrow(
+    model: Any, data: Any, batch_size: int = 65536
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield insert parameters from an Arrow table or record batch.
+
+    Each yielded list holds the rows of one record batch, keyed by column
+    name, ready to be inserted with ``insert_rows``.
+    """
+    _require_pyarrow()
+    batches = (
+        data.to_batches(batch_size) if isinstance(data, pa.Table) else [data]
+    )
+    table_columns = full_select(model).selected_columns
+    for batch in batches:
+        names = [n for n in batch.schema.names if n in table_columns]
+        columns = [
+            _convert(
+                batch.column(n).to_pylist(),
+                _from_arrow_converter(table_columns[n]),
+            )
+            for n in names
+        ]
+        yield [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def insert_arrow(conn, model: Any, data: Any, batch_size: int = 65536) -> int:
+    """Insert an Arrow table or record batch and return the row count."""
+    count = 0
+    for rows in from_arrow(model, data, batch_size):
+        if rows:
+            with transaction(conn):
+                insert_rows(conn, model, rows)
+            invalidate_rows(model.t, rows, conn)
+            count += len(rows)
+    return count
+
+
+def write_parquet(
+    conn, model: Any, path: str, stmt: Any = None, batch_size: int = 65536
+) -> int:
+    """Stream the rows selected by stmt to a Parquet file."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq  # type: ignore[import]
+
+    count = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(conn, model, stmt, batch_size):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema)
+            writer.write_batch(batch)
+            count += batch.num_rows
+        if writer is None:
+            writer = pq.ParquetWriter(path, get_arrow_schema(model))
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def read_parquet(conn, model: Any, path: str, batch_size: int = 65536) -> int:
+    """Insert the rows of a Parquet file and return the row count."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq  # type: ignore[import]
+
+    count = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        count += insert_arrow(conn, model, batch, batch_size)
+    return count
@@ -0,0 +1,252 @@
+"""
+The bulk module provides set-based operations by primary key.
+
+Moderate key sets are sent with chunked ``IN`` lists. Large ones are
+staged into a temporary table with one executemany and joined, which
+avoids parameter limits and huge statements.
+"""
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import sqlalchemy as sa
+
+from .cache import invalidate, invalidate_rows
+from .deferred import default_select, rows_to_models
+from .partition import insert_cold_rows, insert_rows
+from .utils import (
+    chunked,
+    field_columns,
+    get_column,
+    key_clause,
+    model_to_row,
+    primary_key_columns,
+    row_key,
+    transaction,
+)
+
+# Dialects that compile UPDATE statements with multiple-table criteria
+# (UPDATE ... FROM, or UPDATE t1, t2 on MySQL). Others use a correlated
+# subquery per updated column.
+UPDATE_FROM_DIALECTS = {"postgresql", "mysql", "mariadb", "mssql"}
+
+
+@contextmanager
+def temp_table(conn, columns: List[sa.Column], rows: List[Dict[str, Any]]):
+    """Create a temporary table with rows, dropping it on exit.
+
+    Columns are copied by name and type; the table lives in its own
+    MetaData so it never leaks into the model metadata.
+    """
+    table = sa.Table(
+        "_tmp_{}".format(uuid.uuid4().hex),
+        sa.MetaData(),
+        *[sa.Column(c.name, c.type) for c in columns],
+        prefixes=["TEMPORARY"],
+    )
+    table.create(conn)
+    try:
+        if rows:
+            conn.execute(table.insert(), rows)
+        yield table
+    finally:
+        table.drop(conn)
+
+
+def _key_rows(
+    columns: List[sa.Column], keys: Sequence[Any]
+) -> List[Dict[str, Any]]:
+    if len(columns) == 1:
+        name = columns[0].name
+        return [{name: k} for k in keys]
+    names = [c.name for c in columns]
+    return [dict(zip(names, k)) for k in keys]
+
+
+def _select_many(
+    conn, model: Any, keys: List[Any], chunk_size: int, temp_threshold: int
+) -> Iterator[Any]:
+    table = model.t
+    columns = primary_key_columns(model)
+    if len(keys) <= temp_threshold:
+        for chunk in chunked(keys, chunk_size):
+            yield from conn.execute(
+                default_select(model).where(key_clause(columns, chunk))
+            )
+        return
+
+    with transaction(conn):
+        with temp_table(conn, columns, _key_rows(columns, keys)) as tmp:
+            on = _join_clause(columns, tmp)
+            query = default_select(model).select_from(table.join(tmp, on))
+            yield from conn.execute(query)
+
+
+def get_many(
+    conn,
+    model: Any,
+    keys: Sequence[Any],
+    chunk_size: int = 500,
+    temp_threshold: int = 5000,
+) -> List[Optional[Any]]:
+    """Return the models of the primary keys, in input order.
+
+    Misses are returned as None. Composite keys are given as tuples in
+    the order of the primary key columns. Up to ``temp_threshold``
+    distinct keys are fetched with chunked ``IN`` lists; larger key sets
+    are staged in a temporary table and joined.
+    """
+    columns = primary_key_columns(model)
+    distinct = list(dict.fromkeys(keys))
+    rows = list(
+        _select_many(conn, model, distinct, chunk_size, temp_threshold)
+    )
+    found = {
+        row_key(row, columns): instance
+        for row, instance in zip(rows, rows_to_models(conn, model, rows))
+    }
+    return [found.get(k) for k in keys]
+
+
+def _join_clause(columns: List[sa.Column], tmp: sa.Table) -> Any:
+    return sa.and_(*[c == tmp.c[c.name] for c in columns])
+
+
+def update_statement(
+    dialect: Any, table: sa.Table, tmp: sa.Table, keys: List[sa.Column]
+) -> Any:
+    """Return an UPDATE of table from the staged rows of tmp."""
+    on = _join_clause(keys, tmp)
+    names = [c.name for c in tmp.columns if c.name not in table.primary_key]
+    if dialect.name in UPDATE_FROM_DIALECTS:
+        return table.update().where(on).values({n: tmp.c[n] for n in names})
+    return (
+        table.update()
+        .where(sa.exists().where(on))
+        .values(
+            {
+                n: sa.select([tmp.c[n]]).where(on).scalar_subquery()
+                for n in names
+            }
+        )
+    )
+
+
+def _update_columns(model: Any, name: str) -> List[sa.Column]:
+    field = model.__fields__.get(name)
+    columns = field_columns(model, name) if field is not None else None
+    return columns if columns else [get_column(model, name)]
+
+
+def _load_fields(model: Any, instances: Sequence[Any], names: Sequence[str]):
+    # Named deferred and cold fields that were never loaded are loaded, so
+    # they are not staged as NULL.
+    aliases = {f.alias: k for k, f in model.__fields__.items()}
+    for name in names:
+        name = name if name in model.__fields__ else aliases.get(name, name)
+        if name in model.__sa_deferred__:
+            for instance in instances:
+                getattr(instance, name)
+
+
+def insert_many(conn, model: Any, instances: Sequence[Any]) -> int:
+    """Insert many instances, their cold values included.
+
+    Unlike ``model.t.insert()``, the rows are split between the model
+    table and its cold table. Return the number of inserted rows.
+    """
+    if not instances:
+        return 0
+    rows = [model_to_row(i) for i in instances]
+    with transaction(conn):
+        insert_rows(conn, model, rows)
+    invalidate_rows(model.t, rows, conn)
+    return len(rows)
+
+
+def update_many(
+    conn,
+    model: Any,
+    instances: Sequence[Any],
+    fields: Optional[Sequence[str]] = None,
+) -> int:
+    """Update the fields of many instances with one set-based UPDATE.
+
+    The primary keys and new values are staged into a temporary table
+    with one executemany. Without ``fields`` every loaded non primary key
+    column is updated, cold columns included. Named deferred and cold
+    fields are loaded first if needed. Return the number of updated rows.
+    """
+    if not instances:
+        return 0
+    keys = primary_key_columns(model)
+    if fields is not None:
+        _load_fields(model, instances, fields)
+    values = [model_to_row(i) for i in instances]
+    if fields is None:
+        # Deferred and cold values that were never loaded are skipped.
+        tables = [t for t in (model.t, model.cold) if t is not None]
+        columns = [
+            c
+            for t in tables
+            for c in t.c
+            if not c.primary_key and all(c.name in v for v in values)
+        ]
+    else:
+        columns = [c for f in fields for c in _update_columns(model, f)]
+    names = [c.name for c in keys + columns]
+    rows = [{n: v for n, v in row.items() if n in names} for row in values]
+    count = 0
+    with transaction(conn):
+        # Cold columns are updated in the cold table, after the hot ones.
+        for table in (model.t, model.cold):
+            targets = [c for c in columns if c.table is table]
+            if not targets:
+                continue
+            table_keys = [table.c[c.name] for c in keys]
+            with temp_table(conn, keys + targets, rows) as tmp:
+                stmt = update_statement(conn.dialect, table, tmp, table_keys)
+                updated = conn.execute(stmt).rowcount
+            if table is model.cold and updated < len(rows):
+                updated += insert_cold_rows(conn, model, rows)
+            count = count or updated
+    invalidate_rows(model.t, rows, conn)
+    return count
+
+
+def delete_many(
+    conn,
+    model: Any,
+    keys: Sequence[Any],
+    chunk_size: int = 500,
+    temp_threshold: int = 5000,
+) -> int:
+    """Delete the rows of many primary keys and return how many.
+
+    Up to ``temp_threshold`` keys are deleted with chunked ``IN`` lists;
+    larger key sets are staged in a temporary table and deleted with a
+    single ``DELETE ... WHERE EXISTS``.
+    """
+    table = model.t
+    columns = primary_key_columns(model)
+    keys = list(dict.fromkeys(keys))
+    # Cold rows are deleted first, their foreign key references table.
+    tables = [t for t in (model.cold, table) if t is not None]
+    count = 0
+    with transaction(conn):
+        if len(keys) <= temp_threshold:
+            for chunk in chunked(keys, chunk_size):
+                for target in tables:
+                    stmt = target.delete().where(
+                        key_clause([target.c[c.name] for c in columns], chunk)
+                    )
+                    deleted = conn.execute(stmt).rowcount
+                count += deleted
+        else:
+            with temp_table(conn, columns, _key_rows(columns, keys)) as tmp:
+                for target in tables:
+                    on = _join_clause([target.c[c.name] for c in columns], tmp)
+                    stmt = target.delete().where(sa.exists().where(on))
+                    count = conn.execute(stmt).rowcount
+    invalidate(table, keys, conn)
+    return count
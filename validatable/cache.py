@@ -0,0 +1,413 @@
+"""
+The cache module provides in-process caches of query results.
+
+Models that set ``__sa_cache__`` get an IdentityCache, a thread-safe LRU
+with an optional time to live, used by ``Model.get``. A QueryCache holds
+the decoded results of ``Model.select`` keyed by statement cache key and
+bound parameters.
+
+Every write made through validatable helpers calls ``invalidate``, which
+drops the written keys from the identity cache, or the whole cache when
+the keys are unknown, and every query cache entry that reads the table.
+
+Writes made inside a transaction of the caller are invalidated when it
+commits, and dropped when it rolls back. Until then the caches are not
+used on that connection, so uncommitted data is never cached.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary, WeakSet
+
+import sqlalchemy as sa
+from sqlalchemy.sql.util import find_tables
+
+from .deferred import (
+    bind_deferred,
+    default_select,
+    rows_to_models,
+    unbind_deferred,
+)
+from .partition import full_select
+from .rows import iter_rows
+from .utils import get_model
+
+
+class IdentityCache:
+    """Thread-safe LRU cache of model instances by primary key."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._data: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of lookups served by the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value of key, counting a hit or a miss."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires and expires < time.monotonic():
+                    del self._data[key]
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key: Any, value: Any, generation: Optional[int] = None):
+        """Store a value, evicting the least recently used ones.
+
+        With the generation read before the value was queried, the value
+        is dropped if the cache was invalidated in between.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Any):
+        """Drop the value of key, if cached."""
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __repr__(self) -> str:
+        return "IdentityCache(size={}, hits={}, misses={}, maxsize={})".format(
+            len(self), self.hits, self.misses, self.maxsize
+        )
+
+
+_query_caches: "WeakSet[QueryCache]" = WeakSet()
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def statement_key(stmt: Any) -> Optional[Any]:
+    """Return a hashable key of a statement and its bound parameters.
+
+    Return None when the statement cannot be cached.
+    """
+    cache_key = stmt._generate_cache_key()
+    if cache_key is None:
+        return None
+    params = _freeze([b.effective_value for b in cache_key.bindparams])
+    key = (cache_key.key, params)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def approximate_size(value: Any) -> int:
+    """Return the approximate size in bytes of a result list."""
+    size = sys.getsizeof(value)
+    for item in value:
+        values = getattr(item, "__dict__", None)
+        if values is None:
+            values = item
+        else:
+            values = values.values()
+        size += sys.getsizeof(item)
+        size += sum(sys.getsizeof(v) for v in values)
+    return size
+
+
+class QueryCache:
+    """Thread-safe LRU cache of select results.
+
+    Entries are evicted by count and by approximate size in bytes. Every
+    QueryCache is invalidated by writes made through validatable to the
+    tables its entries read.
+    """
+
+    def __init__(self, maxsize: int = 256, maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._data: "OrderedDict[Any, Tuple[Any, int, Set]]" = OrderedDict()
+        self._tables: Dict[sa.Table, Set[Any]] = {}
+        self._lock = threading.RLock()
+        _query_caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of lookups served by the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached result of key, counting a hit or a miss."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(
+        self,
+        key: Any,
+        value: Any,
+        tables: Iterable[sa.Table],
+        generation: Optional[int] = None,
+    ):
+        """Store the result of a statement reading tables.
+
+        With the generation read before the statement was executed, the
+        result is dropped if the cache was invalidated in between.
+        """
+        size = approximate_size(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        tables = set(tables)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._pop(key)
+            self._data[key] = (value, size, tables)
+            self.bytes += size
+            for table in tables:
+                self._tables.setdefault(table, set()).add(key)
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.bytes > self.maxbytes
+            ):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _pop(self, key: Any):
+        item = self._data.pop(key, None)
+        if item is None:
+            return
+        _, size, tables = item
+        self.bytes -= size
+        for table in tables:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+    def invalidate_table(self, table: sa.Table):
+        """Drop every entry reading the table."""
+        with self._lock:
+            self.generation += 1
+            for key in list(self._tables.get(table, ())):
+                self._pop(key)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tables.clear()
+            self.bytes = 0
+
+
+def get_identity_cache(config: Any) -> Optional[IdentityCache]:
+    """Return a new cache from the ``__sa_cache__`` class attribute.
+
+    The attribute may be True, for the defaults, or a dict of IdentityCache
+    arguments.
+    """
+    if not config:
+        return None
+    if config is True:
+        return IdentityCache()
+    return IdentityCache(**config)
+
+
+def _key_of(columns: List[sa.Column], values: Dict[str, Any]) -> Any:
+    if len(columns) == 1:
+        return values.get(columns[0].name)
+    return tuple(values.get(c.name) for c in columns)
+
+
+# The invalidations of the writes made in the open transaction of each
+# connection.
+_pending: "WeakKeyDictionary[Any, List[Tuple[sa.Table, Any]]]" = (
+    WeakKeyDictionary()
+)
+
+
+def has_pending_writes(conn) -> bool:
+    """Return whether conn has uncommitted writes made by validatable."""
+    return bool(_pending.get(conn))
+
+
+def _commit(conn):
+    for table, keys in _pending.pop(conn, ()):
+        invalidate(table, keys)
+
+
+def _rollback(conn):
+    _pending.pop(conn, None)
+
+
+def _defer(conn, table: sa.Table, keys: Optional[List[Any]]):
+    if not sa.event.contains(conn, "commit", _commit):
+        sa.event.listen(conn, "commit", _commit)
+        sa.event.listen(conn, "rollback", _rollback)
+    _pending.setdefault(conn, []).append((table, keys))
+
+
+def invalidate(
+    table: sa.Table, keys: Optional[Iterable[Any]] = None, conn: Any = None
+):
+    """Invalidate cached data of a table after a write.
+
+    Without keys, every cached instance of the table is dropped. When
+    conn is in a transaction, the invalidation waits for its commit.
+    """
+    if conn is not None and conn.in_transaction():
+        _defer(conn, table, None if keys is None else list(keys))
+        return
+
+    for query_cache in list(_query_caches):
+        query_cache.invalidate_table(table)
+
+    model = get_model(table)
+    cache = model.cache if model is not None else None
+    if cache is None:
+        return
+    if keys is None:
+        cache.clear()
+        return
+    for key in keys:
+        cache.invalidate(key)
+
+
+def invalidate_rows(
+    table: sa.Table, rows: Iterable[Dict[str, Any]], conn: Any = None
+):
+    """Invalidate cached data of the written rows, keyed by column."""
+    columns = list(table.primary_key.columns)
+    if not columns:
+        invalidate(table, conn=conn)
+        return
+    invalidate(table, (_key_of(columns, r) for r in rows), conn)
+
+
+def get(conn, model: Any, key: Any) -> Optional[Any]:
+    """Return the model of a primary key, or None.
+
+    With an identity cache, hits are served without a query and misses
+    are fetched and stored. A shallow copy is returned, so callers can
+    modify it without affecting the cached instance. Cached instances
+    keep no connection, deferred fields of the copies are loaded through
+    conn. The cache is not used while conn has uncommitted writes.
+    """
+    cache = None if has_pending_writes(conn) else model.cache
+    if cache is not None:
+        instance = cache.get(key)
+        if instance is not None:
+            return bind_deferred(conn, model, [instance.copy()])[0]
+        # An invalidation during the query makes its row stale.
+        generation = cache.generation
+
+    columns = list(model.t.primary_key.columns)
+    if not columns:
+        raise TypeError("{} has no primary key".format(model.__name__))
+    values = key if len(columns) > 1 else (key,)
+    query = default_select(model).where(
+        sa.and_(*[c == v for c, v in zip(columns, values)])
+    )
+    row = conn.execute(query).first()
+    if row is None:
+        return None
+    (instance,) = rows_to_models(conn, model, [row])
+    if cache is not None:
+        cache.put(key, unbind_deferred(instance), generation)
+    return instance
+
+
+def _fetch(conn, model: Any, stmt: Any, rows: bool) -> List[Any]:
+    result = conn.execute(stmt)
+    if rows:
+        return list(iter_rows(result, model.row_class))
+    return rows_to_models(conn, model, result)
+
+
+def select(
+    conn,
+    model: Any,
+    stmt: Any = None,
+    cache: Optional[QueryCache] = None,
+    rows: bool = False,
+) -> List[Any]:
+    """Return the models selected by stmt, or read-only rows.
+
+    With a query cache, results are served from it until a write through
+    validatable touches one of the tables the statement reads. Results
+    are keyed by engine, and the cache is not used while conn has
+    uncommitted writes. Shallow copies of the cached models are returned.
+    """
+    if stmt is None and rows:
+        # Rows cannot load cold fields on access, so they are joined.
+        stmt = full_select(model, deferred=False)
+    stmt = default_select(model) if stmt is None else stmt
+    if cache is None or has_pending_writes(conn):
+        return _fetch(conn, model, stmt, rows)
+    key = statement_key(stmt)
+    if key is None:
+        return _fetch(conn, model, stmt, rows)
+
+    key = (conn.engine, model, rows, key)
+    items = cache.get(key)
+    if items is not None:
+        if rows:
+            return list(items)
+        return bind_deferred(conn, model, [m.copy() for m in items])
+
+    generation = cache.generation
+    items = _fetch(conn, model, stmt, rows)
+    cached = items if rows else [unbind_deferred(m) for m in items]
+    tables = find_tables(stmt, check_columns=True)
+    cache.put(key, cached, tables, generation)
+    return list(items)
@@ -0,0 +1,385 @@
+"""
+The columnar module provides memory-mapped snapshots of a table.
+
+Each column is written to its own ``.npy`` file. Columns without a fixed
+size numpy dtype (strings, bytes, JSON, ...) are written to a data file
+plus an ``.npy`` file with the offsets of each value. Nullable columns
+have an extra boolean mask.
+
+Opening a snapshot only reads the manifest; the arrays are memory-mapped
+and rows are converted to models on demand.
+
+Timezone-aware datetimes are stored in UTC, as numpy has no timezones,
+and the manifest records it so that they are read back as aware UTC
+datetimes.
+"""
+import json
+import mmap
+import os
+import uuid
+from datetime import timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import sqlalchemy as sa
+
+from .generic_types import GUID, AutoJson, dumps
+from .partition import full_select
+from .utils import base_type, row_to_model, transaction
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+MANIFEST = "manifest.json"
+
+
+def _require_numpy():
+    if np is None:  # pragma: no cover
+        raise ImportError(
+            "numpy is required for columnar snapshots, "
+            "install it with `pip install validatable[numpy]`"
+        )
+
+
+# The order matters: Float is a Numeric and Enum is a String.
+KINDS: Tuple[Tuple[Any, str], ...] = (
+    (GUID, "uuid"),
+    (sa.Boolean, "bool"),
+    (sa.Integer, "int"),
+    (sa.Float, "float"),
+    (sa.DateTime, "datetime"),
+    (sa.Date, "date"),
+    (sa.LargeBinary, "bytes"),
+    (sa.Enum, "json"),
+    ((sa.String, sa.Numeric), "text"),
+)
+
+
+def get_column_kind(column: sa.Column) -> str:
+    """Return how the column values are stored in the snapshot."""
+    type_ = base_type(column)
+    if isinstance(type_, AutoJson):
+        return "rawjson" if type_.python_type is Any else "json"
+    for types, kind in KINDS:
+        if isinstance(type_, types):
+            return kind
+    return "json"
+
+
+DTYPES = {
+    "uuid": ("u1", (16,)),
+    "bool": ("?", ()),
+    "int": ("<i8", ()),
+    "float": ("<f8", ()),
+    "datetime": ("<M8[us]", ()),
+    "date": ("<M8[D]", ()),
+}
+
+FILL = {
+    "uuid": bytes(16),
+    "bool": False,
+    "int": 0,
+    "float": 0.0,
+    "datetime": None,
+    "date": None,
+}
+
+
+def _encode(kind: str, value: Any) -> bytes:
+    if kind == "bytes":
+        return value
+    if kind == "text":
+        return str(value).encode()
+    if kind == "rawjson" and isinstance(value, str):
+        return value.encode()
+    return dumps(value).encode()
+
+
+def _decode(kind: str, value: bytes) -> Any:
+    if kind == "bytes":
+        return value
+    if kind == "json":
+        return json.loads(value)
+    return value.decode()
+
+
+class _FixedWriter:
+    def __init__(self, path: str, kind: str, size: int):
+        dtype, shape = DTYPES[kind]
+        self.kind = kind
+        # Whether the datetimes are timezone-aware, once one was written.
+        self.aware: Optional[bool] = None
+        self.array = np.lib.format.open_memmap(
+            path, mode="w+", dtype=dtype, shape=(size,) + shape
+        )
+
+    def _utc(self, values: List[Any]) -> List[Any]:
+        converted = []
+        for value in values:
+            if value is not None:
+                aware = value.utcoffset() is not None
+                if self.aware is None:
+                    self.aware = aware
+                elif aware != self.aware:
+                    raise ValueError(
+                        "cannot store naive and timezone-aware datetimes "
+                        "in the same column"
+                    )
+                if aware:
+                    value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            converted.append(value)
+        return converted
+
+    def write(self, start: int, values: List[Any]):
+        fill = FILL[self.kind]
+        items: Any = [fill if v is None else v for v in values]
+        if self.kind == "uuid":
+            data = b"".join(
+                v.bytes if isinstance(v, uuid.UUID) else v for v in items
+            )
+            items = np.frombuffer(data, dtype="u1").reshape(-1, 16)
+        elif self.kind == "datetime":
+            items = np.array(self._utc(items), dtype=self.array.dtype)
+        elif self.kind == "date":
+            items = np.array(items, dtype=self.array.dtype)
+        end = start + len(items)
+        self.array[start:end] = items
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+
+class _VariableWriter:
+    def __init__(self, path: str, kind: str, size: int):
+        self.kind = kind
+        self.data = open(path + ".data", "wb")
+        self.offsets = np.lib.format.open_memmap(
+            path + ".npy", mode="w+", dtype="<i8", shape=(size + 1,)
+        )
+        self.offsets[0] = 0
+        self.position = 0
+
+    def write(self, start: int, values: List[Any]):
+        for i, value in enumerate(values, start + 1):
+            if value is not None:
+                encoded = _encode(self.kind, value)
+                self.data.write(encoded)
+                self.position += len(encoded)
+            self.offsets[i] = self.position
+
+    def close(self):
+        self.data.close()
+        self.offsets.flush()
+        del self.offsets
+
+
+class _MaskWriter:
+    def __init__(self, path: str, size: int):
+        self.array = np.lib.format.open_memmap(
+            path, mode="w+", dtype="?", shape=(size,)
+        )
+
+    def write(self, start: int, values: List[Any]):
+        end = start + len(values)
+        self.array[start:end] = [v is None for v in values]
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+
+def _column_writers(
+    base: str, kind: str, nullable: bool, size: int
+) -> List[Any]:
+    if kind in DTYPES:
+        writers: List[Any] = [_FixedWriter(base + ".npy", kind, size)]
+    else:
+        writers = [_VariableWriter(base, kind, size)]
+    if nullable:
+        writers.append(_MaskWriter(base + ".null.npy", size))
+    return writers
+
+
+def export_columnar(
+    conn, model: Any, directory: str, batch_size: int = 10000
+) -> int:
+    """Write every column of the model tables to ``directory``.
+
+    Cold columns are joined, so snapshots hold complete rows. Return the
+    number of exported rows.
+    """
+    _require_numpy()
+    table = model.t
+    stmt = full_select(model)
+    os.makedirs(directory, exist_ok=True)
+
+    with transaction(conn):
+        count = conn.execute(
+            sa.select([sa.func.count()]).select_from(table)
+        ).scalar()
+
+        columns = []
+        writers = []
+        for index, column in enumerate(stmt.selected_columns):
+            kind = get_column_kind(column)
+            base = os.path.join(directory, "c{}".format(index))
+            writers.append(
+                _column_writers(base, kind, bool(column.nullable), count)
+            )
+            columns.append(
+                {
+                    "name": column.name,
+                    "kind": kind,
+                    "file": "c{}".format(index),
+                    "nullable": bool(column.nullable),
+                }
+            )
+
+        result = conn.execute(stmt)
+        start = 0
+        try:
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                if start + len(rows) > count:
+                    raise RuntimeError("table changed during export")
+                for i, column_writers in enumerate(writers):
+                    values = [row[i] for row in rows]
+                    for writer in column_writers:
+                        writer.write(start, values)
+                start += len(rows)
+        finally:
+            for column_writers in writers:
+                for writer in column_writers:
+                    writer.close()
+
+        for spec, column_writers in zip(columns, writers):
+            if getattr(column_writers[0], "aware", None):
+                spec["timezone"] = "UTC"
+
+    manifest = {"table": table.name, "size": start, "columns": columns}
+    with open(os.path.join(directory, MANIFEST), "w") as fp:
+        json.dump(manifest, fp)
+    return start
+
+
+class VariableColumn:
+    """Memory-mapped column of variable size values."""
+
+    def __init__(self, path: str, kind: str, mask: Optional[Any] = None):
+        self.kind = kind
+        self.mask = mask
+        self.offsets = np.load(path + ".npy", mmap_mode="r")
+        self.data: Union[mmap.mmap, bytes]
+        if os.path.getsize(path + ".data"):
+            with open(path + ".data", "rb") as fp:
+                self.data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        if self.mask is not None and self.mask[index]:
+            return None
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return _decode(self.kind, self.data[start:end])
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ColumnarSnapshot:
+    """Lazy, memory-mapped view over an exported table."""
+
+    def __init__(self, model: Any, directory: str):
+        _require_numpy()
+        self.model = model
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST)) as fp:
+            manifest = json.load(fp)
+        self.size: int = manifest["size"]
+        self._specs: Dict[str, Dict[str, Any]] = {
+            c["name"]: c for c in manifest["columns"]
+        }
+        self._columns: Dict[str, Any] = {}
+        self._masks: Dict[str, Any] = {}
+
+    @property
+    def names(self) -> List[str]:
+        """Return the column names."""
+        return list(self._specs)
+
+    def _mask(self, name: str) -> Optional[Any]:
+        spec = self._specs[name]
+        if not spec["nullable"]:
+            return None
+        if name not in self._masks:
+            path = os.path.join(self.directory, spec["file"] + ".null.npy")
+            self._masks[name] = np.load(path, mmap_mode="r")
+        return self._masks[name]
+
+    def column(self, name: str) -> Any:
+        """Return the memory-mapped column.
+
+        Fixed size columns are returned as numpy arrays, the others as a
+        sequence of decoded values. Aware datetimes are naive UTC values
+        in the arrays.
+        """
+        if name not in self._columns:
+            spec = self._specs[name]
+            path = os.path.join(self.directory, spec["file"])
+            if spec["kind"] in DTYPES:
+                column = np.load(path + ".npy", mmap_mode="r")
+            else:
+                column = VariableColumn(path, spec["kind"], self._mask(name))
+            self._columns[name] = column
+        return self._columns[name]
+
+    def value(self, name: str, index: int) -> Any:
+        """Return a single value of the column as a Python object."""
+        column = self.column(name)
+        kind = self._specs[name]["kind"]
+        if kind not in DTYPES:
+            return column[index]
+        mask = self._mask(name)
+        if mask is not None and mask[index]:
+            return None
+        if kind == "uuid":
+            return uuid.UUID(bytes=column[index].tobytes())
+        value = column[index].item()
+        if self._specs[name].get("timezone") == "UTC":
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Return the row values keyed by column name."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("snapshot index out of range")
+        return {name: self.value(name, index) for name in self._specs}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> Any:
+        return row_to_model(self.model, self.row(index))
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self.size):
+            yield self[i]
+
+
+def open_columnar(model: Any, directory: str) -> ColumnarSnapshot:
+    """Open a snapshot written by ``export_columnar``."""
+    return ColumnarSnapshot(model, directory)
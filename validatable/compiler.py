@@ -0,0 +1,225 @@
+"""
+The compiler module provides generated validators of models.
+
+Models setting ``__sa_compiled__ = True`` get a validation function
+generated from their fields when the class is created. Plain and
+constrained int, float, str and bool fields, ``EmailStr``, ``Optional``
+and defaults are checked inline; other fields are validated by their
+pydantic ModelField.
+
+The generated function only accepts values it can validate exactly like
+pydantic. It returns None for any other input and for invalid data, and
+the data is then validated again by pydantic, so the results and errors
+are the same.
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, EmailStr, Extra
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from pydantic.main import validate_model
+from pydantic.networks import validate_email
+from pydantic.types import ConstrainedFloat, ConstrainedInt, ConstrainedStr
+
+Validator = Callable[[Dict[str, Any]], Optional[Tuple[dict, Set[str]]]]
+
+_missing = object()
+
+# Integers converted to float exactly by float_validator.
+MAX_EXACT_FLOAT = 2**53
+
+# Defaults returned as they are by ModelField.get_default.
+IMMUTABLE_DEFAULTS = (int, float, str, bool, type(None))
+
+
+def _compilable(model: Any) -> bool:
+    config = model.__config__
+    if config.extra is not Extra.ignore or config.validate_all:
+        return False
+    if model.__pre_root_validators__ or model.__post_root_validators__:
+        return False
+    if config.anystr_strip_whitespace or config.anystr_upper:
+        return False
+    if config.anystr_lower or config.min_anystr_length:
+        return False
+    if config.max_anystr_length is not None:
+        return False
+    return not any(f.validate_always for f in model.__fields__.values())
+
+
+def _is_plain(field: ModelField) -> bool:
+    checks = [
+        field.shape == SHAPE_SINGLETON,
+        not field.sub_fields,
+        not field.class_validators,
+        not field.pre_validators,
+        not field.post_validators,
+        field.field_info.const is None,
+    ]
+    return all(checks)
+
+
+def _size_checks(type_: Any) -> List[str]:
+    checks = []
+    for attr, op in (("gt", ">"), ("ge", ">="), ("lt", "<"), ("le", "<=")):
+        if getattr(type_, attr, None) is not None:
+            checks.append("not v {} {!r}".format(op, getattr(type_, attr)))
+    return checks
+
+
+def _number_lines(type_: Any) -> Optional[List[str]]:
+    if type_ is bool:
+        return ["if v.__class__ is not bool: return None"]
+    if getattr(type_, "multiple_of", None) is not None:
+        return None
+    if type_ is int or issubclass(type_, ConstrainedInt):
+        lines = ["if v.__class__ is not int: return None"]
+    elif type_ is float or issubclass(type_, ConstrainedFloat):
+        lines = []
+        if not getattr(type_, "strict", False):
+            # Exact integers are converted, like float_validator does.
+            lines.append(
+                "if v.__class__ is int and -{0} <= v <= {0}: v = float(v)"
+                "".format(MAX_EXACT_FLOAT)
+            )
+        lines.append("if v.__class__ is not float: return None")
+        # Infinities and NaN are left to pydantic.
+        lines.append("if v - v != 0: return None")
+    else:
+        return None
+    lines.extend("if {}: return None".format(c) for c in _size_checks(type_))
+    return lines
+
+
+def _str_lines(type_: Any, i: int, ns: Dict[str, Any]) -> List[str]:
+    lines = []
+    if type_.strip_whitespace:
+        lines.append("v = v.strip()")
+    if type_.to_upper:
+        lines.append("v = v.upper()")
+    if type_.to_lower:
+        lines.append("v = v.lower()")
+    if type_.min_length is not None:
+        lines.append("if len(v) < {!r}: return None".format(type_.min_length))
+    if type_.max_length is not None:
+        lines.append("if len(v) > {!r}: return None".format(type_.max_length))
+    if type_.curtail_length:
+        lines.append("v = v[:{!r}]".format(type_.curtail_length))
+    if type_.regex:
+        ns["pattern{}".format(i)] = re.compile(type_.regex)
+        lines.append("if not pattern{}.match(v): return None".format(i))
+    return lines
+
+
+def _inline_lines(
+    field: ModelField, i: int, ns: Dict[str, Any]
+) -> Optional[List[str]]:
+    """Return the statements checking and converting ``v``, or None."""
+    type_ = field.outer_type_
+    if not (_is_plain(field) and isinstance(type_, type)):
+        return None
+    if type_ is EmailStr:
+        ns["validate_email"] = validate_email
+        return [
+            "if v.__class__ is not str: return None",
+            "try: v = validate_email(v)[1]",
+            "except Exception: return None",
+        ]
+    if type_ is str or issubclass(type_, ConstrainedStr):
+        lines = ["if v.__class__ is not str: return None"]
+        if type_ is not str:
+            lines.extend(_str_lines(type_, i, ns))
+        return lines
+    return _number_lines(type_)
+
+
+def _value_lines(field: ModelField, i: int, ns: Dict[str, Any]) -> List[str]:
+    inline = _inline_lines(field, i, ns)
+    if inline is None:
+        # Unsupported types are validated by pydantic.
+        return [
+            "v, error = f{}.validate(v, values, loc={!r}, cls=model)".format(
+                i, field.alias
+            ),
+            "if error: return None",
+        ]
+    if field.allow_none:
+        none = "pass"
+    else:
+        none = "return None"
+    return ["if v is None: {}".format(none), "else:"] + [
+        "    " + line for line in inline
+    ]
+
+
+def _field_lines(
+    field: ModelField, i: int, ns: Dict[str, Any], by_name: bool
+) -> List[str]:
+    ns["f{}".format(i)] = field
+    lines = ["v = data.get({!r}, _missing)".format(field.alias)]
+    if by_name and field.alt_alias:
+        lines.append(
+            "if v is _missing: v = data.get({!r}, _missing)".format(field.name)
+        )
+    lines.append("if v is _missing:")
+    immutable = type(field.default) in IMMUTABLE_DEFAULTS
+    if field.required:
+        lines.append("    return None")
+    elif field.default_factory is None and immutable:
+        ns["default{}".format(i)] = field.default
+        lines.append("    values[{!r}] = default{}".format(field.name, i))
+    else:
+        lines.append(
+            "    values[{!r}] = f{}.get_default()".format(field.name, i)
+        )
+    lines.append("else:")
+    lines.append("    fields_set.add({!r})".format(field.name))
+    lines.extend("    " + line for line in _value_lines(field, i, ns))
+    lines.append("    values[{!r}] = v".format(field.name))
+    return lines
+
+
+def compile_validator(model: Any) -> Optional[Validator]:
+    """Return the generated validator of a model, or None."""
+    if not _compilable(model):
+        return None
+    ns: Dict[str, Any] = {"_missing": _missing, "model": model}
+    by_name = model.__config__.allow_population_by_field_name
+    body = ["values = {}", "fields_set = set()"]
+    for i, field in enumerate(model.__fields__.values()):
+        body.extend(_field_lines(field, i, ns, by_name))
+    body.append("return values, fields_set")
+    source = "def validate(data):\n" + "".join(
+        "    {}\n".format(line) for line in body
+    )
+    exec(compile(source, "<{} validator>".format(model.__name__), "exec"), ns)
+    validate = ns["validate"]
+    validate.__source__ = source
+    return validate
+
+
+def get_validator(model: Any) -> Optional[Validator]:
+    """Return the compiled validator, if ``__sa_compiled__`` is set."""
+    return compile_validator(model) if model.__sa_compiled__ else None
+
+
+def validate(model: Any, data: Dict[str, Any]) -> Tuple[dict, Set[str], Any]:
+    """Validate data like pydantic's validate_model, compiled if possible."""
+    validator = model.__sa_validator__
+    if validator is not None:
+        result = validator(data)
+        if result is not None:
+            return result[0], result[1], None
+    return validate_model(model, data)
+
+
+def init_model(instance: Any, data: Dict[str, Any]):
+    """Initialize a model instance with the compiled validator, if any."""
+    validator = instance.__class__.__sa_validator__
+    result = validator(data) if validator is not None else None
+    if result is None:
+        BaseModel.__init__(instance, **data)
+        return
+    object.__setattr__(instance, "__dict__", result[0])
+    object.__setattr__(instance, "__fields_set__", result[1])
+    instance._init_private_attributes()
@@ -0,0 +1,178 @@
+"""
+The deferred module provides lazy loading of deferred columns.
+
+Columns of fields declared with ``Field(sa_deferred=True)`` are left out
+of the default selects. Instances loaded together share a DeferredGroup
+with the connection and primary keys of the batch, so the first access
+to a deferred field fetches its column for the whole batch in chunked
+``IN`` queries, and later accesses on the other instances are free.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import sqlalchemy as sa
+from pydantic import ValidationError
+
+from .rows import NotLoaded
+from .utils import (
+    chunked,
+    field_column,
+    get_column,
+    key_clause,
+    primary_key_columns,
+    row_key,
+    row_to_model,
+    row_values,
+)
+
+_missing = object()
+
+
+def _is_deferred(model: Any, column: Optional[sa.Column]) -> bool:
+    if column is None:
+        return False
+    return column.table is not model.t or bool(column.info.get("deferred"))
+
+
+def get_deferred_fields(model: Any) -> tuple:
+    """Return the names of the fields with a deferred or cold column."""
+    return tuple(
+        name
+        for name in model.__fields__
+        if _is_deferred(model, field_column(model, name))
+    )
+
+
+def default_select(model: Any) -> Any:
+    """Return the select of the table without its deferred columns."""
+    if not model.__sa_deferred__:
+        return model.t.select()
+    return sa.select(*[c for c in model.c if not c.info.get("deferred")])
+
+
+def fetch_column(
+    conn, model: Any, name: str, keys: Sequence[Any], chunk_size: int = 500
+) -> Dict[Any, Any]:
+    """Return the values of a field column keyed by primary key."""
+    column = get_column(model, name)
+    table = column.table
+    keys_columns = [table.c[c.name] for c in primary_key_columns(model)]
+    values = {}
+    for chunk in chunked(keys, chunk_size):
+        query = sa.select(*keys_columns, column).where(
+            key_clause(keys_columns, chunk)
+        )
+        for row in conn.execute(query):
+            values[row_key(row, keys_columns)] = row[column]
+    return values
+
+
+class DeferredGroup:
+    """The connection and primary keys of instances loaded together."""
+
+    def __init__(self, conn, model: Any, keys: List[Any]):
+        self.conn = conn
+        self.model = model
+        self.keys = keys
+        self.values: Dict[str, Dict[Any, Any]] = {}
+
+    def pop(self, name: str, key: Any) -> Any:
+        """Return the value of a field for a key, loading the batch."""
+        values = self.values.get(name)
+        if values is None:
+            values = fetch_column(self.conn, self.model, name, self.keys)
+            self.values[name] = values
+        return values.pop(key, _missing)
+
+
+def _partial_model(
+    model: Any, row: Dict[str, Any], missing: List[str], group: DeferredGroup
+) -> Any:
+    instance = row_to_model(model, row, missing)
+    object.__setattr__(instance, "_sa_deferred", group)
+    return instance
+
+
+def rows_to_models(conn, model: Any, rows: Iterable[Any]) -> List[Any]:
+    """Return models of result rows that may omit deferred columns.
+
+    Omitted fields are loaded on first access through the connection.
+    """
+    if not model.__sa_deferred__:
+        return [row_to_model(model, row) for row in rows]
+    rows = [row_values(model, row) for row in rows]
+    missing = [
+        name
+        for name in model.__sa_deferred__
+        if rows and model.__fields__[name].alias not in rows[0]
+    ]
+    if not missing:
+        return [row_to_model(model, row) for row in rows]
+
+    names = [c.name for c in primary_key_columns(model)]
+    group = DeferredGroup(conn, model, [row_key(r, names) for r in rows])
+    return [_partial_model(model, row, missing, group) for row in rows]
+
+
+def instance_key(model: Any, instance: Any) -> Any:
+    """Return the primary key of an instance, like row_key."""
+    names = [c.name for c in primary_key_columns(model)]
+    attrs = {f.alias: k for k, f in model.__fields__.items()}
+    return row_key({n: instance.__dict__[attrs[n]] for n in names}, names)
+
+
+def bind_deferred(conn, model: Any, instances: List[Any]) -> List[Any]:
+    """Share a new DeferredGroup on conn between instances missing fields.
+
+    Cached instances are stored without a group, so their copies load
+    deferred fields through the connection of the caller.
+    """
+    pending = [
+        i
+        for i in instances
+        if any(n not in i.__dict__ for n in model.__sa_deferred__)
+    ]
+    if pending:
+        keys = [instance_key(model, i) for i in pending]
+        group = DeferredGroup(conn, model, keys)
+        for instance in pending:
+            object.__setattr__(instance, "_sa_deferred", group)
+    return instances
+
+
+def unbind_deferred(instance: Any) -> Any:
+    """Return a copy of instance that keeps no DeferredGroup."""
+    copy = instance.copy()
+    object.__setattr__(copy, "_sa_deferred", None)
+    return copy
+
+
+def load_deferred(instance: Any, name: str) -> Any:
+    """Load, validate and store the value of a deferred field."""
+    model = type(instance)
+    group: Optional[DeferredGroup] = instance._sa_deferred
+    if group is None:
+        raise NotLoaded("{}.{} was not loaded".format(model.__name__, name))
+
+    fields = model.__fields__
+    key = instance_key(model, instance)
+    value = group.pop(name, key)
+    if value is _missing:
+        value = fetch_column(group.conn, model, name, [key]).get(key, _missing)
+    field = fields[name]
+    if value is _missing and get_column(model, name).table is model.cold:
+        # Rows inserted without validatable have no cold row.
+        value = None if field.required else field.get_default()
+    if value is _missing:
+        raise NotLoaded(
+            "{}.{} was not loaded, its row no longer exists".format(
+                model.__name__, name
+            )
+        )
+
+    value, error = field.validate(
+        value, instance.__dict__, loc=field.alias, cls=model
+    )
+    if error:
+        raise ValidationError([error], model)
+    instance.__dict__[name] = value
+    return value
@@ -0,0 +1,77 @@
+"""
+The embedded module provides flattened storage of nested models.
+
+A field typed as a BaseModel and declared with ``Field(sa_embedded=True)``
+is stored in one real column per field of the nested model, named with
+the field alias as prefix, as ``address__city``. Column types are
+inferred like the ones of top-level fields, so sub-fields can be
+indexed and filtered natively and are read without JSON decoding.
+
+Values are flattened on write and reassembled on read. An Optional
+embedded field whose columns are all NULL is read as None.
+"""
+from typing import Any, Dict, NamedTuple, Tuple
+
+
+class Embedded(NamedTuple):
+    """An embedded field and its columns.
+
+    ``columns`` holds the column name, sub-field name and sub-field
+    alias of every field of the nested model.
+    """
+
+    name: str
+    alias: str
+    optional: bool
+    columns: Tuple[Tuple[str, str, str], ...]
+
+
+def get_embedded(model: Any) -> Tuple[Embedded, ...]:
+    """Return the embedded fields of the model, in table order."""
+    groups: Dict[str, list] = {}
+    for column in model.c:
+        info = column.info.get("embedded")
+        if info is not None:
+            groups.setdefault(info[0], []).append((column.name, info[1]))
+
+    embedded = []
+    for name, columns in groups.items():
+        field = model.__fields__[name]
+        fields = field.outer_type_.__fields__
+        embedded.append(
+            Embedded(
+                name,
+                field.alias,
+                field.allow_none,
+                tuple((c, n, fields[n].alias) for c, n in columns),
+            )
+        )
+    return tuple(embedded)
+
+
+def flatten(model: Any, values: Dict[str, Any], row: Dict[str, Any]):
+    """Add the columns of the embedded values to a row."""
+    for e in model.__sa_embedded__:
+        if e.name not in values:
+            continue
+        value = values[e.name]
+        if value is None:
+            row.update((c, None) for c, _, _ in e.columns)
+        else:
+            row.update((c, getattr(value, n)) for c, n, _ in e.columns)
+
+
+def assemble(model: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the embedded columns of row values by nested values.
+
+    Fields whose columns were not selected are left out.
+    """
+    for e in model.__sa_embedded__:
+        nested = {a: values.pop(c) for c, _, a in e.columns if c in values}
+        if not nested:
+            continue
+        if e.optional and all(v is None for v in nested.values()):
+            values[e.alias] = None
+        else:
+            values[e.alias] = nested
+    return values
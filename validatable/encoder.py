@@ -0,0 +1,194 @@
+"""
+The encoder module provides compiled JSON encoders of models.
+
+An encoder is generated once per model class from its field types, so
+strings, numbers, enums, UUIDs, datetimes, decimals, lists and nested
+models are written without pydantic's generic dict conversion and
+per-value dispatch.
+
+Every specialized encoder checks the exact class of its value and falls
+back to ``json.dumps`` with pydantic's encoder otherwise, so the output
+is identical to ``.json()``. Models with ``json_encoders``, a custom
+``json_dumps``, a custom root or excluded fields are not compiled.
+
+Lazy JSON fields that were not parsed yet are written as their raw text,
+so forwarding a loaded document does not parse it.
+"""
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+from pydantic.json import ENCODERS_BY_TYPE
+
+from .generic_types import dumps
+
+Encoder = Callable[[Any], str]
+
+# The C accelerated string encoder, missing from the type stubs.
+encode_basestring_ascii: Encoder = getattr(
+    json.encoder, "encode_basestring_ascii"
+)
+
+_encoders: WeakKeyDictionary = WeakKeyDictionary()
+_missing = object()
+INFINITY = float("inf")
+
+
+def _exact(classes: Tuple[type, ...], fast: Encoder) -> Encoder:
+    exact = frozenset(classes)
+
+    def encode(value: Any) -> str:
+        if value.__class__ in exact:
+            return fast(value)
+        if value is None:
+            return "null"
+        return dumps(value)
+
+    return encode
+
+
+def _float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == INFINITY:
+        return "Infinity"
+    if value == -INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _primitive(value: Any) -> str:
+    cls = value.__class__
+    if cls is str:
+        return encode_basestring_ascii(value)
+    if cls is int:
+        return int.__repr__(value)
+    if cls is float:
+        return _float(value)
+    return dumps(value)
+
+
+# The types json encodes natively, checked before pydantic's encoders.
+NATIVE = (
+    (bool, lambda v: "true" if v else "false"),
+    (str, encode_basestring_ascii),
+    (int, int.__repr__),
+    (float, _float),
+)
+
+
+def _list(item: Encoder) -> Encoder:
+    def encode(value: Any) -> str:
+        return "[" + ", ".join([item(v) for v in value]) + "]"
+
+    return _exact((list,), encode)
+
+
+def _model(model: type) -> Encoder:
+    def encode(value: Any) -> str:
+        encoder = get_encoder(model)
+        return encoder(value) if encoder is not None else dumps(value)
+
+    return _exact((model,), encode)
+
+
+def _converted(type_: type) -> Optional[Encoder]:
+    # Values are converted like pydantic_encoder does, by their first
+    # base class with a registered encoder.
+    for base in type_.__mro__[:-1]:
+        convert = ENCODERS_BY_TYPE.get(base)
+        if convert is not None:
+            return _exact((type_, base), _converter(convert))
+    return None
+
+
+def _converter(convert: Callable[[Any], Any]) -> Encoder:
+    return lambda v: _primitive(convert(v))
+
+
+def _type_encoder(type_: Any) -> Optional[Encoder]:
+    if not isinstance(type_, type):
+        return None
+    if issubclass(type_, BaseModel):
+        return _model(type_)
+    for cls, fast in NATIVE:
+        if issubclass(type_, cls):
+            return _exact((cls, type_), fast)
+    return _converted(type_)
+
+
+def field_encoder(field: ModelField) -> Encoder:
+    """Return the JSON encoder of the values of a field."""
+    encoder = None
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        encoder = _type_encoder(field.outer_type_)
+    elif field.shape == SHAPE_LIST and field.sub_fields:
+        encoder = _list(field_encoder(field.sub_fields[0]))
+    return encoder or dumps
+
+
+def _compilable(model: Any) -> bool:
+    config = model.__config__
+    customized = [
+        config.json_encoders,
+        config.json_dumps is not json.dumps,
+        model.__custom_root_type__,
+        model.__exclude_fields__,
+        model.__include_fields__,
+    ]
+    return not any(customized)
+
+
+def _with_raw(
+    values: Dict[str, Any], raw: Dict[str, str], names: Tuple[str, ...]
+) -> Dict[str, Any]:
+    # The raw documents take the place of their fields, in field order.
+    merged = {}
+    for name in names:
+        if name in raw:
+            merged[name] = raw[name]
+        elif name in values:
+            merged[name] = values[name]
+    for name, value in values.items():
+        merged.setdefault(name, value)
+    return merged
+
+
+def build_encoder(model: Any) -> Optional[Encoder]:
+    """Return the compiled encoder of a model, or None."""
+    if not _compilable(model):
+        return None
+    keys = {
+        name: encode_basestring_ascii(name) + ": " for name in model.__fields__
+    }
+    encoders: Dict[str, Encoder] = {
+        name: field_encoder(f) for name, f in model.__fields__.items()
+    }
+    names = tuple(model.__fields__)
+
+    def encode(instance: Any) -> str:
+        values = instance.__dict__
+        value_encoders = encoders
+        raw = getattr(instance, "_sa_raw", None)
+        if raw:
+            values = _with_raw(values, raw, names)
+            value_encoders = dict(encoders, **dict.fromkeys(raw, str))
+        parts = []
+        for name, value in values.items():
+            key = keys.get(name)
+            if key is None:
+                key = encode_basestring_ascii(name) + ": "
+            parts.append(key + value_encoders.get(name, dumps)(value))
+        return "{" + ", ".join(parts) + "}"
+
+    return encode
+
+
+def get_encoder(model: type) -> Optional[Encoder]:
+    """Return the cached compiled encoder of a model, or None."""
+    encoder = _encoders.get(model, _missing)
+    if encoder is _missing:
+        encoder = _encoders[model] = build_encoder(model)
+    return encoder
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from pydantic.fields import FieldInfo, Undefined
 from pydantic.typing import NoArgAnyCallable
@@ -32,6 +32,11 @@ def Field(
     sa_args: List[Any] = None,
     sa_foreign_key: Optional[ForeignKey] = None,
     sa_fk: Optional[ForeignKey] = None,
+    sa_deferred: Optional[bool] = False,
+    sa_cold: Optional[bool] = False,
+    sa_json_index: Union[Sequence[str], Dict[str, type], None] = None,
+    sa_embedded: Optional[bool] = False,
+    sa_lazy: Optional[bool] = False,
     **extra: Any,
 ) -> Any:
     extra["sa_primary_key"] = sa_primary_key
@@ -42,6 +47,11 @@ def Field(
     extra["sa_args"] = sa_args or []
     extra["sa_foreign_key"] = sa_foreign_key
     extra["sa_fk"] = sa_fk
+    extra["sa_deferred"] = sa_deferred
+    extra["sa_cold"] = sa_cold
+    extra["sa_json_index"] = sa_json_index
+    extra["sa_embedded"] = sa_embedded
+    extra["sa_lazy"] = sa_lazy
 
     field_info = FieldInfo(
         default,
@@ -118,6 +118,10 @@ class AutoString(sa.types.TypeDecorator):
 dumps = partial(json.dumps, default=pydantic_encoder)
 
 
+class RawJson(str):
+    """JSON text bound as it is, without serialization."""
+
+
 class AutoJson(sa.types.TypeDecorator):
     """Json type with serialization"""
 
@@ -141,9 +145,14 @@ class AutoJson(sa.types.TypeDecorator):
         return dialect.type_descriptor(self.impl)
 
     def process_bind_param(self, value, dialect):
+        if isinstance(value, RawJson):
+            return value
         return self.serializer(value)
 
     def process_result_value(self, value, dialect):
+        # SQL NULL, as read from the outer join of a missing cold row.
+        if value is None:
+            return value
         return self.deserializer(value)
 
     @property
@@ -0,0 +1,142 @@
+"""
+The indexes module provides declarative indexes of BaseTable models.
+
+Models list Index specifications in ``__sa_indexes__``. Keys are field
+names or aliases, or callables building an expression from the table
+columns, so no column has to be referenced by a raw string. Indexes are
+built when the table is created.
+
+Default names join the table and column names. Indexes with an
+expression, a predicate or covering columns get a short hash of them as
+suffix, so their names do not collide with the plain index of the same
+columns.
+"""
+import hashlib
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import sqlalchemy as sa
+
+from .utils import get_column
+
+Key = Union[str, Callable[[Any], Any]]
+
+# Dialects that support partial indexes and covering INCLUDE columns.
+WHERE_DIALECTS = ("postgresql", "sqlite", "mssql")
+INCLUDE_DIALECTS = ("postgresql", "mssql")
+
+
+class Index:
+    """A composite, partial, expression or covering index of a model.
+
+    ``where`` is a callable receiving the table columns and returning the
+    index predicate. With ``skip_nulls``, rows where an Optional key field
+    is NULL are left out of the index. ``include`` adds covering columns
+    on the dialects that support them, and is ignored elsewhere.
+    """
+
+    def __init__(
+        self,
+        *keys: Key,
+        name: Optional[str] = None,
+        unique: bool = False,
+        where: Optional[Callable[[Any], Any]] = None,
+        skip_nulls: bool = False,
+        include: Sequence[str] = (),
+        **kwargs: Any,
+    ):
+        if not keys:
+            raise ValueError("an index needs at least one key")
+        self.keys = keys
+        self.name = name
+        self.unique = unique
+        self.where = where
+        self.skip_nulls = skip_nulls
+        self.include = tuple(include)
+        self.kwargs = kwargs
+
+    def _name(
+        self,
+        table: sa.Table,
+        expressions: Sequence[Any],
+        where: Optional[Any],
+        include: List[str],
+    ) -> str:
+        if self.name is not None:
+            return self.name
+        parts = [
+            e.name if isinstance(e, sa.Column) else "expr{}".format(i)
+            for i, e in enumerate(expressions)
+        ]
+        prefix = "uq" if self.unique else "ix"
+        plain = all(isinstance(e, sa.Column) for e in expressions)
+        if plain and where is None and not include:
+            return "_".join([prefix, table.name, *parts])
+        sql = [_sql(e) for e in expressions]
+        sql.append("" if where is None else _sql(where))
+        sql.extend(include)
+        digest = hashlib.sha1("\0".join(sql).encode()).hexdigest()
+        return "_".join([prefix, table.name, *parts, digest[:8]])
+
+    def _where(self, model: Any, columns: Sequence[Any]) -> Optional[Any]:
+        clauses: List[Any] = []
+        if self.skip_nulls:
+            fields = {f.alias: f for f in model.__fields__.values()}
+            clauses.extend(
+                c.isnot(None)
+                for c in columns
+                if isinstance(c, sa.Column) and fields[c.name].allow_none
+            )
+        if self.where is not None:
+            clauses.append(self.where(model.c))
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else sa.and_(*clauses)
+
+    def build(self, model: Any) -> sa.Index:
+        """Return the index, attached to the table of its columns."""
+        table = model.t
+        expressions = [
+            get_column(model, k) if isinstance(k, str) else k(model.c)
+            for k in self.keys
+        ]
+        kwargs = dict(self.kwargs)
+        where = self._where(model, expressions)
+        if where is not None:
+            for dialect in WHERE_DIALECTS:
+                kwargs.setdefault("{}_where".format(dialect), where)
+        names = [get_column(model, n).name for n in self.include]
+        if names:
+            for dialect in INCLUDE_DIALECTS:
+                kwargs.setdefault("{}_include".format(dialect), names)
+        name = self._name(table, expressions, where, names)
+        tables = [table] if model.cold is None else [table, model.cold]
+        if any(i.name == name for t in tables for i in t.indexes):
+            raise ValueError(
+                "index name {} is already used on table {}".format(
+                    name, table.name
+                )
+            )
+        return sa.Index(
+            name,
+            *expressions,
+            unique=self.unique,
+            **kwargs,
+        )
+
+    def __repr__(self) -> str:
+        return "Index({})".format(", ".join(map(repr, self.keys)))
+
+
+def _sql(clause: Any) -> str:
+    # Literal values are rendered, so predicates that only differ by a
+    # bound value are told apart.
+    try:
+        return str(clause.compile(compile_kwargs={"literal_binds": True}))
+    except (sa.exc.CompileError, NotImplementedError):
+        return str(clause)
+
+
+def create_indexes(model: Any):
+    """Build the indexes declared in ``__sa_indexes__`` of the model."""
+    for index in model.__sa_indexes__:
+        index.build(model)
@@ -1,8 +1,10 @@
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import sqlalchemy as sa
+from pydantic import BaseModel
 from pydantic.fields import ModelField, UndefinedType
 
+from .jsonpath import get_json_paths
 from .type_dispatch import get_sql_type
 
 
@@ -50,8 +52,9 @@ def get_sa_args_kwargs(m: ModelField) -> Tuple[Any, Dict[str, Any]]:
     return args, col_kwargs
 
 
-def get_column(m: ModelField) -> sa.Column:
-    args, col_kwargs = get_sa_args_kwargs(m)
+def make_column(
+    m: ModelField, args: Any, col_kwargs: Dict[str, Any]
+) -> sa.Column:
     column = col_kwargs.pop("column", None)
 
     if isinstance(column, sa.Column):
@@ -66,6 +69,53 @@ def get_column(m: ModelField) -> sa.Column:
     return sa.Column(m.alias, sa_type, *args, **col_kwargs)
 
 
+def get_column(m: ModelField) -> sa.Column:
+    args, col_kwargs = get_sa_args_kwargs(m)
+    deferred = col_kwargs.pop("deferred", False)
+    lazy = col_kwargs.pop("lazy", False)
+    col_kwargs.pop("cold", None)
+    col_kwargs.pop("embedded", None)
+    json_paths = get_json_paths(col_kwargs.pop("json_index", None))
+    column = make_column(m, args, col_kwargs)
+    if deferred:
+        column.info["deferred"] = True
+    if lazy:
+        column.info["lazy"] = True
+    if json_paths:
+        column.info["json_index"] = json_paths
+    return column
+
+
+def is_embedded(m: ModelField) -> bool:
+    return bool(m.field_info.extra.get("sa_embedded"))
+
+
+def get_embedded_columns(m: ModelField) -> List[sa.Column]:
+    """Return the prefixed columns of the fields of a nested model."""
+    _, col_kwargs = get_sa_args_kwargs(m)
+    model = m.outer_type_
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        raise TypeError(
+            "sa_embedded requires a BaseModel field, {} is {}".format(
+                m.name, m._type_display()
+            )
+        )
+    if col_kwargs["primary_key"]:
+        raise TypeError("an embedded field cannot be a primary key")
+
+    columns = []
+    for sub in model.__fields__.values():
+        nullable = col_kwargs["nullable"] or not sub.required
+        column = sa.Column(
+            "{}__{}".format(m.alias, sub.alias),
+            get_sql_type(sub),
+            nullable=bool(nullable or sub.allow_none),
+        )
+        column.info["embedded"] = (m.name, sub.name)
+        columns.append(column)
+    return columns
+
+
 def is_model_field(v: Any) -> bool:
     return hasattr(v, "__class__") and isinstance(v, ModelField)
 
@@ -80,9 +130,12 @@ def get_table(
 ) -> sa.Table:
 
     exclude = exclude or set()
-    columns = [
-        get_column(v)
-        for k, v in fields.items()
-        if k not in exclude and is_model_field(v)
-    ]
+    columns = []
+    for k, v in fields.items():
+        if k in exclude or not is_model_field(v):
+            continue
+        if is_embedded(v):
+            columns.extend(get_embedded_columns(v))
+        else:
+            columns.append(get_column(v))
     return sa.Table(name, metadata, *columns, *table_args, **table_kwargs)
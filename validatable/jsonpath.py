@@ -0,0 +1,211 @@
+"""
+The jsonpath module provides indexed JSON path expressions.
+
+Fields declared with ``Field(sa_json_index=[...])`` get one expression
+index per path. JsonPath compiles to ``json_extract`` on SQLite, to the
+``#>>`` operator on PostgreSQL and, on MySQL and MariaDB, to a virtual
+generated column added with its index when the table is created. Paths
+without an index compile to ``JSON_EXTRACT`` on MySQL.
+
+Paths are rendered as literals, so a predicate built with
+``Model.json_path`` is exactly the indexed expression and the index can
+be used.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from .generic_types import AutoJson
+from .utils import get_column
+
+PATH = re.compile(r"^\$(\.[A-Za-z_]\w*|\[\d+\])+$")
+STEP = re.compile(r"\.([A-Za-z_]\w*)|\[(\d+)\]")
+
+SQL_TYPES = {
+    str: sa.String(255),
+    int: sa.BigInteger(),
+    float: sa.Float(),
+    bool: sa.Boolean(),
+}
+
+# MySQL types of the generated columns.
+MYSQL_TYPES = {
+    str: "VARCHAR(255)",
+    int: "BIGINT",
+    float: "DOUBLE",
+    bool: "BOOLEAN",
+}
+
+
+def get_json_paths(
+    paths: Union[Sequence[str], Dict[str, type], None],
+) -> Dict[str, type]:
+    """Return the ``sa_json_index`` paths with their Python type.
+
+    Paths given as a list are indexed as strings.
+    """
+    if not paths:
+        return {}
+    if not isinstance(paths, dict):
+        paths = {p: str for p in paths}
+    for path, type_ in paths.items():
+        if not PATH.match(path):
+            raise ValueError("unsupported JSON path {!r}".format(path))
+        if type_ not in SQL_TYPES:
+            raise TypeError("unsupported JSON path type {!r}".format(type_))
+    return dict(paths)
+
+
+def path_slug(path: str) -> str:
+    """Return a name fragment of a path, as ``customer_id``."""
+    return "_".join(a or b for a, b in STEP.findall(path))
+
+
+def generated_name(column: sa.Column, path: str) -> str:
+    """Return the MySQL generated column of a path."""
+    return "{}__{}".format(column.name, path_slug(path))
+
+
+class JsonPath(sa.sql.expression.ColumnElement):
+    """The value at a path of a JSON column."""
+
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("path", InternalTraversal.dp_string),
+        ("python_type", InternalTraversal.dp_plain_obj),
+    ]
+
+    def __init__(self, column: sa.Column, path: str, python_type: type = str):
+        if not PATH.match(path):
+            raise ValueError("unsupported JSON path {!r}".format(path))
+        self.column = column
+        self.path = path
+        self.python_type = python_type
+        self.type = SQL_TYPES[python_type]
+
+
+def _literal(compiler: Any, value: str) -> str:
+    processor = sa.String().literal_processor(compiler.dialect)
+    return processor(value)
+
+
+@compiles(JsonPath)
+def _compile_json_path(element: JsonPath, compiler: Any, **kw: Any) -> str:
+    sql = "json_extract({}, {})".format(
+        compiler.process(element.column, **kw),
+        _literal(compiler, element.path),
+    )
+    if element.python_type is str:
+        return sql
+    return "CAST({} AS {})".format(
+        sql, compiler.dialect.type_compiler.process(element.type)
+    )
+
+
+@compiles(JsonPath, "postgresql")
+def _compile_json_path_pg(element: JsonPath, compiler: Any, **kw: Any) -> str:
+    steps = "{%s}" % ",".join(a or b for a, b in STEP.findall(element.path))
+    sql = "({} #>> {})".format(
+        compiler.process(element.column, **kw), _literal(compiler, steps)
+    )
+    if element.python_type is str:
+        return sql
+    return "CAST({} AS {})".format(
+        sql, compiler.dialect.type_compiler.process(element.type)
+    )
+
+
+def _mysql_expression(element: JsonPath, column: str, compiler: Any) -> str:
+    sql = "JSON_EXTRACT({}, {})".format(
+        column, _literal(compiler, element.path)
+    )
+    if element.python_type is str:
+        return "JSON_UNQUOTE({})".format(sql)
+    return sql
+
+
+@compiles(JsonPath, "mysql")
+@compiles(JsonPath, "mariadb")
+def _compile_json_path_mysql(
+    element: JsonPath, compiler: Any, **kw: Any
+) -> str:
+    paths = element.column.info.get("json_index", {})
+    if paths.get(element.path) is not element.python_type:
+        # Only indexed paths have a generated column.
+        column = compiler.process(element.column, **kw)
+        return _mysql_expression(element, column, compiler)
+    generated = sa.column(
+        generated_name(element.column, element.path),
+        type_=element.type,
+        _selectable=element.column.table,
+    )
+    return compiler.process(generated, **kw)
+
+
+@compiles(CreateIndex, "mysql")
+@compiles(CreateIndex, "mariadb")
+def _create_json_index_mysql(
+    create: CreateIndex, compiler: Any, **kw: Any
+) -> str:
+    index = create.element
+    element = index.info.get("json_path")
+    if element is None:
+        return compiler.visit_create_index(create, **kw)
+
+    preparer = compiler.preparer
+    name = preparer.quote(generated_name(element.column, element.path))
+    column = preparer.quote(element.column.name)
+    expression = _mysql_expression(element, column, compiler)
+    return (
+        "ALTER TABLE {table} ADD COLUMN {name} {type} AS ({expression}) "
+        "VIRTUAL, ADD INDEX {index} ({name})"
+    ).format(
+        table=preparer.format_table(index.table),
+        name=name,
+        type=MYSQL_TYPES[element.python_type],
+        expression=expression,
+        index=preparer.quote(index.name),
+    )
+
+
+def json_path(model: Any, name: str, path: str) -> JsonPath:
+    """Return the expression of a path of a JSON field.
+
+    The type of an indexed path is the declared one, so the expression
+    matches its index.
+    """
+    column = get_column(model, name)
+    if not isinstance(column.type, AutoJson):
+        raise TypeError(
+            "{}.{} is not a JSON field".format(model.__name__, name)
+        )
+    paths = column.info.get("json_index", {})
+    return JsonPath(column, path, paths.get(path, str))
+
+
+def create_json_indexes(model: Any) -> List[sa.Index]:
+    """Build the indexes of the ``sa_json_index`` paths of the model."""
+    indexes = []
+    for column in model.c:
+        paths: Optional[Dict[str, type]] = column.info.get("json_index")
+        if not paths:
+            continue
+        if not isinstance(column.type, AutoJson):
+            raise TypeError(
+                "sa_json_index requires a JSON field, {} is {}".format(
+                    column.name, column.type
+                )
+            )
+        for path, python_type in paths.items():
+            element = JsonPath(column, path, python_type)
+            name = "ix_{}_{}".format(
+                model.t.name, generated_name(column, path)
+            )
+            index = sa.Index(name, element, info={"json_path": element})
+            indexes.append(index)
+    return indexes
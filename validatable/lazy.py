@@ -0,0 +1,83 @@
+"""
+The lazy module provides lazy parsing of JSON fields.
+
+Fields declared with ``Field(sa_lazy=True)`` keep the raw JSON text of
+their column when a model is loaded from a row. The text is parsed and
+validated on first access of the field, so handlers that only forward
+documents skip the JSON work, and validation errors of the document are
+raised at that point.
+
+Raw documents that were never parsed are written back verbatim when the
+instance is inserted or updated, and by the compiled encoder of ``json``.
+Serializing the instance with ``dict``, or ``json`` with arguments,
+parses them first.
+"""
+from typing import Any, Dict, Optional
+
+from pydantic import ValidationError
+
+from .generic_types import AutoJson, RawJson
+
+
+def get_lazy_fields(model: Any) -> tuple:
+    """Return the names of the fields with a lazy JSON column."""
+    names = []
+    for name, field in model.__fields__.items():
+        column = model.c.get(field.alias)
+        if column is None or not column.info.get("lazy"):
+            continue
+        if not isinstance(column.type, AutoJson):
+            raise TypeError(
+                "sa_lazy requires a JSON field, {} is {}".format(
+                    name, column.type
+                )
+            )
+        names.append(name)
+    return tuple(names)
+
+
+def take_raw(model: Any, values: Dict[str, Any]) -> Dict[str, RawJson]:
+    """Remove the raw text of the lazy fields from row values."""
+    raw = {}
+    for name in model.__sa_lazy__:
+        alias = model.__fields__[name].alias
+        value = values.get(alias)
+        if isinstance(value, bytes):
+            value = value.decode()
+        if isinstance(value, str):
+            raw[name] = RawJson(value)
+            del values[alias]
+    return raw
+
+
+def raw_row(model: Any, raw: Dict[str, RawJson]) -> Dict[str, RawJson]:
+    """Return the unparsed documents keyed by column name."""
+    fields = model.__fields__
+    return {fields[name].alias: value for name, value in raw.items()}
+
+
+def load_lazy(instance: Any, name: str) -> Any:
+    """Parse, validate and store the value of a lazy field."""
+    model = type(instance)
+    raw: Optional[Dict[str, RawJson]] = instance._sa_raw
+    if not raw or name not in raw:
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(model.__name__, name)
+        )
+    field = model.__fields__[name]
+    value, error = field.validate(
+        raw[name], instance.__dict__, loc=field.alias, cls=model
+    )
+    if error:
+        raise ValidationError([error], model)
+    del raw[name]
+    instance.__dict__[name] = value
+    return value
+
+
+def load_lazy_fields(instance: Any):
+    """Parse the lazy fields of an instance that were not accessed."""
+    raw = instance._sa_raw
+    if raw:
+        for name in list(raw):
+            load_lazy(instance, name)
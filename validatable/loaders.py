@@ -0,0 +1,147 @@
+"""
+The loaders module provides streaming bulk loads into a table.
+
+Records are read lazily, validated against the model in chunks and
+inserted with one executemany per chunk inside its own transaction, so
+memory stays bounded by the chunk size. Invalid records are handed to a
+rejects callback instead of aborting the load.
+
+Validation runs in the calling process, or in an IngestPipeline when more
+than one worker is requested.
+"""
+import csv
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+from .pipeline import (
+    IngestPipeline,
+    LoadStats,
+    Record,
+    Reject,
+    validate_chunk,
+    write_chunk,
+)
+from .utils import chunked
+from .validation import format_row_errors
+
+
+def load_records(
+    conn,
+    model: Any,
+    records: Iterable[Record],
+    batch_size: int = 1000,
+    workers: int = 1,
+    rejects: Optional[Callable[[List[Reject]], Any]] = None,
+    progress: Optional[Callable[[LoadStats], Any]] = None,
+) -> LoadStats:
+    """Validate and insert records in chunked transactions.
+
+    With more than one worker the chunks are validated by an
+    IngestPipeline, so the model must be importable by the worker
+    processes.
+    """
+    if workers > 1:
+        pipeline = IngestPipeline(
+            model,
+            workers=workers,
+            batch_size=batch_size,
+            rejects=rejects,
+            progress=progress,
+        )
+        return pipeline.run(conn, records)
+
+    stats = LoadStats()
+    for chunk in chunked(records, batch_size):
+        rows, rejected = validate_chunk(model, chunk, stats.rows)
+        write_chunk(conn, model, rows, rejected, stats, rejects, progress)
+    return stats
+
+
+def csv_header_map(model: Any, headers: Iterable[str]) -> Dict[str, str]:
+    """Map CSV headers to the keys the model parses (its aliases)."""
+    aliases = {f.name: f.alias for f in model.__fields__.values()}
+    return {h: aliases.get(h, h) for h in headers}
+
+
+def _csv_records(
+    reader: csv.DictReader, header_map: Dict[str, str]
+) -> Iterator[Record]:
+    for line in reader:
+        yield {
+            header_map[k]: v
+            for k, v in line.items()
+            if k is not None and v != ""
+        }
+
+
+class CsvRejects:
+    """Write rejected records to a CSV file with an extra error column."""
+
+    def __init__(
+        self, fp: Any, headers: Sequence[str], header_map: Dict[str, str], **kw
+    ):
+        self.reverse_map = {v: k for k, v in header_map.items()}
+        self.writer = csv.DictWriter(fp, [*headers, "error"], **kw)
+        self.writer.writeheader()
+
+    def __call__(self, rejected: List[Reject]):
+        self.writer.writerows(
+            {
+                **{self.reverse_map[k]: v for k, v in record.items()},
+                "error": format_row_errors(errors),
+            }
+            for record, errors in rejected
+        )
+
+
+def load_csv(
+    conn,
+    model: Any,
+    path: str,
+    batch_size: int = 1000,
+    workers: int = 1,
+    rejects: Optional[str] = None,
+    progress: Optional[Callable[[LoadStats], Any]] = None,
+    encoding: str = "utf-8",
+    **fmtparams: Any,
+) -> LoadStats:
+    """Stream a CSV file into the model table.
+
+    Headers may be field names or aliases. Empty values are treated as
+    missing, so defaults apply. Invalid rows are written to the rejects
+    CSV file, with an extra ``error`` column, instead of aborting.
+    """
+    with open(path, newline="", encoding=encoding) as fp:
+        reader = csv.DictReader(fp, **fmtparams)
+        headers = reader.fieldnames or []
+        header_map = csv_header_map(model, headers)
+
+        rejects_fp = None
+        write_rejects = None
+        if rejects is not None:
+            rejects_fp = open(rejects, "w", newline="", encoding=encoding)
+            write_rejects = CsvRejects(
+                rejects_fp, headers, header_map, **fmtparams
+            )
+
+        try:
+            return load_records(
+                conn,
+                model,
+                _csv_records(reader, header_map),
+                batch_size=batch_size,
+                workers=workers,
+                rejects=write_rejects,
+                progress=progress,
+            )
+        finally:
+            if rejects_fp is not None:
+                rejects_fp.close()
@@ -8,15 +8,52 @@ BaseTable class extends Pydantic BaseModel to include SQLAlchemy Table
 instance methods in the class interface.
 
 """
-from typing import Any, Dict, List, Optional, Set
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from pydantic.main import ModelMetaclass
 from sqlalchemy import Table
 from sqlalchemy.sql.base import ImmutableColumnCollection
 from sqlalchemy.sql.schema import MetaData
 
+from .arrow import (
+    from_arrow,
+    insert_arrow,
+    read_parquet,
+    to_arrow,
+    write_parquet,
+)
+from .bulk import delete_many, get_many, insert_many, update_many
+from .cache import IdentityCache, get, get_identity_cache, select
+from .columnar import ColumnarSnapshot, export_columnar, open_columnar
+from .compiler import get_validator, init_model
+from .deferred import get_deferred_fields, load_deferred
+from .embedded import Embedded, get_embedded
+from .encoder import get_encoder
+from .indexes import Index, create_indexes
 from .inference import get_table
+from .jsonpath import create_json_indexes, json_path
+from .lazy import get_lazy_fields, load_lazy, load_lazy_fields
+from .loaders import LoadStats, load_csv, load_records
+from .mirror import Mirror
+from .ndjson import dump_ndjson, load_ndjson
+from .pagination import Page, paginate
+from .partition import full_select, get_cold_fields, get_cold_table
+from .relations import load_related
+from .rows import Row, get_row_class, iter_rows, select_fields
+from .tracking import track_copy, track_setattr, update
+from .utils import register_model
+from .validation import get_quarantine_table, validate_many
 
 
 class ValidatableMetaclass(ModelMetaclass):
@@ -45,7 +82,15 @@ class ValidatableMetaclass(ModelMetaclass):
         """Control the BaseTable definition."""
         table = namespace.get("__sa_table__")
         if isinstance(table, Table):
-            return super().__new__(mcls, name, bases, namespace, **kwargs)
+            cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+            cls.__sa_embedded__ = get_embedded(cls)
+            cls.__sa_identity_cache__ = get_identity_cache(cls.__sa_cache__)
+            cls.__sa_row_class__ = get_row_class(cls)
+            cls.__sa_deferred__ = get_deferred_fields(cls)
+            cls.__sa_lazy__ = get_lazy_fields(cls)
+            cls.__sa_validator__ = get_validator(cls)
+            register_model(cls)
+            return cls
 
         metadata = namespace.get("__sa_metadata__", None)
         if metadata is None:
@@ -53,7 +98,9 @@ class ValidatableMetaclass(ModelMetaclass):
             namespace["__create_table__"] = namespace.get(
                 "__create_table__", True
             )
-            return super().__new__(mcls, name, bases, namespace, **kwargs)
+            cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+            cls.__sa_validator__ = get_validator(cls)
+            return cls
 
         tablename = namespace.get("__sa_tablename__", name.lower())
         namespace["__sa_tablename__"] = tablename
@@ -67,19 +114,46 @@ class ValidatableMetaclass(ModelMetaclass):
         exclude = namespace.get("__sa_exclude__")
 
         cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+        cls.__sa_validator__ = get_validator(cls)
 
         if cls.__create_table__:
             cls.__create_table__ = False
+            cold = get_cold_fields(cls.__fields__)
             cls.__sa_table__ = get_table(
                 tablename,
                 metadata,
                 cls.__fields__,
                 table_args,
                 table_kwargs,
-                exclude,
+                (exclude or set()) | cold,
             )
+            cls.__sa_cold_table__ = (
+                get_cold_table(cls.__sa_table__, cls.__fields__, cold)
+                if cold
+                else None
+            )
+            cls.__sa_embedded__ = get_embedded(cls)
+            cls.__sa_quarantine_table__ = (
+                get_quarantine_table(tablename, metadata)
+                if cls.__sa_quarantine__
+                else None
+            )
+            cls.__sa_identity_cache__ = get_identity_cache(cls.__sa_cache__)
+            cls.__sa_row_class__ = get_row_class(cls)
+            cls.__sa_deferred__ = get_deferred_fields(cls)
+            cls.__sa_lazy__ = get_lazy_fields(cls)
+            create_indexes(cls)
+            create_json_indexes(cls)
+            register_model(cls)
         else:
             cls.__sa_table__ = None
+            cls.__sa_quarantine_table__ = None
+            cls.__sa_identity_cache__ = None
+            cls.__sa_cold_table__ = None
+            cls.__sa_row_class__ = None
+            cls.__sa_deferred__ = ()
+            cls.__sa_embedded__ = ()
+            cls.__sa_lazy__ = ()
             cls.__sa_metadata__ = None
             cls.__sa_table_args__ = []
             cls.__sa_table_kwargs__ = {}
@@ -101,8 +175,202 @@ class ValidatableMetaclass(ModelMetaclass):
         """Return the metadata instance."""
         return cls.__sa_metadata__  # type: ignore[attr-defined]
 
+    @property
+    def quarantine(cls) -> Optional[Table]:
+        """Return the quarantine table, if __sa_quarantine__ is set."""
+        return cls.__sa_quarantine_table__  # type: ignore[attr-defined]
+
+    @property
+    def cache(cls) -> Optional[IdentityCache]:
+        """Return the identity cache, if __sa_cache__ is set."""
+        return cls.__sa_identity_cache__  # type: ignore[attr-defined]
+
+    def get(cls, conn, key):
+        """Return the model of a primary key, or None."""
+        return get(conn, cls, key)
+
+    def mirror(cls, engine, indexes=(), refresh=None, poll=1.0) -> Mirror:
+        """Return an in-memory mirror of the table with indexed lookups."""
+        return Mirror(engine, cls, indexes, refresh, poll)
+
+    @property
+    def cold(cls) -> Optional[Table]:
+        """Return the cold side table, or None."""
+        return cls.__sa_cold_table__  # type: ignore[attr-defined]
+
+    def full_select(cls):
+        """Return the select of the table joined with its cold table."""
+        return full_select(cls)
+
+    @property
+    def row_class(cls) -> Optional[Type[Row]]:
+        """Return the read-only row class of the table."""
+        return cls.__sa_row_class__  # type: ignore[attr-defined]
+
+    def iter_rows(cls, conn, stmt=None):
+        """Yield the rows selected by stmt as read-only row objects."""
+        stmt = full_select(cls, deferred=False) if stmt is None else stmt
+        return iter_rows(conn.execute(stmt), cls.row_class)
+
+    def json_path(cls, name, path):
+        """Return the expression of a path of a JSON field."""
+        return json_path(cls, name, path)
+
+    def paginate(
+        cls, conn, order_by=None, page_size=50, after=None, where=None
+    ) -> Page:
+        """Return a page of models after a cursor, by keyset pagination."""
+        return paginate(conn, cls, order_by, page_size, after, where)
+
+    def select_fields(cls, conn, *names, where=None):
+        """Return partial rows with only the named fields loaded."""
+        return select_fields(conn, cls, *names, where=where)
+
+    def select(cls, conn, stmt=None, cache=None, rows=False):
+        """Return the models selected by stmt, the whole table by default.
+
+        With ``rows``, return read-only row objects instead of models.
+        """
+        return select(conn, cls, stmt, cache, rows)
+
+    def update(cls, conn, instance) -> int:
+        """Write the dirty columns of an instance, keyed by primary key."""
+        return update(conn, cls, instance)
+
+    def validate_many(cls, records, start=0):
+        """Validate records into insert rows and errors without raising."""
+        return validate_many(cls, records, start)
+
+    def load_related(cls, conn, instances, name: str, chunk_size=500):
+        """Return the rows referenced by a foreign key field, by key."""
+        return load_related(conn, cls, instances, name, chunk_size)
+
+    def get_many(cls, conn, keys, chunk_size=500, temp_threshold=5000):
+        """Return the models of the primary keys, in input order."""
+        return get_many(conn, cls, keys, chunk_size, temp_threshold)
+
+    def insert_many(cls, conn, instances) -> int:
+        """Insert many instances into the model and cold tables."""
+        return insert_many(conn, cls, instances)
+
+    def update_many(cls, conn, instances, fields=None) -> int:
+        """Update many instances with one set-based UPDATE."""
+        return update_many(conn, cls, instances, fields)
+
+    def delete_many(
+        cls, conn, keys, chunk_size=500, temp_threshold=5000
+    ) -> int:
+        """Delete the rows of many primary keys."""
+        return delete_many(conn, cls, keys, chunk_size, temp_threshold)
+
+    def export_columnar(cls, conn, directory: str, batch_size=10000) -> int:
+        """Write a memory-mappable snapshot of the table to directory."""
+        return export_columnar(conn, cls, directory, batch_size=batch_size)
+
+    def open_columnar(cls, directory: str) -> ColumnarSnapshot:
+        """Open a snapshot written by export_columnar."""
+        return open_columnar(cls, directory)
+
+    def to_arrow(cls, conn, stmt=None, batch_size=65536):
+        """Return the rows selected by stmt as an Arrow table."""
+        return to_arrow(conn, cls, stmt, batch_size=batch_size)
+
+    def from_arrow(cls, data, batch_size=65536):
+        """Yield insert parameters from an Arrow table or record batch."""
+        return from_arrow(cls, data, batch_size=batch_size)
+
+    def insert_arrow(cls, conn, data, batch_size=65536) -> int:
+        """Insert an Arrow table or record batch into the table."""
+        return insert_arrow(conn, cls, data, batch_size=batch_size)
+
+    def write_parquet(cls, conn, path: str, stmt=None, batch_size=65536):
+        """Stream the rows selected by stmt to a Parquet file."""
+        return write_parquet(conn, cls, path, stmt, batch_size=batch_size)
+
+    def read_parquet(cls, conn, path: str, batch_size=65536) -> int:
+        """Insert the rows of a Parquet file into the table."""
+        return read_parquet(conn, cls, path, batch_size=batch_size)
+
+    def load_records(
+        cls, conn, records, batch_size=1000, workers=1, **kwargs
+    ) -> LoadStats:
+        """Validate and insert records in chunked transactions."""
+        return load_records(
+            conn, cls, records, batch_size, workers=workers, **kwargs
+        )
+
+    def load_csv(
+        cls, conn, path: str, batch_size=1000, workers=1, **kwargs
+    ) -> LoadStats:
+        """Stream a CSV file into the table."""
+        return load_csv(conn, cls, path, batch_size, workers=workers, **kwargs)
+
+    def dump_ndjson(cls, conn, stmt, fp, batch_size=1000) -> int:
+        """Write the rows selected by stmt as JSON lines to fp."""
+        return dump_ndjson(conn, cls, stmt, fp, batch_size=batch_size)
+
+    def load_ndjson(
+        cls, conn, fp, batch_size=1000, workers=1, **kwargs
+    ) -> LoadStats:
+        """Stream JSON lines from fp into the table."""
+        return load_ndjson(
+            conn, cls, fp, batch_size, workers=workers, **kwargs
+        )
+
+
+class TableMixin:
+    """Instance behavior shared by BaseTable and Validatable.
+
+    Listed before BaseModel in the bases, so its methods wrap the
+    pydantic ones.
+    """
+
+    def __init__(__pydantic_self__, **data):
+        """Validate data, with the compiled validator if any."""
+        init_model(__pydantic_self__, data)
+
+    def __getattr__(self, name):
+        """Load a deferred or lazy field on first access."""
+        if name in type(self).__sa_lazy__ and self._sa_raw:
+            return load_lazy(self, name)
+        if name in type(self).__sa_deferred__:
+            return load_deferred(self, name)
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(
+                type(self).__name__, name
+            )
+        )
+
+    def __setattr__(self, name, value):
+        """Assign a field and mark it dirty."""
+        track_setattr(self, name, value)
+
+    def _iter(self, *args, **kwargs):
+        """Parse the lazy fields before iterating over the values."""
+        load_lazy_fields(self)
+        return super()._iter(*args, **kwargs)
+
+    def json(self, **kwargs):
+        """Return the JSON of the model, with its compiled encoder.
+
+        Calls with arguments use the pydantic encoding.
+        """
+        encoder = None if kwargs else get_encoder(type(self))
+        if encoder is None:
+            return super().json(**kwargs)
+        return encoder(self)
+
+    def copy(self, *, update=None, **kwargs):
+        """Duplicate the model, with its own set of dirty fields."""
+        copy = super().copy(update=update, **kwargs)
+        return track_copy(self, copy, update)
+
+    def save(self, conn) -> int:
+        """Write the fields assigned since load to the table."""
+        return update(conn, type(self), self)
+
 
-class BaseTable(BaseModel, metaclass=ValidatableMetaclass):
+class BaseTable(TableMixin, BaseModel, metaclass=ValidatableMetaclass):
     """Extends BaseModel to include SQLAlchemy Table construction."""
 
     __sa_table__: Optional[Table]
@@ -110,9 +378,24 @@ class BaseTable(BaseModel, metaclass=ValidatableMetaclass):
     __sa_table_args__: List[Any]
     __sa_table_kwargs__: Dict[str, Any]
     __sa_exclude__: Optional[Set[str]] = None
+    __sa_quarantine__: bool = False
+    __sa_quarantine_table__: Optional[Table] = None
+    __sa_cold_table__: Optional[Table] = None
+    __sa_indexes__: Sequence[Index] = ()
+    __sa_cache__: Any = None
+    __sa_identity_cache__: Optional[IdentityCache] = None
+    __sa_row_class__: Optional[Type[Row]] = None
+    __sa_deferred__: Tuple[str, ...] = ()
+    __sa_embedded__: Tuple[Embedded, ...] = ()
+    __sa_lazy__: Tuple[str, ...] = ()
+    __sa_compiled__: bool = False
+    __sa_validator__: Optional[Callable] = None
+    _sa_dirty: Set[str] = PrivateAttr(default_factory=set)
+    _sa_deferred: Any = PrivateAttr(None)
+    _sa_raw: Optional[Dict[str, str]] = PrivateAttr(None)
 
 
-class Validatable(BaseModel, metaclass=ValidatableMetaclass):
+class Validatable(TableMixin, BaseModel, metaclass=ValidatableMetaclass):
     """Extends BaseModel to include SQLAlchemy Table construction."""
 
     __sa_table__: Optional[Table]
@@ -120,3 +403,18 @@ class Validatable(BaseModel, metaclass=ValidatableMetaclass):
     __sa_table_args__: List[Any]
     __sa_table_kwargs__: Dict[str, Any]
     __sa_exclude__: Optional[Set[str]] = None
+    __sa_quarantine__: bool = False
+    __sa_quarantine_table__: Optional[Table] = None
+    __sa_cold_table__: Optional[Table] = None
+    __sa_indexes__: Sequence[Index] = ()
+    __sa_cache__: Any = None
+    __sa_identity_cache__: Optional[IdentityCache] = None
+    __sa_row_class__: Optional[Type[Row]] = None
+    __sa_deferred__: Tuple[str, ...] = ()
+    __sa_embedded__: Tuple[Embedded, ...] = ()
+    __sa_lazy__: Tuple[str, ...] = ()
+    __sa_compiled__: bool = False
+    __sa_validator__: Optional[Callable] = None
+    _sa_dirty: Set[str] = PrivateAttr(default_factory=set)
+    _sa_deferred: Any = PrivateAttr(None)
+    _sa_raw: Optional[Dict[str, str]] = PrivateAttr(None)
@@ -0,0 +1,183 @@
+"""
+The mirror module provides in-memory read replicas of small tables.
+
+A Mirror loads the whole table into immutable snapshots with a primary
+key map and secondary indexes on chosen fields, so lookups run without
+SQL. Reloads build a new snapshot and swap it in with a single attribute
+assignment, so readers never take a lock.
+
+Mirrors can reload on an interval, or poll SQLite's ``data_version``
+pragma and reload only when another connection committed a change.
+"""
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .partition import full_select
+from .utils import row_to_model
+
+DATA_VERSION = "data_version"
+
+
+class _Snapshot:
+    def __init__(self, model: Any, rows: List[Any], indexes: Iterable[str]):
+        names = [c.name for c in model.t.primary_key.columns]
+        key_fields = [_field_name(model, n) for n in names]
+        self.rows = tuple(rows)
+        if len(key_fields) == 1:
+            self.by_key = {getattr(r, key_fields[0]): r for r in rows}
+        else:
+            self.by_key = {
+                tuple(getattr(r, f) for f in key_fields): r for r in rows
+            }
+        self.indexes: Dict[str, Dict[Any, List[Any]]] = {}
+        for name in indexes:
+            index: Dict[Any, List[Any]] = {}
+            for row in rows:
+                index.setdefault(getattr(row, name), []).append(row)
+            self.indexes[name] = index
+
+
+def _field_name(model: Any, column_name: str) -> str:
+    for field in model.__fields__.values():
+        if field.alias == column_name:
+            return field.name
+    return column_name
+
+
+class Mirror:
+    """An in-memory copy of a table with indexed lookups.
+
+    ``refresh`` is None to reload only on demand, a number of seconds to
+    reload on an interval, or ``"data_version"`` to poll SQLite every
+    ``poll`` seconds and reload when the database changed. Returned
+    instances are shared by every reader and must not be modified.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        model: Any,
+        indexes: Iterable[str] = (),
+        refresh: Union[None, float, str] = None,
+        poll: float = 1.0,
+    ):
+        if model.t is None:
+            raise TypeError("{} has no table".format(model.__name__))
+        for name in indexes:
+            if name not in model.__fields__:
+                raise KeyError(name)
+        if refresh == DATA_VERSION and engine.dialect.name != "sqlite":
+            raise ValueError("data_version refresh requires SQLite")
+
+        self.engine = engine
+        self.model = model
+        self.indexes = tuple(indexes)
+        self.refresh_interval = refresh
+        self.poll = poll
+        self.version = 0
+        self.error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reload()
+
+        if refresh is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _load(self, conn) -> _Snapshot:
+        rows = [
+            row_to_model(self.model, row)
+            for row in conn.execute(full_select(self.model))
+        ]
+        return _Snapshot(self.model, rows, self.indexes)
+
+    def reload(self, conn=None):
+        """Load the table into a new snapshot and swap it in."""
+        with self._lock:
+            if conn is None:
+                with self.engine.connect() as conn:
+                    snapshot = self._load(conn)
+            else:
+                snapshot = self._load(conn)
+            self._snapshot = snapshot
+            self.version += 1
+
+    def _reload(self, conn=None):
+        # A failed reload keeps the previous snapshot and is retried on
+        # the next refresh.
+        try:
+            self.reload(conn)
+            self.error = None
+        except Exception as exc:
+            self.error = exc
+
+    def _run(self):
+        if self.refresh_interval != DATA_VERSION:
+            while not self._stop.wait(self.refresh_interval):
+                self._reload()
+            return
+
+        # data_version is per connection, so the poller keeps its own.
+        with self.engine.connect() as conn:
+            pragma = "PRAGMA data_version"
+            data_version = conn.exec_driver_sql(pragma).scalar()
+            while not self._stop.wait(self.poll):
+                current = conn.exec_driver_sql(pragma).scalar()
+                if current != data_version:
+                    self._reload(conn)
+                    if self.error is None:
+                        data_version = current
+
+    def close(self):
+        """Stop refreshing the mirror."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.rows)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._snapshot.rows)
+
+    def all(self) -> Tuple[Any, ...]:
+        """Return every instance of the snapshot."""
+        return self._snapshot.rows
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the instance of a primary key, or default."""
+        return self._snapshot.by_key.get(key, default)
+
+    def filter(self, **criteria: Any) -> List[Any]:
+        """Return the instances whose fields equal the given values.
+
+        The first indexed field narrows the candidates, the remaining
+        criteria are checked on each of them.
+        """
+        snapshot = self._snapshot
+        candidates: Iterable[Any] = snapshot.rows
+        for name, value in criteria.items():
+            index = snapshot.indexes.get(name)
+            if index is not None:
+                candidates = index.get(value, ())
+                criteria = {k: v for k, v in criteria.items() if k != name}
+                break
+        items = list(criteria.items())
+        return [
+            row
+            for row in candidates
+            if all(getattr(row, k) == v for k, v in items)
+        ]
+
+    def __repr__(self) -> str:
+        return "Mirror({}, rows={}, version={})".format(
+            self.model.__name__, len(self), self.version
+        )
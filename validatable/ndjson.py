@@ -0,0 +1,180 @@
+"""
+The ndjson module provides newline delimited JSON export and import.
+
+Export encodes result tuples directly, with one encoder per column chosen
+from the inferred column type, so no model instance is created. Import
+streams lines through load_records.
+"""
+import enum
+import json
+import math
+from typing import Any, Callable, Iterator, List, Optional, TextIO, Tuple
+
+import sqlalchemy as sa
+
+from .embedded import assemble
+from .generic_types import GUID, AutoJson, dumps
+from .loaders import LoadStats, Record, Reject, load_records
+from .partition import full_select
+from .utils import base_type
+from .validation import format_row_errors
+
+Encoder = Callable[[Any], str]
+
+# The C accelerated string encoder, missing from the type stubs.
+encode_str: Encoder = getattr(json.encoder, "encode_basestring_ascii")
+
+
+def encode_float(v: float) -> str:
+    return repr(v) if math.isfinite(v) else dumps(v)
+
+
+def encode_bool(v: bool) -> str:
+    return "true" if v else "false"
+
+
+def encode_isoformat(v: Any) -> str:
+    return '"{}"'.format(v.isoformat())
+
+
+def encode_json(v: Any) -> str:
+    if not isinstance(v, str):
+        return dumps(v)
+    # Raw line breaks can only be whitespace between JSON tokens.
+    if "\n" in v or "\r" in v:
+        return v.replace("\r", " ").replace("\n", " ")
+    return v
+
+
+def encode_enum(v: Any) -> str:
+    return dumps(v.value if isinstance(v, enum.Enum) else v)
+
+
+# The order matters: Float is a Numeric and Enum is a String.
+ENCODERS: Tuple[Tuple[Any, Encoder], ...] = (
+    (GUID, lambda v: '"{}"'.format(v)),
+    (AutoJson, encode_json),
+    (sa.Boolean, encode_bool),
+    (sa.Integer, int.__repr__),
+    (sa.Float, encode_float),
+    (sa.Numeric, lambda v: encode_float(float(v))),
+    (sa.Enum, encode_enum),
+    ((sa.DateTime, sa.Date, sa.Time), encode_isoformat),
+    (sa.Interval, lambda v: encode_float(v.total_seconds())),
+    (sa.LargeBinary, lambda v: encode_str(v.decode())),
+    (sa.String, lambda v: encode_str(str(v))),
+)
+
+
+def get_encoder(column: Optional[sa.Column]) -> Encoder:
+    """Return the JSON encoder of the column values."""
+    if column is None:
+        return dumps
+    type_ = base_type(column)
+    for types, encoder in ENCODERS:
+        if isinstance(type_, types):
+            return encoder
+    return dumps
+
+
+def row_encoder(model: Any, names: List[str]) -> Callable[[Any], str]:
+    """Return a function that encodes a result row as a JSON line."""
+    columns = full_select(model).selected_columns
+    keys = ["{}:".format(encode_str(n)) for n in names]
+    encoders = [get_encoder(columns.get(n)) for n in names]
+    items = list(zip(keys, encoders))
+
+    def encode(row: Any) -> str:
+        return "{%s}\n" % ",".join(
+            [
+                k + ("null" if v is None else e(v))
+                for (k, e), v in zip(items, row)
+            ]
+        )
+
+    return encode
+
+
+def dump_ndjson(
+    conn, model: Any, stmt: Any, fp: TextIO, batch_size: int = 1000
+) -> int:
+    """Write the rows selected by stmt as JSON lines to fp.
+
+    Keys are column names, so the output can be loaded back with
+    load_ndjson. By default the cold table is joined. Return the number
+    of written rows.
+    """
+    stmt = full_select(model) if stmt is None else stmt
+    result = conn.execute(stmt)
+    encode = row_encoder(model, list(result.keys()))
+    count = 0
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            return count
+        fp.write("".join([encode(row) for row in rows]))
+        count += len(rows)
+
+
+def _raw_json_keys(model: Any) -> List[str]:
+    return [
+        c.name
+        for c in full_select(model).selected_columns
+        if isinstance(c.type, AutoJson) and c.type.python_type is Any
+    ]
+
+
+def _ndjson_records(model: Any, fp: TextIO) -> Iterator[Record]:
+    # Json fields are parsed by pydantic, so embedded documents are dumped
+    # back to text before validation. Exports hold the columns of embedded
+    # fields, which are nested again like rows read from the table.
+    keys = _raw_json_keys(model)
+    for line in fp:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        for k in keys:
+            v = record.get(k)
+            if v is not None and not isinstance(v, str):
+                record[k] = dumps(v)
+        yield assemble(model, record)
+
+
+class NdjsonRejects:
+    """Write rejected records as JSON lines with their error."""
+
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+
+    def __call__(self, rejected: List[Reject]):
+        self.fp.write(
+            "".join(
+                dumps({"record": r, "error": format_row_errors(e)}) + "\n"
+                for r, e in rejected
+            )
+        )
+
+
+def load_ndjson(
+    conn,
+    model: Any,
+    fp: TextIO,
+    batch_size: int = 1000,
+    workers: int = 1,
+    rejects: Optional[TextIO] = None,
+    progress: Optional[Callable[[LoadStats], Any]] = None,
+) -> LoadStats:
+    """Stream JSON lines from fp into the model table.
+
+    Invalid records are written to the rejects file object, if given,
+    instead of aborting.
+    """
+    return load_records(
+        conn,
+        model,
+        _ndjson_records(model, fp),
+        batch_size=batch_size,
+        workers=workers,
+        rejects=None if rejects is None else NdjsonRejects(rejects),
+        progress=progress,
+    )
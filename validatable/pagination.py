@@ -0,0 +1,153 @@
+"""
+The pagination module provides keyset pagination.
+
+Pages are selected with a seek condition on the ordering columns, as in
+``WHERE (a, b) > (?, ?)``, instead of an OFFSET, so every page costs one
+index range scan whatever its depth. The primary key columns are always
+appended to the ordering, which makes it total.
+
+Cursors are opaque URL-safe tokens holding the ordering and the values
+of the last row of a page.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+
+from .deferred import default_select, rows_to_models
+from .generic_types import dumps
+from .partition import clause_columns, join_cold
+from .utils import get_column, primary_key_columns
+
+
+class Page(NamedTuple):
+    """A page of models and the cursor of the next page, if any."""
+
+    items: List[Any]
+    cursor: Optional[str]
+
+
+def get_ordering(
+    model: Any, order_by: Optional[Sequence[str]] = None
+) -> List[Tuple[sa.Column, bool]]:
+    """Return the ordering columns and whether each is descending.
+
+    Names may be prefixed with ``-`` for a descending order. Primary key
+    columns missing from the ordering are appended in ascending order.
+    """
+    ordering: List[Tuple[sa.Column, bool]] = []
+    for name in order_by or ():
+        descending = name.startswith("-")
+        column = get_column(model, name[1:] if descending else name)
+        if all(column is not c for c, _ in ordering):
+            ordering.append((column, descending))
+    for column in primary_key_columns(model):
+        if all(column is not c for c, _ in ordering):
+            ordering.append((column, False))
+    return ordering
+
+
+def _seek(ordering: List[Tuple[sa.Column, bool]], values: List[Any]) -> Any:
+    directions = {descending for _, descending in ordering}
+    if len(directions) == 1:
+        columns: Any = sa.tuple_(*[c for c, _ in ordering])
+        literals: Any = sa.tuple_(
+            *[sa.literal(v, c.type) for (c, _), v in zip(ordering, values)]
+        )
+        return columns < literals if directions.pop() else columns > literals
+
+    # Mixed directions cannot be compared as row values.
+    clauses = []
+    for i, ((column, descending), value) in enumerate(zip(ordering, values)):
+        equal = [c == v for (c, _), v in zip(ordering[:i], values)]
+        step = column < value if descending else column > value
+        clauses.append(sa.and_(*equal, step))
+    return sa.or_(*clauses)
+
+
+def _names(ordering: List[Tuple[sa.Column, bool]]) -> List[str]:
+    return ["-" + c.name if d else c.name for c, d in ordering]
+
+
+def encode_cursor(ordering: List[Tuple[sa.Column, bool]], row: Any) -> str:
+    """Return the cursor of the page following row."""
+    payload = [_names(ordering), [row[c.name] for c, _ in ordering]]
+    return base64.urlsafe_b64encode(dumps(payload).encode()).decode()
+
+
+def _column_field(model: Any, column: sa.Column) -> Tuple[Any, Any]:
+    # Columns of embedded fields are validated by their sub-field.
+    embedded = column.info.get("embedded")
+    if embedded is not None:
+        nested = model.__fields__[embedded[0]].outer_type_
+        return nested.__fields__[embedded[1]], nested
+    field = next(
+        f for f in model.__fields__.values() if f.alias == column.name
+    )
+    return field, model
+
+
+def decode_cursor(
+    model: Any, ordering: List[Tuple[sa.Column, bool]], cursor: str
+) -> List[Any]:
+    """Return the values of a cursor, validated by the model fields."""
+    try:
+        names, values = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("invalid cursor")
+    if names != _names(ordering):
+        raise ValueError("the cursor does not match the ordering")
+
+    decoded = []
+    for (column, _), value in zip(ordering, values):
+        field, cls = _column_field(model, column)
+        value, error = field.validate(value, {}, loc=field.alias, cls=cls)
+        if error:
+            raise ValueError("invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def paginate(
+    conn,
+    model: Any,
+    order_by: Optional[Sequence[str]] = None,
+    page_size: int = 50,
+    after: Optional[str] = None,
+    where: Optional[Any] = None,
+) -> Page:
+    """Return the page of models following the ``after`` cursor.
+
+    Ordering columns should not hold NULL values, and should be covered
+    by an index for pages to cost the same at any depth.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    ordering = get_ordering(model, order_by)
+    stmt = default_select(model)
+    # The cursor holds the values of the ordering columns, so deferred and
+    # cold ones are selected too.
+    columns = [
+        c for c, _ in ordering if not stmt.selected_columns.contains_column(c)
+    ]
+    if columns:
+        stmt = stmt.add_columns(*columns)
+    if where is not None:
+        stmt = stmt.where(where)
+    stmt = join_cold(model, stmt, columns + clause_columns(where))
+    if after is not None:
+        stmt = stmt.where(
+            _seek(ordering, decode_cursor(model, ordering, after))
+        )
+    stmt = stmt.order_by(
+        *[c.desc() if d else c.asc() for c, d in ordering]
+    ).limit(page_size + 1)
+
+    rows = conn.execute(stmt).fetchall()
+    cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        cursor = encode_cursor(ordering, rows[-1])
+    return Page(rows_to_models(conn, model, rows), cursor)
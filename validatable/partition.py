@@ -0,0 +1,170 @@
+"""
+The partition module provides vertical partitioning of wide models.
+
+Fields declared with ``Field(sa_cold=True)`` are stored in a cold side
+table named ``{table}_cold``, which shares the primary key of the model
+table and references it 1:1. The model table keeps the hot columns, so
+its pages hold more rows.
+
+Writes made through validatable are routed to both tables, and updates
+insert the cold rows that are missing. Inserts made directly with
+``Model.t.insert()`` only write the model table and drop the cold
+values, use ``Model.insert_many`` or ``UnitOfWork`` instead. Cold fields
+are left out of the default selects and loaded in batch on first
+access, like deferred fields, or joined with ``full_select``.
+"""
+from typing import Any, Dict, Iterable, List, Set
+
+import sqlalchemy as sa
+
+from .inference import get_column
+from .utils import chunked, key_clause, row_key
+
+
+def get_cold_fields(fields: Dict[str, Any]) -> Set[str]:
+    """Return the names of the fields declared with ``sa_cold``."""
+    return {
+        name for name, f in fields.items() if f.field_info.extra.get("sa_cold")
+    }
+
+
+def get_cold_table(
+    table: sa.Table, fields: Dict[str, Any], names: Set[str]
+) -> sa.Table:
+    """Return the cold side table of table with the named fields.
+
+    Cold columns are nullable, so a cold row can be inserted for every
+    hot row even when the cold values are unknown.
+    """
+    keys = [
+        sa.Column(
+            c.name,
+            c.type,
+            sa.ForeignKey(c, ondelete="CASCADE"),
+            primary_key=True,
+            autoincrement=False,
+        )
+        for c in table.primary_key.columns
+    ]
+    if not keys:
+        raise TypeError(
+            "{} needs a primary key to have cold fields".format(table.name)
+        )
+    columns = []
+    for name in sorted(names, key=list(fields).index):
+        column = get_column(fields[name])
+        column.nullable = True
+        columns.append(column)
+    return sa.Table(
+        "{}_cold".format(table.name), table.metadata, *keys, *columns
+    )
+
+
+def split_rows(
+    table: sa.Table, rows: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Return the values of rows that belong to table."""
+    columns = table.c
+    return [{k: v for k, v in r.items() if k in columns} for r in rows]
+
+
+def insert_rows(conn, model: Any, rows: List[Dict[str, Any]]):
+    """Insert rows keyed by column name into the model tables.
+
+    When a cold table exists and the primary key is generated by the
+    database, rows are inserted one at a time to learn their keys.
+    """
+    table = model.t
+    cold = model.cold
+    if cold is None:
+        conn.execute(table.insert(), rows)
+        return
+
+    keys = [c.name for c in table.primary_key.columns]
+    if any(r.get(k) is None for r in rows for k in keys):
+        for row in rows:
+            result = conn.execute(table.insert(), row)
+            row.update(zip(keys, result.inserted_primary_key))
+    else:
+        conn.execute(table.insert(), rows)
+    conn.execute(cold.insert(), split_rows(cold, rows))
+
+
+def _existing_keys(
+    conn, table: sa.Table, names: List[str], keys: List[Any]
+) -> Set[Any]:
+    columns = [table.c[n] for n in names]
+    found: Set[Any] = set()
+    for chunk in chunked(keys, 500):
+        query = sa.select(*columns).where(key_clause(columns, chunk))
+        found.update(row_key(r._mapping, names) for r in conn.execute(query))
+    return found
+
+
+def insert_cold_rows(conn, model: Any, rows: List[Dict[str, Any]]) -> int:
+    """Insert the missing cold rows of existing model table rows.
+
+    Rows are keyed by column name. The cold columns they leave out take
+    the defaults of their fields, as read for a missing cold row. Return
+    the number of inserted rows.
+    """
+    table = model.t
+    cold = model.cold
+    names = [c.name for c in table.primary_key.columns]
+    wanted = {row_key(r, names): r for r in rows}
+    keys = list(wanted)
+    found = _existing_keys(conn, table, names, keys)
+    found.difference_update(_existing_keys(conn, cold, names, keys))
+    missing = [r for k, r in wanted.items() if k in found]
+    if not missing:
+        return 0
+    defaults = {
+        f.alias: None if f.required else f.get_default()
+        for f in model.__fields__.values()
+        if f.alias in cold.c and f.alias not in names
+    }
+    conn.execute(
+        cold.insert(),
+        [dict(defaults, **r) for r in split_rows(cold, missing)],
+    )
+    return len(missing)
+
+
+def cold_join(model: Any) -> Any:
+    """Return the outer join of the model table with its cold table."""
+    table = model.t
+    cold = model.cold
+    on = sa.and_(*[c == cold.c[c.name] for c in table.primary_key.columns])
+    return table.outerjoin(cold, on)
+
+
+def clause_columns(clause: Any) -> List[sa.Column]:
+    """Return the table columns a clause refers to, as in a where clause."""
+    if clause is None:
+        return []
+    return [
+        e for e in sa.sql.visitors.iterate(clause) if isinstance(e, sa.Column)
+    ]
+
+
+def join_cold(model: Any, stmt: Any, columns: Iterable[sa.Column]) -> Any:
+    """Return stmt joined with the cold table if columns has cold ones."""
+    if not any(c.table is model.cold for c in columns):
+        return stmt
+    return stmt.select_from(cold_join(model))
+
+
+def full_select(model: Any, deferred: bool = True) -> Any:
+    """Return the select of the model tables, joined with the cold one.
+
+    With deferred False, the deferred columns of the model table are left
+    out.
+    """
+    table = model.t
+    columns = [c for c in table.c if deferred or not c.info.get("deferred")]
+    cold = model.cold
+    if cold is None:
+        return table.select() if deferred else sa.select(*columns)
+    return sa.select(
+        *columns, *[c for c in cold.c if not c.primary_key]
+    ).select_from(cold_join(model))
@@ -0,0 +1,190 @@
+"""
+The pipeline module provides parallel validation with a single writer.
+
+A producer thread reads the source iterator in chunks and submits them
+to a pool of worker processes, which validate records into insert rows.
+The calling thread is the only writer: it inserts each validated chunk
+in its own transaction, so the connection never leaves its thread.
+
+At most ``queue_size`` chunks are in flight at any time, which bounds the
+memory and makes a slow writer apply backpressure to the source.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+from .cache import invalidate_rows
+from .partition import insert_rows
+from .utils import chunked, transaction
+from .validation import Record, Reject, split_rejects
+
+
+class LoadStats:
+    """Counters of a bulk load."""
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds since the load started."""
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Return the processed rows per second."""
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            "LoadStats(rows={}, inserted={}, rejected={}, rate={:.1f}/s)"
+        ).format(self.rows, self.inserted, self.rejected, self.rate)
+
+
+def validate_chunk(
+    model: Any, records: List[Record], start: int = 0
+) -> Tuple[List[Record], List[Reject]]:
+    """Validate records into insert rows and rejects."""
+    return split_rejects(model, records, start)
+
+
+def write_chunk(
+    conn,
+    model: Any,
+    rows: List[Record],
+    rejected: List[Reject],
+    stats: LoadStats,
+    rejects: Optional[Callable[[List[Reject]], Any]] = None,
+    progress: Optional[Callable[[LoadStats], Any]] = None,
+):
+    """Insert a validated chunk in a transaction and update the stats."""
+    if rows:
+        with transaction(conn):
+            insert_rows(conn, model, rows)
+        invalidate_rows(model.t, rows, conn)
+    stats.rows += len(rows) + len(rejected)
+    stats.inserted += len(rows)
+    stats.rejected += len(rejected)
+    if rejected and rejects is not None:
+        rejects(rejected)
+    if progress is not None:
+        progress(stats)
+
+
+class _Done:
+    def __init__(self, count: int):
+        self.count = count
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class IngestPipeline:
+    """Validate records in worker processes and insert them in batches.
+
+    In ordered mode chunks are inserted in source order. In unordered
+    mode they are inserted as soon as they are validated.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        workers: Optional[int] = None,
+        batch_size: int = 1000,
+        queue_size: Optional[int] = None,
+        ordered: bool = True,
+        rejects: Optional[Callable[[List[Reject]], Any]] = None,
+        progress: Optional[Callable[[LoadStats], Any]] = None,
+    ):
+        self.model = model
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.ordered = ordered
+        self.rejects = rejects
+        self.progress = progress
+
+    def _produce(
+        self,
+        pool: ProcessPoolExecutor,
+        records: Iterable[Record],
+        results: queue.Queue,
+        slots: threading.Semaphore,
+        stop: threading.Event,
+        futures: Set[Future],
+    ):
+        count = 0
+        start = 0
+        try:
+            for chunk in chunked(records, self.batch_size):
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                future = pool.submit(validate_chunk, self.model, chunk, start)
+                start += len(chunk)
+                futures.add(future)
+                if self.ordered:
+                    results.put(future)
+                else:
+                    future.add_done_callback(results.put)
+                count += 1
+            results.put(_Done(count))
+        except BaseException as exc:
+            results.put(_Failure(exc))
+
+    def run(self, conn, records: Iterable[Record]) -> LoadStats:
+        """Consume records and insert the valid ones into the table."""
+        stats = LoadStats()
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        futures: Set[Future] = set()
+        workers = self.workers or os.cpu_count() or 1
+        slots = threading.Semaphore(self.queue_size or 2 * workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            producer = threading.Thread(
+                target=self._produce,
+                args=(pool, records, results, slots, stop, futures),
+                daemon=True,
+            )
+            producer.start()
+            try:
+                done = 0
+                total = None
+                while total is None or done < total:
+                    item = results.get()
+                    if isinstance(item, _Done):
+                        total = item.count
+                        continue
+                    if isinstance(item, _Failure):
+                        raise item.exc
+                    rows, rejected = item.result()
+                    futures.discard(item)
+                    slots.release()
+                    write_chunk(
+                        conn,
+                        self.model,
+                        rows,
+                        rejected,
+                        stats,
+                        self.rejects,
+                        self.progress,
+                    )
+                    done += 1
+            finally:
+                stop.set()
+                producer.join()
+                for future in futures:
+                    future.cancel()
+        return stats
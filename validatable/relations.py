@@ -0,0 +1,58 @@
+"""
+The relations module provides batched loading of related models.
+
+The rows referenced by a foreign key field of many instances are fetched
+with chunked ``IN`` queries instead of one query per instance.
+"""
+from typing import Any, Dict, Iterable
+
+from .deferred import default_select, rows_to_models
+from .utils import chunked, get_column, get_model
+
+
+def load_related(
+    conn,
+    model: Any,
+    instances: Iterable[Any],
+    name: str,
+    chunk_size: int = 500,
+) -> Dict[Any, Any]:
+    """Return the rows referenced by the ``name`` field of instances.
+
+    The foreign key is resolved from the column of the field. The result
+    maps each distinct key to the referenced model, or to the result row
+    when the referenced table has no model. Missing keys are left out.
+    """
+    column = get_column(model, name)
+    foreign_keys = list(column.foreign_keys)
+    if len(foreign_keys) != 1:
+        raise ValueError(
+            "{}.{} must have exactly one foreign key".format(
+                model.__name__, name
+            )
+        )
+    target = foreign_keys[0].column
+    target_model = get_model(target.table)
+
+    attr = next(
+        (k for k, f in model.__fields__.items() if f.alias == column.name),
+        column.name,
+    )
+    keys = list(
+        dict.fromkeys(
+            v for v in (getattr(i, attr) for i in instances) if v is not None
+        )
+    )
+
+    if target_model is None:
+        select = target.table.select()
+    else:
+        select = default_select(target_model)
+    related: Dict[Any, Any] = {}
+    for chunk in chunked(keys, chunk_size):
+        rows = conn.execute(select.where(target.in_(chunk))).fetchall()
+        found = [row[target] for row in rows]
+        if target_model is not None:
+            rows = rows_to_models(conn, target_model, rows)
+        related.update(zip(found, rows))
+    return related
@@ -0,0 +1,230 @@
+"""
+The rows module provides lightweight read-only row objects.
+
+Every table model gets a row class with one slot per column field, so
+instances carry no ``__dict__`` and skip validation. Rows are built
+directly from result tuples and can be promoted to full models with
+``to_model``.
+
+Partial rows hold only the columns a query selected. Their other fields
+are not loaded, and reading them raises NotLoaded. Rows cannot load
+fields later, so the default selects of rows join the cold table.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+import sqlalchemy as sa
+
+from .partition import clause_columns, join_cold
+from .utils import get_column, row_to_model
+
+_missing = object()
+
+
+class NotLoaded(AttributeError):
+    """A field of a partial row was not selected by its query."""
+
+
+class Row:
+    """Base class of the generated row classes."""
+
+    __slots__ = ()
+    _model: Any = None
+    _fields: Tuple[str, ...] = ()
+    _columns: Tuple[str, ...] = ()
+    _setters: Tuple[Any, ...] = ()
+
+    def __init__(self, *values: Any):
+        if len(values) != len(self._setters):
+            raise TypeError(
+                "{} takes {} values ({} given)".format(
+                    type(self).__name__, len(self._setters), len(values)
+                )
+            )
+        for setter, value in zip(self._setters, values):
+            setter(self, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def __delattr__(self, name: str):
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the slot of a field is empty, or for embedded
+        # fields, which are stored in the slots of their columns.
+        if name in self._fields:
+            raise NotLoaded(
+                "{}.{} was not loaded".format(type(self).__name__, name)
+            )
+        if self._model is not None:
+            for e in self._model.__sa_embedded__:
+                if name == e.name:
+                    return _assemble(self, e)
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(
+                type(self).__name__, name
+            )
+        )
+
+    @classmethod
+    def _partial(cls, values: Dict[str, Any]) -> "Row":
+        """Return a row with only the given fields loaded."""
+        row = cls.__new__(cls)
+        for name, value in values.items():
+            cls.__dict__[name].__set__(row, value)
+        return row
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._asdict().values())
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._asdict() == other._asdict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(k, v) for k, v in self._asdict().items()
+            ),
+        )
+
+    def _asdict(self) -> Dict[str, Any]:
+        """Return the loaded values keyed by field name."""
+        values = {}
+        for name in self._fields:
+            value = getattr(self, name, _missing)
+            if value is not _missing:
+                values[name] = value
+        return values
+
+    def to_model(self) -> Any:
+        """Return a validated model instance of the row.
+
+        Raise NotLoaded for partial rows, whose missing fields would
+        otherwise silently take their defaults.
+        """
+        values = [getattr(self, name) for name in self._fields]
+        return row_to_model(self._model, dict(zip(self._columns, values)))
+
+
+def _assemble(row: Row, embedded: Any) -> Any:
+    values = {a: getattr(row, c) for c, _, a in embedded.columns}
+    if embedded.optional and all(v is None for v in values.values()):
+        return None
+    field = row._model.__fields__[embedded.name]
+    return field.outer_type_.parse_obj(values)
+
+
+def get_row_class(model: Any) -> Type[Row]:
+    """Return a new row class with a slot for each column field.
+
+    Columns of embedded fields get a slot named after the column, and
+    embedded fields are assembled from them on access. Cold fields get a
+    slot like the other fields.
+    """
+    attrs = {f.alias: f.name for f in model.__fields__.values()}
+    table_columns = list(model.c)
+    if model.cold is not None:
+        table_columns.extend(c for c in model.cold.c if not c.primary_key)
+    columns = tuple(
+        c.name
+        for c in table_columns
+        if c.name in attrs or "embedded" in c.info
+    )
+    names = tuple(attrs.get(c, c) for c in columns)
+    cls: Any = type(
+        "{}Row".format(model.__name__),
+        (Row,),
+        {
+            "__slots__": names,
+            "__module__": model.__module__,
+            "_model": model,
+            "_fields": names,
+            "_columns": columns,
+        },
+    )
+    cls._setters = tuple(cls.__dict__[n].__set__ for n in names)
+    return cls
+
+
+def _is_deferred(model: Any, name: str) -> bool:
+    # Row columns missing from the model table are cold.
+    column = model.c.get(name)
+    return column is None or bool(column.info.get("deferred"))
+
+
+def iter_rows(result: Any, row_class: Type[Row]) -> Iterator[Row]:
+    """Yield the rows of a result as instances of row_class.
+
+    Deferred and cold columns may be left out of the result, the rows are
+    then partial and those fields raise NotLoaded.
+    """
+    keys = list(result.keys())
+    columns = row_class._columns
+    if keys == list(columns):
+        for values in result:
+            yield row_class(*values)
+        return
+
+    model = row_class._model
+    missing = [c for c in columns if c not in keys]
+    required = [c for c in missing if not _is_deferred(model, c)]
+    if required:
+        raise ValueError(
+            "the statement does not select {}".format(", ".join(required))
+        )
+    if not missing:
+        positions = [keys.index(c) for c in columns]
+        for values in result:
+            yield row_class(*[values[i] for i in positions])
+        return
+
+    items = [
+        (name, keys.index(c))
+        for name, c in zip(row_class._fields, columns)
+        if c in keys
+    ]
+    for values in result:
+        yield row_class._partial({name: values[i] for name, i in items})
+
+
+def _name_columns(model: Any, name: str) -> List[sa.Column]:
+    # Embedded fields are selected with all their columns.
+    for e in model.__sa_embedded__:
+        if name in (e.name, e.alias):
+            return [model.c[c] for c, _, _ in e.columns]
+    return [get_column(model, name)]
+
+
+def select_fields(
+    conn, model: Any, *names: str, where: Optional[Any] = None
+) -> List[Row]:
+    """Return partial rows with only the named fields loaded.
+
+    Only the selected columns are fetched and decoded. Names may be
+    field names, aliases or column names, the cold table is joined when
+    a cold field is selected. Embedded fields load all their columns.
+    """
+    if not names:
+        raise ValueError("select_fields requires at least one field")
+    row_class = model.row_class
+    columns = []
+    for name in names:
+        for column in _name_columns(model, name):
+            if column not in columns:
+                columns.append(column)
+    stmt = sa.select(*columns)
+    if where is not None:
+        stmt = stmt.where(where)
+    stmt = join_cold(model, stmt, columns + clause_columns(where))
+    fields = [
+        row_class._fields[row_class._columns.index(c.name)] for c in columns
+    ]
+    return [
+        row_class._partial(dict(zip(fields, values)))
+        for values in conn.execute(stmt)
+    ]
@@ -0,0 +1,112 @@
+"""
+The tracking module provides dirty-field tracking of table instances.
+
+Assignments to fields are recorded in the ``_sa_dirty`` private
+attribute, so saving an instance writes only the changed columns. The
+UPDATE statements are built once per table and set of dirty columns, and
+SQLAlchemy caches their compiled form.
+"""
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Set
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from .cache import invalidate
+from .partition import insert_cold_rows
+from .utils import (
+    field_columns,
+    model_to_row,
+    primary_key_columns,
+    row_key,
+    transaction,
+)
+
+KEY_PREFIX = "key_"
+VALUE_PREFIX = "value_"
+
+
+def track_setattr(instance: Any, name: str, value: Any):
+    """Assign a value and mark the field dirty."""
+    BaseModel.__setattr__(instance, name, value)
+    if name in instance.__fields__:
+        instance._sa_dirty.add(name)
+        raw = instance._sa_raw
+        if raw and name in raw:
+            del raw[name]
+
+
+def track_copy(instance: Any, copy: Any, update: Optional[dict] = None):
+    """Give a copy its own dirty set, including the updated fields."""
+    dirty = set(instance._sa_dirty)
+    if update:
+        dirty.update(k for k in update if k in instance.__fields__)
+    object.__setattr__(copy, "_sa_dirty", dirty)
+    return copy
+
+
+def dirty_columns(model: Any, instance: Any) -> Dict[sa.Table, Set[str]]:
+    """Return the column names of the dirty fields, grouped by table."""
+    columns: Dict[sa.Table, Set[str]] = {}
+    for name in instance._sa_dirty:
+        for column in field_columns(model, name):
+            columns.setdefault(column.table, set()).add(column.name)
+    return columns
+
+
+@lru_cache(maxsize=1024)
+def update_statement(table: sa.Table, columns: FrozenSet[str]) -> Any:
+    """Return the UPDATE by primary key of the given columns."""
+    keys = list(table.primary_key.columns)
+    return (
+        table.update()
+        .where(
+            sa.and_(*[c == sa.bindparam(KEY_PREFIX + c.name) for c in keys])
+        )
+        .values({n: sa.bindparam(VALUE_PREFIX + n) for n in sorted(columns)})
+    )
+
+
+def update(conn, model: Any, instance: Any) -> int:
+    """Write the dirty columns of an instance, keyed by its primary key.
+
+    Nothing is executed when no field changed. Return the number of
+    updated rows.
+    """
+    if not isinstance(instance, model):
+        raise TypeError(
+            "{!r} is not a {} instance".format(instance, model.__name__)
+        )
+    keys = primary_key_columns(model)
+    columns = dirty_columns(model, instance)
+    if not columns:
+        return 0
+    changed = columns.get(model.t, set()).intersection(c.name for c in keys)
+    if changed:
+        raise ValueError(
+            "primary key columns cannot be updated: {}".format(
+                ", ".join(sorted(changed))
+            )
+        )
+
+    row = model_to_row(instance)
+    key_params = {KEY_PREFIX + c.name: row[c.name] for c in keys}
+    count = 0
+    with transaction(conn):
+        # The cold table, if any, is updated after the model table.
+        for table in (model.t, model.cold):
+            names = columns.get(table)
+            if not names:
+                continue
+            params = dict(key_params)
+            params.update({VALUE_PREFIX + n: row[n] for n in names})
+            stmt = update_statement(table, frozenset(names))
+            updated = conn.execute(stmt, params).rowcount
+            if not updated and table is model.cold:
+                values = {c.name: row[c.name] for c in keys}
+                values.update({n: row[n] for n in names})
+                updated = insert_cold_rows(conn, model, [values])
+            count = count or updated
+    object.__setattr__(instance, "_sa_dirty", set())
+    invalidate(model.t, [row_key(row, [c.name for c in keys])], conn)
+    return count
@@ -0,0 +1,73 @@
+"""
+The unit_of_work module provides batched inserts of many models.
+
+Instances of several BaseTable classes sharing a MetaData are collected,
+grouped by table and flushed in foreign key dependency order, with one
+executemany per table inside a single transaction.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+from .cache import invalidate_rows
+from .partition import insert_rows
+from .utils import model_to_row, transaction
+
+
+class UnitOfWork:
+    """Collect model instances and insert them in a single flush."""
+
+    def __init__(self, metadata: Optional[sa.MetaData] = None):
+        self.metadata = metadata
+        self._pending: Dict[sa.Table, List[Any]] = {}
+
+    def add(self, *instances: Any):
+        """Add instances to be inserted on the next flush."""
+        for instance in instances:
+            model = instance.__class__
+            table = model.t
+            if table is None:
+                raise TypeError("{} has no table".format(model.__name__))
+            if self.metadata is None:
+                self.metadata = table.metadata
+            elif table.metadata is not self.metadata:
+                raise ValueError(
+                    "{} does not share the unit of work metadata".format(
+                        model.__name__
+                    )
+                )
+            self._pending.setdefault(table, []).append(instance)
+
+    def add_all(self, instances: Iterable[Any]):
+        """Add every instance of an iterable."""
+        self.add(*instances)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._pending.values())
+
+    def clear(self):
+        """Discard the pending instances."""
+        self._pending.clear()
+
+    def flush(self, conn) -> int:
+        """Insert the pending instances and return how many were inserted.
+
+        Tables are flushed in the order of ``metadata.sorted_tables``, so
+        referenced rows are inserted before the rows referencing them.
+        Within a table, rows keep the order they were added.
+        """
+        # The metadata is set by the first added instance.
+        if not self._pending or self.metadata is None:
+            return 0
+        written = []
+        with transaction(conn):
+            for table in self.metadata.sorted_tables:
+                instances = self._pending.get(table)
+                if instances:
+                    rows = [model_to_row(i) for i in instances]
+                    insert_rows(conn, type(instances[0]), rows)
+                    written.append((table, rows))
+        self.clear()
+        for table, rows in written:
+            invalidate_rows(table, rows, conn)
+        return sum(len(rows) for _, rows in written)
@@ -0,0 +1,201 @@
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import sqlalchemy as sa
+from pydantic import ValidationError
+
+from .compiler import validate
+from .embedded import assemble, flatten
+from .generic_types import GUID, AutoJson
+from .lazy import raw_row, take_raw
+
+MODELS_KEY = "validatable_models"
+
+
+def register_model(model: Any):
+    """Register the model of its table in the table metadata."""
+    table = model.t
+    table.metadata.info.setdefault(MODELS_KEY, {})[table] = model
+
+
+def get_model(table: sa.Table) -> Optional[Any]:
+    """Return the model registered for a table, if any."""
+    return table.metadata.info.get(MODELS_KEY, {}).get(table)
+
+
+def get_column(model: Any, name: str) -> sa.Column:
+    """Return the column of a field name, alias or column name.
+
+    Columns of cold fields are returned from the cold table.
+    """
+    fields = model.__fields__
+    if name not in fields:
+        name = next((k for k, f in fields.items() if f.alias == name), name)
+    if name in fields:
+        column = field_column(model, name)
+    else:
+        column = model.c.get(name)
+    if column is None:
+        raise KeyError("{} has no column {}".format(model.__name__, name))
+    return column
+
+
+def field_column(model: Any, name: str) -> Optional[sa.Column]:
+    """Return the column of a field in the model table or its cold table."""
+    alias = model.__fields__[name].alias
+    if alias in model.c:
+        return model.c[alias]
+    cold = model.cold
+    if cold is not None and alias in cold.c:
+        return cold.c[alias]
+    return None
+
+
+def field_columns(model: Any, name: str) -> List[sa.Column]:
+    """Return the columns of a field, one per sub-field if embedded."""
+    for e in model.__sa_embedded__:
+        if e.name == name:
+            return [model.c[c] for c, _, _ in e.columns]
+    column = field_column(model, name)
+    return [] if column is None else [column]
+
+
+def primary_key_columns(model: Any) -> List[sa.Column]:
+    """Return the primary key columns of the model table."""
+    columns = list(model.t.primary_key.columns)
+    if not columns:
+        raise TypeError("{} has no primary key".format(model.__name__))
+    return columns
+
+
+def row_key(row: Any, columns: List[Any]) -> Any:
+    """Return the primary key of a row, a tuple for composite keys.
+
+    Columns may be given as Column objects or names.
+    """
+    if len(columns) == 1:
+        return row[columns[0]]
+    return tuple(row[c] for c in columns)
+
+
+def key_clause(columns: List[sa.Column], keys: Sequence[Any]) -> Any:
+    """Return an ``IN`` clause matching the keys."""
+    if len(columns) == 1:
+        return columns[0].in_(keys)
+    return sa.tuple_(*columns).in_(keys)
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def transaction(conn):
+    """Begin a transaction unless the connection is already in one."""
+    if conn.in_transaction():
+        yield conn
+    else:
+        with conn.begin():
+            yield conn
+
+
+def base_type(column: sa.Column) -> sa.types.TypeEngine:
+    """Return the column type, unwrapping generic type decorators.
+
+    GUID and AutoJson are returned as they are since they define how the
+    value is stored.
+    """
+    type_ = column.type
+    if isinstance(type_, (GUID, AutoJson)):
+        return type_
+    if isinstance(type_, sa.types.TypeDecorator):
+        return type_.impl
+    return type_
+
+
+def values_to_row(model: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Return validated field values keyed by column name.
+
+    Values of cold fields are included, keyed by their cold column, and
+    embedded values are flattened into their columns.
+    """
+    columns = model.c
+    cold = model.cold
+    cold_columns = cold.c if cold is not None else ()
+    row = {
+        f.alias: values[name]
+        for name, f in model.__fields__.items()
+        if name in values and (f.alias in columns or f.alias in cold_columns)
+    }
+    if model.__sa_embedded__:
+        flatten(model, values, row)
+    return row
+
+
+def model_to_row(instance: Any) -> Dict[str, Any]:
+    """Return the instance values keyed by column name.
+
+    Lazy JSON fields that were never parsed keep their raw text.
+    """
+    model = instance.__class__
+    row = values_to_row(model, instance.__dict__)
+    if instance._sa_raw:
+        row.update(raw_row(model, instance._sa_raw))
+    return row
+
+
+def row_values(model: Any, row: Any) -> Dict[str, Any]:
+    """Return the values of a result row keyed by column name.
+
+    The columns of embedded fields are assembled into nested values.
+    """
+    values = dict(row._mapping) if hasattr(row, "_mapping") else dict(row)
+    return assemble(model, values)
+
+
+def partial_model(
+    model: Any, values: Dict[str, Any], missing: Sequence[str]
+) -> Any:
+    """Return a model instance validated without the missing fields."""
+    values, fields_set, error = validate(model, values)
+    if error is not None:
+        aliases = {model.__fields__[n].alias for n in missing}
+        errors = [
+            e for e in error.raw_errors if e.loc_tuple()[0] not in aliases
+        ]
+        if errors:
+            raise ValidationError(errors, model)
+    for name in missing:
+        values.pop(name, None)
+        fields_set.discard(name)
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+    return instance
+
+
+def row_to_model(model: Any, row: Any, missing: Sequence[str] = ()) -> Any:
+    """Return a model instance from a result row.
+
+    Fields in ``missing`` are left unset, and lazy JSON fields keep
+    their raw text until accessed.
+    """
+    if not (model.__sa_embedded__ or model.__sa_lazy__ or missing):
+        return model.parse_obj(row)
+    values = row_values(model, row)
+    raw = take_raw(model, values) if model.__sa_lazy__ else {}
+    if not (raw or missing):
+        return model.parse_obj(values)
+    instance = partial_model(model, values, [*missing, *raw])
+    if raw:
+        instance.__fields_set__.update(raw)
+        object.__setattr__(instance, "_sa_raw", raw)
+    return instance
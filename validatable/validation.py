@@ -0,0 +1,114 @@
+"""
+The validation module provides exception-free bulk validation.
+
+Records are validated with pydantic's validate_model, or the compiled
+validator of the model, which return the errors instead of raising
+them, and the errors are reduced to compact RowError records. Rejected
+records can be written in batches to a quarantine table derived from
+the model table.
+"""
+import datetime as dt
+import json
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+import sqlalchemy as sa
+
+from .compiler import validate
+from .generic_types import dumps
+from .utils import transaction, values_to_row
+
+Record = Dict[str, Any]
+
+
+class RowError(NamedTuple):
+    """A validation error of a single field of a record."""
+
+    row_index: int
+    field: str
+    code: str
+
+
+Reject = Tuple[Record, List[RowError]]
+
+
+def validate_many(
+    model: Any, records: Iterable[Record], start: int = 0
+) -> Tuple[List[Record], List[RowError]]:
+    """Validate records into insert rows without raising.
+
+    Return the rows of the valid records, keyed by column name, and the
+    errors of the invalid ones. Row indexes count from ``start``.
+    """
+    rows: List[Record] = []
+    errors: List[RowError] = []
+    for index, record in enumerate(records, start):
+        values, _, error = validate(model, record)
+        if error is None:
+            rows.append(values_to_row(model, values))
+        else:
+            errors.extend(
+                RowError(index, ".".join(str(i) for i in e["loc"]), e["type"])
+                for e in error.errors()
+            )
+    return rows, errors
+
+
+def split_rejects(
+    model: Any, records: List[Record], start: int = 0
+) -> Tuple[List[Record], List[Reject]]:
+    """Validate records into insert rows and rejected records."""
+    rows, errors = validate_many(model, records, start)
+    rejects = [
+        (records[index - start], list(group))
+        for index, group in groupby(errors, key=lambda e: e.row_index)
+    ]
+    return rows, rejects
+
+
+def format_row_errors(errors: List[RowError]) -> str:
+    """Return the errors of a record in a single line."""
+    return "; ".join("{}: {}".format(e.field, e.code) for e in errors)
+
+
+def get_quarantine_table(name: str, metadata: sa.MetaData) -> sa.Table:
+    """Return the quarantine table of the table ``name``."""
+    return sa.Table(
+        "{}_quarantine".format(name),
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("row_index", sa.BigInteger, nullable=False),
+        sa.Column("errors", sa.Text, nullable=False),
+        sa.Column("payload", sa.Text, nullable=False),
+        sa.Column("created_ts", sa.DateTime, default=dt.datetime.now),
+    )
+
+
+class Quarantine:
+    """Write rejected records in batches to the model quarantine table.
+
+    Instances can be passed as ``rejects`` to the bulk load helpers.
+    """
+
+    def __init__(self, conn, model: Any):
+        table = model.quarantine
+        if table is None:
+            raise TypeError(
+                "{} has no quarantine table, set __sa_quarantine__ "
+                "to True".format(model.__name__)
+            )
+        self.conn = conn
+        self.table = table
+
+    def __call__(self, rejected: List[Reject]):
+        rows = [
+            {
+                "row_index": errors[0].row_index,
+                "errors": json.dumps([[e.field, e.code] for e in errors]),
+                "payload": dumps(record),
+            }
+            for record, errors in rejected
+        ]
+        if rows:
+            with transaction(self.conn):
+                self.conn.execute(self.table.insert(), rows)